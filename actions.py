@@ -0,0 +1,91 @@
+# actions.py - Per-class action tables
+#
+# Every fighter class lists its moves once, as a class-level ActionTable.
+# Battle.player_turn looks the chosen move up in the fighter's table instead
+# of walking an isinstance ladder, so a new class or boss only has to declare
+# its own table.
+
+from colorama import Fore
+from game_utils import colored_text
+
+class Action:
+    """One move: handler(fighter, enemy, is_bot) plus its menu and bot metadata"""
+    __slots__ = ("id", "name", "label", "handler", "color", "bot_weight", "available", "humans_only")
+
+    def __init__(self, name, label, handler, color=Fore.WHITE, bot_weight=0.0,
+                 available=None, humans_only=False):
+        self.id = 0                     # 1-based menu number, assigned by the table
+        self.name = name
+        self.label = label              # str.format template, {f} is the fighter
+        self.handler = handler
+        self.color = color
+        self.bot_weight = bot_weight    # weight in the default bot pick
+        self.available = available      # predicate(fighter), None means always
+        self.humans_only = humans_only  # bots fall back to the default move
+
+    def is_available(self, fighter):
+        return self.available is None or self.available(fighter)
+
+    def __repr__(self):
+        return f"Action({self.name!r})"
+
+class ActionTable:
+    """Ordered moves of one fighter class, looked up by menu number or name"""
+    def __init__(self, actions, default=0, announce="🤖 {f.name} chooses option {a.id}"):
+        self.actions = tuple(actions)
+        for i, action in enumerate(self.actions):
+            action.id = i + 1
+        self.default = self.actions[default]  # used for bad input and failed moves
+        self.announce = announce
+        self.by_key = {}
+        for action in self.actions:
+            self.by_key[action.id] = action
+            self.by_key[str(action.id)] = action
+            self.by_key[action.name] = action
+        bot_actions = [a for a in self.actions if not a.humans_only]
+        self.always_available = sum(1 << (a.id - 1) for a in bot_actions if a.available is None)
+        self.availability_checks = [(1 << (a.id - 1), a.available) for a in bot_actions if a.available is not None]
+
+    def __getitem__(self, key):
+        return self.by_key[key]
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def resolve(self, choice, is_bot=False):
+        """Action for an id, menu choice or move name, falling back to the default move"""
+        action = self.by_key.get(choice, self.default)
+        if is_bot and action.humans_only:
+            return self.default
+        return action
+
+    def available_mask(self, fighter):
+        """Bit (id - 1) set for every move a bot could play right now"""
+        mask = self.always_available
+        for bit, available in self.availability_checks:
+            if available(fighter):
+                mask |= bit
+        return mask
+
+    def perform(self, action, fighter, enemy, is_bot=False):
+        """Run a move; a handler returning False (move not ready) falls back to the default"""
+        if action.handler(fighter, enemy, is_bot) is False and action is not self.default:
+            self.default.handler(fighter, enemy, is_bot)
+
+    def menu_lines(self, fighter):
+        lines = []
+        for action in self.actions:
+            text = action.label.format(f=fighter)
+            if not action.is_available(fighter):
+                text = colored_text(text + " (not ready)", Fore.LIGHTBLACK_EX)
+            lines.append(f"{colored_text(f'{action.id})', action.color)} {text}")
+        return lines
+
+    def prompt_text(self):
+        return colored_text(f"Enter choice (1-{len(self.actions)}): ", Fore.CYAN)
+
+    def announcement(self, fighter, action):
+        return colored_text(self.announce.format(f=fighter, a=action), Fore.LIGHTBLACK_EX)
@@ -0,0 +1,131 @@
+# async_game.py - asyncio front end for the interactive game
+#
+# The game logic stays synchronous: it runs in a worker thread, and every
+# prompt and pause it makes (game_utils.prompt / pause) is handed to an
+# AsyncConsole on the event loop and waited for there. The loop itself is
+# never blocked on input() or time.sleep, so other work keeps going while a
+# player thinks or an animation plays:
+#
+#   * Prompts are awaitables (AsyncConsole.ask) answered by a stdin reader;
+#     lines typed ahead (or piped in) wait for the next prompt.
+#   * Animations are awaitable sleeps (AsyncConsole.sleep). Pressing Enter
+#     while one plays skips it and every other delay up to the next prompt,
+#     and skip() does the same from code.
+#   * game_utils.background(fn) runs fn on the loop's thread pool. play()
+#     uses it to import the battle engine while the menu is shown.
+
+import sys
+import asyncio
+from collections import deque
+import threading
+import importlib
+import game_utils
+
+ENGINE_MODULES = ("knight", "orc", "mage", "ninja", "equipment", "battle", "tournament")
+
+class AsyncConsole:
+    """Prompts and delays as awaitables on one event loop"""
+    def __init__(self, loop, stdin=None, stdout=None):
+        self.loop = loop
+        self.stdin = stdin or sys.stdin
+        self.stdout = stdout or sys.stdout
+        self.answer = None              # Future of the pending prompt
+        self.lines = deque()            # input that arrived with no prompt pending
+        self.sleeping = False
+        self.skipped = asyncio.Event()  # set: delays return at once until the next prompt
+        self.closed = False
+
+    # ====== Input ======
+    def start_reader(self):
+        """Read stdin lines in a daemon thread (portable, unlike add_reader)"""
+        threading.Thread(target=self._read_lines, name="stdin-reader", daemon=True).start()
+
+    def _read_lines(self):
+        while True:
+            line = self.stdin.readline()
+            try:
+                self.loop.call_soon_threadsafe(self.feed, line)
+            except RuntimeError:  # the loop has already shut down
+                return
+            if not line:
+                return
+
+    def feed(self, line):
+        """A line of input: answers the pending prompt, skips a playing
+        animation, or else waits for the next prompt"""
+        pending = self.answer is not None and not self.answer.done()
+        if not line:
+            self.closed = True
+            if pending:
+                self.answer.set_exception(EOFError())
+        elif pending:
+            self.answer.set_result(line.rstrip("\r\n"))
+        elif self.sleeping:
+            self.skip()
+        else:
+            self.lines.append(line.rstrip("\r\n"))
+
+    def skip(self):
+        self.skipped.set()
+
+    # ====== Awaitables ======
+    async def ask(self, text=""):
+        game_utils.flush_output()
+        self.stdout.write(text)
+        self.stdout.flush()
+        self.skipped.clear()
+        if self.lines:
+            return self.lines.popleft()
+        if self.closed:
+            raise EOFError()
+        self.answer = self.loop.create_future()
+        try:
+            return await self.answer
+        finally:
+            self.answer = None
+
+    async def sleep(self, seconds):
+        if self.skipped.is_set():
+            return
+        self.sleeping = True
+        try:
+            await asyncio.wait_for(self.skipped.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.sleeping = False
+
+    # ====== game_utils Console Hooks (called from the game thread) ======
+    def prompt(self, text=""):
+        return asyncio.run_coroutine_threadsafe(self.ask(text), self.loop).result()
+
+    def pause(self, seconds):
+        asyncio.run_coroutine_threadsafe(self.sleep(seconds), self.loop).result()
+
+    def background(self, fn, *args):
+        return asyncio.run_coroutine_threadsafe(asyncio.to_thread(fn, *args), self.loop)
+
+def _warm_up(modules=ENGINE_MODULES):
+    for name in modules:
+        importlib.import_module(name)
+
+async def play(entry=None, stdin=None, stdout=None):
+    """Run entry (default: main.main_menu) in a worker thread under an AsyncConsole"""
+    if entry is None:
+        from main import main_menu as entry
+    console = AsyncConsole(asyncio.get_running_loop(), stdin, stdout)
+    console.start_reader()
+    with game_utils.use_console(console):
+        warm_up = game_utils.background(_warm_up)  # the menu doesn't need the engine yet
+        try:
+            return await asyncio.to_thread(entry)
+        finally:
+            warm_up.cancel()
+            game_utils.flush_output()
+
+def run(entry=None):
+    """Blocking entry point: asyncio.run(play(entry))"""
+    try:
+        return asyncio.run(play(entry))
+    except (KeyboardInterrupt, EOFError):
+        game_utils.flush_output()
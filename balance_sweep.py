@@ -0,0 +1,211 @@
+# balance_sweep.py - Search class stat lines for balanced matchups
+#
+# A sweep takes hp/attack/defense ranges per class and tries every
+# combination (classes without ranges keep their ROSTER stat line). Each
+# grid point plays every pair of classes against each other with
+# batch_battle, alternating sides to cancel first-move advantage, in rounds
+# until every pairing's win rate is known well enough. A pairing is done
+# once its Wilson interval is narrower than `precision`, or once the whole
+# interval is further than `tolerance` from 50% (that point can't be
+# balanced, so the rest of its pairings are skipped too). Close calls get
+# the most battles and hopeless points the fewest, which is where the
+# savings over a fixed-N sweep come from. Grid points run across a process
+# pool like tournament_runner.
+
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from batch_battle import simulate_batch
+from tournament_runner import ROSTER
+
+STATS = ("hp", "attack", "defense")
+BATCH_SIZE = 2000       # battles per pairing per round, split between the two sides
+MAX_BATTLES = 100_000   # cap per pairing
+
+def wilson_interval(wins, n, z=1.96):
+    """Wilson score interval of a win rate (wins may count draws as halves)"""
+    if n == 0:
+        return 0.0, 1.0
+    p = wins / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, center - half), min(1.0, center + half)
+
+class Matchup:
+    """Running tally of one class pairing at one grid point"""
+    __slots__ = ("first", "second", "wins", "battles")
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.wins = 0.0   # for first; draws count half
+        self.battles = 0
+
+    def win_rate(self):
+        return self.wins / self.battles if self.battles else 0.5
+
+    def interval(self, z=1.96):
+        return wilson_interval(self.wins, self.battles, z)
+
+class SweepResult:
+    """Stat lines of one grid point and the matchup odds measured there"""
+    def __init__(self, point_id, stats, matchups, pruned):
+        self.point_id = point_id
+        self.stats = stats        # {class name: (hp, attack, defense)}
+        self.matchups = matchups  # [Matchup]
+        self.pruned = pruned      # stopped early: some pairing is clearly unbalanced
+
+    @property
+    def battles(self):
+        return sum(m.battles for m in self.matchups)
+
+    @property
+    def imbalance(self):
+        """Largest distance of any pairing's win rate from 50%"""
+        return max((abs(m.win_rate() - 0.5) for m in self.matchups if m.battles), default=0.0)
+
+    def __repr__(self):
+        return (f"SweepResult(point_id={self.point_id}, imbalance={self.imbalance:.3f}, "
+                f"battles={self.battles}, pruned={self.pruned})")
+
+def grid(ranges, classes=None):
+    """Every stat combination of classes (default: the whole roster) allowed by
+    ranges, {class: {stat: iterable}}"""
+    axes = []
+    for name in classes or ROSTER:
+        _, *base = ROSTER[name]
+        options = ranges.get(name, {})
+        per_stat = [list(options.get(stat, [value])) for stat, value in zip(STATS, base)]
+        axes.append([(name, line) for line in itertools.product(*per_stat)])
+    for point in itertools.product(*axes):
+        yield dict(point)
+
+def _fighter(name, stats):
+    cls = ROSTER[name][0]
+    return cls(f"Bot {name}", *stats)
+
+def check_budget(batch_size=BATCH_SIZE, max_battles=MAX_BATTLES):
+    """Reject budgets under which a pairing could never close"""
+    if batch_size < 2:
+        raise ValueError(f"batch_size must be at least 2 (one battle per side), got {batch_size}")
+    if max_battles < 1:
+        raise ValueError(f"max_battles must be at least 1, got {max_battles}")
+
+def evaluate_point(point_id, stats, seed_seq, precision=0.02, tolerance=0.05,
+                   batch_size=BATCH_SIZE, max_battles=MAX_BATTLES, z=1.96):
+    """Play every class pairing of one grid point until its win rate is settled"""
+    check_budget(batch_size, max_battles)
+    rng = np.random.default_rng(seed_seq)
+    matchups = [Matchup(a, b) for a, b in itertools.combinations(stats, 2)]
+    open_matchups = list(matchups)
+    pruned = False
+    while open_matchups and not pruned:
+        for matchup in list(open_matchups):
+            a = _fighter(matchup.first, stats[matchup.first])
+            b = _fighter(matchup.second, stats[matchup.second])
+            half = batch_size // 2
+            as_first = simulate_batch(a, b, half, rng=rng)
+            as_second = simulate_batch(b, a, half, rng=rng)
+            matchup.wins += half * (as_first.win_rate(0) + as_second.win_rate(1)
+                                    + 0.5 * (as_first.draw_rate() + as_second.draw_rate()))
+            matchup.battles += 2 * half
+
+            low, high = matchup.interval(z)
+            if low > 0.5 + tolerance or high < 0.5 - tolerance:
+                pruned = True
+                break
+            if high - low <= precision or matchup.battles >= max_battles:
+                open_matchups.remove(matchup)
+    return SweepResult(point_id, stats, matchups, pruned)
+
+def _run_chunk(points, seed_seqs, options):
+    return [evaluate_point(point_id, stats, seq, **options) for (point_id, stats), seq in zip(points, seed_seqs)]
+
+def run_sweep(ranges, classes=None, seed=None, workers=None, chunk_size=4, **options):
+    """Evaluate every grid point in parallel and return them most balanced first.
+
+    options go to evaluate_point. As in run_tournaments, each point gets its
+    own child of one SeedSequence, so (seed, ranges) reproduce the results
+    whatever the worker count.
+    """
+    check_budget(options.get("batch_size", BATCH_SIZE), options.get("max_battles", MAX_BATTLES))
+    points = list(enumerate(grid(ranges, classes)))
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(points))
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_chunk, points[start:start + chunk_size],
+                        seed_seqs[start:start + chunk_size], options)
+            for start in range(0, len(points), chunk_size)
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    results.sort(key=lambda r: (r.pruned, r.imbalance, r.point_id))
+    return results
+
+def parse_range(text):
+    """Parse Knight.hp=140:161:5 into ("Knight", "hp", range(140, 161, 5)); the step defaults to 1"""
+    target, _, span = text.partition("=")
+    name, _, stat = target.partition(".")
+    usage = f"expected <class>.<hp|attack|defense>=start:stop[:step], got {text!r}"
+    if name not in ROSTER or stat not in STATS:
+        raise ValueError(usage)
+    try:
+        bounds = [int(part) for part in span.split(":")]
+        return name, stat, range(*bounds)
+    except (ValueError, TypeError):
+        raise ValueError(usage) from None
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Sweep class stat lines for balanced matchups")
+    parser.add_argument("ranges", nargs="+", metavar="CLASS.STAT=START:STOP[:STEP]")
+    parser.add_argument("--classes", nargs="+", choices=list(ROSTER), default=None,
+                        help="classes that play each other (default: all)")
+    parser.add_argument("--precision", type=float, default=0.02, help="target win-rate interval width")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="allowed distance from 50%%")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--max-battles", type=int, default=MAX_BATTLES, help="cap per pairing")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.classes is not None and len(set(args.classes)) < 2:
+        parser.error("--classes needs at least 2 classes to form a matchup")
+    if args.batch_size < 2:
+        parser.error("--batch-size must be at least 2 (one battle per side)")
+    if args.max_battles < 1:
+        parser.error("--max-battles must be at least 1")
+    ranges = {}
+    for text in args.ranges:
+        try:
+            name, stat, values = parse_range(text)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if not values:
+            parser.error(f"{text} is an empty range")
+        ranges.setdefault(name, {})[stat] = values
+
+    start = time.perf_counter()
+    results = run_sweep(ranges, args.classes, args.seed, args.workers, precision=args.precision,
+                        tolerance=args.tolerance, batch_size=args.batch_size, max_battles=args.max_battles)
+    elapsed = time.perf_counter() - start
+
+    battles = sum(r.battles for r in results)
+    fixed = len(results) * len(results[0].matchups) * args.max_battles
+    print(f"{len(results)} grid points, {battles} battles in {elapsed:.2f}s "
+          f"({battles / fixed:.1%} of a fixed {args.max_battles}-battle sweep)")
+    for rank, result in enumerate(results[:args.top], 1):
+        lines = ", ".join(f"{name} {hp}/{attack}/{defense}" for name, (hp, attack, defense) in result.stats.items())
+        flag = "  (pruned)" if result.pruned else ""
+        print(f"{rank:>3}. imbalance {result.imbalance:.3f}  {lines}{flag}")
+        for m in result.matchups:
+            if not m.battles:
+                continue
+            low, high = m.interval()
+            print(f"       {m.first:<7} vs {m.second:<7} {m.win_rate():.3f} [{low:.3f}, {high:.3f}] ({m.battles})")
@@ -0,0 +1,429 @@
+# batch_battle.py - Vectorized bot-vs-bot battles (struct-of-arrays over N battles)
+#
+# Every array is shaped (2, n): row 0 is player 1, row 1 is player 2, one
+# column per battle (status stacks add a leading status_effects index). A turn is advanced for every live battle at once with
+# array operations; finished battles are masked out. The damage rules mirror
+# knight.py, orc.py, mage.py, ninja.py and combat_mechanics.py. Moves are
+# picked by each fighter's policy, evaluated over all live battles at once
+# with Policy.choose_batch.
+
+import numpy as np
+from policies import FighterView, BattleView, is_available
+from status_effects import N_STATUSES, STUNNED, FROZEN, BURNING, SHOCKED, SHADOWED, BUFFED, UNTOUCHABLE
+from knight import Knight
+from orc import Orc
+from mage import Mage
+from ninja import Ninja
+
+KNIGHT, ORC, MAGE, NINJA = range(4)
+CLASS_IDS = {Knight: KNIGHT, Orc: ORC, Mage: MAGE, Ninja: NINJA}
+
+# Action ids (shared by all classes)
+(SWORD_SLASH, SHIELD_BASH, MIGHTY_STRIKE, RAPID_STRIKES,
+ CLEAVE, BERSERK_STRIKE, ROAR,
+ ARCANE_LANCE, CELESTIAL_HEALING, METEOR_FALL,
+ SHADOWSTEP, TWIN_FANG_SLASH, SHURIKEN_STORM, SMOKE_BOMB) = range(14)
+
+NO_MOVE = -1  # last_move before any combo move was used
+DRAW = -1     # winner id when nobody survived or the turn limit was hit
+
+def _dice_row(weak_max, weak, normal_max, strong, crit):
+    row = np.ones(21)
+    row[0] = np.nan      # a d20 never rolls 0
+    row[1] = 0.0         # critical miss
+    row[2:weak_max + 1] = weak
+    row[normal_max + 1:20] = strong
+    row[20] = crit
+    return row
+
+# Damage multiplier for every (class, d20 roll), matching each apply_dice
+DICE_MULTIPLIERS = np.array([
+    _dice_row(5, 0.8, 15, 1.2, 2.0),    # Knight
+    _dice_row(4, 0.7, 14, 1.3, 2.5),    # Orc
+    _dice_row(4, 0.7, 14, 1.3, 2.0),    # Mage
+    _dice_row(3, 0.75, 13, 1.25, 2.2),  # Ninja
+])
+
+# Batch move for every (class, policy action id). Column 0 (bad ids) and the
+# humans-only Use Item column hold the class's default move.
+CLASS_MOVES = np.array([
+    [SWORD_SLASH, SWORD_SLASH, SHIELD_BASH, MIGHTY_STRIKE, RAPID_STRIKES, SWORD_SLASH],
+    [CLEAVE, CLEAVE, BERSERK_STRIKE, ROAR, CLEAVE, CLEAVE],
+    [ARCANE_LANCE, ARCANE_LANCE, CELESTIAL_HEALING, METEOR_FALL, ARCANE_LANCE, ARCANE_LANCE],
+    [TWIN_FANG_SLASH, SHADOWSTEP, TWIN_FANG_SLASH, SHURIKEN_STORM, SMOKE_BOMB, TWIN_FANG_SLASH],
+])
+
+NINJA_BASE_DODGE = 0.25
+
+# Per-battle state columns, compacted together once most battles are finished
+STATE_ARRAYS = (
+    'cls', 'hp', 'max_hp', 'attack', 'defense', 'block', 'dodge', 'attack_boost', 'durability',
+    'combo', 'last_move', 'buff_turns', 'heal_cd', 'meteor_cd', 'shadowstep_cd', 'stealth',
+    'shurikens', 'smoke_bomb_used', 'status_mask',
+)
+
+
+class BatchResult:
+    """Per-battle outcome of a batch run"""
+    def __init__(self, winners, turns, hp):
+        self.winners = winners  # 0 = player 1, 1 = player 2, DRAW = nobody
+        self.turns = turns
+        self.hp = hp            # final HP, shaped (2, n)
+
+    def win_rate(self, side=0):
+        return float(np.mean(self.winners == side))
+
+    def draw_rate(self):
+        return float(np.mean(self.winners == DRAW))
+
+    def mean_turns(self):
+        return float(np.mean(self.turns))
+
+
+class BatchBattle:
+    """N simultaneous battles between copies of two fighter templates"""
+    def __init__(self, fighter1, fighter2, n, rng=None):
+        self.n = n
+        self.rng = rng if rng is not None else np.random.default_rng()
+        fighters = (fighter1, fighter2)
+        self.kinds = [type(f).__name__ for f in fighters]
+        self.side_cls = [CLASS_IDS[type(f)] for f in fighters]
+        self.policies = [f.policy or f.default_policy for f in fighters]
+
+        def per_side(values, dtype):
+            return np.repeat(np.array(values, dtype=dtype)[:, None], n, axis=1)
+
+        self.cls = per_side([CLASS_IDS[type(f)] for f in fighters], np.int8)
+        self.hp = per_side([f.hp for f in fighters], np.int64)
+        self.max_hp = per_side([f.max_hp for f in fighters], np.int64)
+        self.attack = per_side([f.attack for f in fighters], np.int64)
+        self.defense = per_side([f.defense for f in fighters], np.int64)
+        self.block = per_side([f.block_chance for f in fighters], np.float64)
+        self.dodge = per_side([getattr(f, 'dodge_chance', 0) for f in fighters], np.float64)
+        self.attack_boost = per_side([f.equipment.attack_boost if f.equipment else 0 for f in fighters], np.int64)
+        self.durability = per_side([f.equipment.durability if f.equipment else 0 for f in fighters], np.int64)
+
+        # Combo system
+        self.combo = np.zeros((2, n), np.int64)
+        self.last_move = np.full((2, n), NO_MOVE, np.int8)
+
+        # Class resources and cooldowns
+        self.buff_turns = np.zeros((2, n), np.int64)
+        self.heal_cd = np.zeros((2, n), np.int64)
+        self.meteor_cd = np.zeros((2, n), np.int64)
+        self.shadowstep_cd = np.zeros((2, n), np.int64)
+        self.stealth = np.zeros((2, n), bool)
+        self.shurikens = per_side([getattr(f, 'shuriken_count', 0) for f in fighters], np.int64)
+        self.smoke_bomb_used = per_side([getattr(f, 'smoke_bomb_used', True) for f in fighters], bool)
+
+        # Status effects, laid out like StatusEffects: a bit mask per fighter
+        # plus one (2, n) plane of stacks per status_effects index
+        self.status_mask = np.zeros((2, n), np.int64)
+        self.status = np.zeros((N_STATUSES, 2, n), np.int64)
+
+        # Results, indexed by original battle id
+        self.winners = np.full(n, DRAW, np.int8)
+        self.turns = np.zeros(n, np.int64)
+        self.final_hp = np.zeros((2, n), np.int64)
+
+        self.ids = np.arange(n)  # original battle id of every live column
+        self.done = np.zeros(n, bool)
+        self.turn = 1
+
+        self.handlers = {
+            SWORD_SLASH: self.sword_slash,
+            SHIELD_BASH: self.shield_bash,
+            MIGHTY_STRIKE: self.mighty_strike,
+            RAPID_STRIKES: self.rapid_strikes,
+            CLEAVE: self.cleave,
+            BERSERK_STRIKE: self.berserk_strike,
+            ROAR: self.roar,
+            ARCANE_LANCE: self.arcane_lance,
+            CELESTIAL_HEALING: self.celestial_healing,
+            METEOR_FALL: self.meteor_fall,
+            SHADOWSTEP: self.shadowstep,
+            TWIN_FANG_SLASH: self.twin_fang_slash,
+            SHURIKEN_STORM: self.shuriken_storm,
+            SMOKE_BOMB: self.smoke_bomb,
+        }
+
+    # ====== Main Loop ======
+    def run(self, max_turns=1000):
+        while self.turn <= max_turns and self.n:
+            self.half_turn(0, 1)
+            self.half_turn(1, 0)
+            self.end_of_turn()
+            self.turn += 1
+            if self.done.sum() * 2 >= self.n:
+                self.compact()
+
+        unfinished = self.ids[~self.done]
+        self.turns[unfinished] = max_turns
+        self.final_hp[:, unfinished] = self.hp[:, ~self.done]
+        return BatchResult(self.winners, self.turns, self.final_hp)
+
+    def finish(self, ended, winners):
+        ids = self.ids[ended]
+        self.winners[ids] = winners
+        self.turns[ids] = self.turn
+        self.final_hp[:, ids] = self.hp[:, ended]
+        self.done |= ended
+
+    def compact(self):
+        """Drop finished battles so later turns only touch live columns"""
+        keep = ~self.done
+        for name in STATE_ARRAYS:
+            setattr(self, name, getattr(self, name)[:, keep])
+        self.status = self.status[:, :, keep]
+        self.ids = self.ids[keep]
+        self.done = self.done[keep]
+        self.n = len(self.ids)
+
+    def half_turn(self, a, d):
+        live = ~self.done & (self.hp[a] > 0)
+
+        stunned = live & (self.status[STUNNED, a] > 0)
+        self.drop_status(STUNNED, a, stunned)
+        live &= ~stunned
+
+        untouchable = live & (self.status[UNTOUCHABLE, a] > 0)
+        self.drop_status(UNTOUCHABLE, a, untouchable)
+        live &= ~untouchable
+
+        actions = self.choose_actions(a, live)
+        for action, handler in self.handlers.items():
+            i = np.flatnonzero(actions == action)
+            if i.size:
+                handler(a, d, i)
+
+        killed = live & (self.hp[d] <= 0)
+        self.finish(killed, a)
+
+    def end_of_turn(self):
+        live = ~self.done
+        for s in (0, 1):
+            worn = live & (self.durability[s] > 0)
+            self.durability[s, worn] -= 1
+            self.attack_boost[s, worn & (self.durability[s] <= 0)] = 0
+
+            burning = live & (self.status[BURNING, s] > 0)
+            self.hp[s, burning] -= (self.max_hp[s, burning] * 0.05).astype(np.int64)
+            for status in (FROZEN, SHADOWED):
+                self.drop_status(status, s, live & (self.status[status, s] > 0))
+
+            for cooldown in (self.heal_cd, self.meteor_cd, self.shadowstep_cd):
+                cooldown[s, live & (cooldown[s] > 0)] -= 1
+            reset = live & (self.cls[s] == NINJA) & ~self.stealth[s] & (self.dodge[s] > NINJA_BASE_DODGE)
+            self.dodge[s, reset] = NINJA_BASE_DODGE
+
+        alive1 = self.hp[0] > 0
+        alive2 = self.hp[1] > 0
+        ended = live & ~(alive1 & alive2)
+        self.finish(ended, np.where(alive1[ended], 0, np.where(alive2[ended], 1, DRAW)))
+
+    # ====== Bot Choices ======
+    def view(self, s):
+        """FighterView of side s over every column (row views, nothing copied)"""
+        cls = self.side_cls[s]
+        if cls == MAGE:
+            available = 1 | (self.heal_cd[s] == 0) << 1 | (self.meteor_cd[s] == 0) << 2
+        elif cls == NINJA:
+            available = ((self.shadowstep_cd[s] == 0) | 2 | (self.shurikens[s] > 0) << 2
+                         | ~self.smoke_bomb_used[s] << 3)
+        else:
+            available = np.full(self.n, 0b1111 if cls == KNIGHT else 0b111)
+        return FighterView(self.kinds[s], self.hp[s], self.max_hp[s], self.attack[s], self.defense[s],
+                           self.status_mask[s], available.astype(np.int64), self.buff_turns[s], 1)
+
+    def choose_actions(self, a, live):
+        """Batch move per column (-1 where the fighter doesn't act)"""
+        # Policies are evaluated over every column; only live ones are kept
+        me = self.view(a)
+        ids = self.policies[a].choose_batch(BattleView(self.turn, me, self.view(1 - a)), self.rng)
+        if self.side_cls[a] == NINJA:
+            # Ninja moves that aren't ready fall back to Twin Fang Slash
+            ids = np.where(is_available(me, ids), ids, 2)
+        moves = CLASS_MOVES[self.side_cls[a]]
+        actions = moves[np.where((ids >= 1) & (ids < moves.size), ids, 0)]
+        actions[~live] = -1
+        return actions
+
+    # ====== Status Effects ======
+    def add_status(self, status, s, i, stacks=1):
+        self.status[status, s, i] += stacks
+        self.status_mask[s, i] |= 1 << status
+
+    def drop_status(self, status, s, where):
+        """Remove one stack in the columns selected by the bool array where"""
+        self.status[status, s, where] -= 1
+        self.status_mask[s, where & (self.status[status, s] == 0)] &= ~(1 << status)
+
+    # ====== Combat Mechanics ======
+    def check_combo(self, a, i, move):
+        same = self.last_move[a, i] == move
+        combo = np.where(same, self.combo[a, i] + 1, 1)
+        self.combo[a, i] = combo
+        self.last_move[a, i] = move
+        return np.where(combo >= 3, 1.2 + (0.1 * combo), 1.0)
+
+    def elemental(self, d, i, damage, damage_mod, status):
+        applied = i[self.rng.random(i.size) < 0.4]
+        self.add_status(status, d, applied)
+        return damage * damage_mod
+
+    def apply_dice(self, a, i, damage):
+        roll = self.rng.integers(1, 21, i.size)
+        return damage * DICE_MULTIPLIERS[self.cls[a, i], roll], roll == 1
+
+    def attempt_block(self, d, i, damage, factor=1.0):
+        block_chance = self.block[d, i] * factor if factor != 1.0 else self.block[d, i]
+        blocked = self.rng.random(i.size) < block_chance
+        return np.where(blocked, damage * 0.5, damage)
+
+    def attempt_dodge(self, d, i, base_dodge_chance=0.0):
+        return self.rng.random(i.size) < base_dodge_chance + self.dodge[d, i]
+
+    def deal(self, d, i, damage, defense=None):
+        defense = self.defense[d, i] if defense is None else defense
+        final_damage = np.maximum(0, damage.astype(np.int64) - defense)
+        self.hp[d, i] -= final_damage
+        return final_damage
+
+    # ====== Knight ======
+    def sword_slash(self, a, d, i):
+        combo = self.check_combo(a, i, SWORD_SLASH)
+        damage = (self.attack[a, i] + self.attack_boost[a, i]) * combo
+        damage, miss = self.apply_dice(a, i, damage)
+        i, damage = i[~miss], damage[~miss]
+        damage = self.attempt_block(d, i, damage)
+        self.deal(d, i, damage)
+
+    def shield_bash(self, a, d, i):
+        damage = (self.attack[a, i] * 0.75) + self.attack_boost[a, i]
+        damage, miss = self.apply_dice(a, i, damage)
+        i, damage = i[~miss], damage[~miss]
+        self.deal(d, i, damage)
+        stun_chance = np.where(self.status[FROZEN, d, i] > 0, 0.4, 0.3)
+        stunned = i[self.rng.random(i.size) < stun_chance]
+        self.add_status(STUNNED, d, stunned)
+
+    def mighty_strike(self, a, d, i):
+        i = i[self.rng.random(i.size) < 0.7]
+        combo = self.check_combo(a, i, MIGHTY_STRIKE)
+        damage = (self.attack[a, i] * 1.5 * combo) + self.attack_boost[a, i]
+        damage, miss = self.apply_dice(a, i, damage)
+        i, damage = i[~miss], damage[~miss]
+        damage = self.attempt_block(d, i, damage, 0.5)
+        self.deal(d, i, damage)
+
+    def rapid_strikes(self, a, d, i):
+        for _ in range(3):
+            damage = (self.attack[a, i] * 0.6) + self.attack_boost[a, i]
+            damage, _ = self.apply_dice(a, i, damage)
+            damage = self.attempt_block(d, i, damage)
+            self.deal(d, i, damage)
+
+    # ====== Orc ======
+    def orc_buff(self, a, i, damage):
+        buffed = self.buff_turns[a, i] > 0
+        self.buff_turns[a, i[buffed]] -= 1
+        return np.where(buffed, damage * 1.2, damage)
+
+    def cleave(self, a, d, i):
+        combo = self.check_combo(a, i, CLEAVE)
+        damage = (self.attack[a, i] + self.attack_boost[a, i]) * combo
+        damage = self.orc_buff(a, i, damage)
+        damage = self.elemental(d, i, damage, 1.2, BURNING)
+        damage, miss = self.apply_dice(a, i, damage)
+        self.deal(d, i[~miss], damage[~miss])
+
+    def berserk_strike(self, a, d, i):
+        combo = self.check_combo(a, i, BERSERK_STRIKE)
+        damage = (self.attack[a, i] * 1.8 * combo) + self.attack_boost[a, i]
+        damage = self.orc_buff(a, i, damage)
+        damage = self.elemental(d, i, damage, 1.2, BURNING)
+        damage, miss = self.apply_dice(a, i, damage)
+        hit, damage = i[~miss], damage[~miss]
+        damage = self.attempt_block(d, hit, damage, 0.5)
+        self.deal(d, hit, damage)
+
+        self_damage_multiplier = np.where(self.status[FROZEN, a, i] > 0, 0.5, 1.0)
+        self.hp[a, i] -= (0.1 * self.max_hp[a, i] * self_damage_multiplier).astype(np.int64)
+
+    def roar(self, a, d, i):
+        self.buff_turns[a, i] = 2
+        self.add_status(BUFFED, a, i, 2)
+
+    # ====== Mage ======
+    def arcane_lance(self, a, d, i):
+        combo = self.check_combo(a, i, ARCANE_LANCE)
+        damage = (self.attack[a, i] + self.attack_boost[a, i]) * combo
+        damage = self.elemental(d, i, damage, 1.1, SHOCKED)
+        damage, miss = self.apply_dice(a, i, damage)
+        self.deal(d, i[~miss], damage[~miss])
+
+    def celestial_healing(self, a, d, i):
+        i = i[self.heal_cd[a, i] == 0]
+        heal_amount = (self.attack[a, i] * 1.5).astype(np.int64)
+        self.hp[a, i] = np.minimum(self.max_hp[a, i], self.hp[a, i] + heal_amount)
+        self.heal_cd[a, i] = 3
+
+    def meteor_fall(self, a, d, i):
+        i = i[self.meteor_cd[a, i] == 0]
+        damage = self.attack[a, i] * 2.2
+        damage = self.elemental(d, i, damage, 1.2, BURNING)
+        damage, miss = self.apply_dice(a, i, damage)
+        self.deal(d, i[~miss], damage[~miss])
+        self.meteor_cd[a, i] = 4
+
+    # ====== Ninja ======
+    def shadowstep(self, a, d, i):
+        self.dodge[a, i] += 0.4
+        self.stealth[a, i] = True
+        self.shadowstep_cd[a, i] = 3
+
+    def twin_fang_slash(self, a, d, i):
+        combo = self.check_combo(a, i, TWIN_FANG_SLASH)
+        landed = ~self.attempt_dodge(d, i)
+        i, combo = i[landed], combo[landed]
+        stealth = self.stealth[a, i]
+        for _ in range(2):
+            damage = (self.attack[a, i] * 0.8 * combo) + self.attack_boost[a, i]
+            damage = np.where(stealth, damage * 1.3, damage)
+            damage = self.elemental(d, i, damage, 1.15, SHADOWED)
+            damage, miss = self.apply_dice(a, i, damage)
+            hit, damage = i[~miss], damage[~miss]
+            damage = self.attempt_block(d, hit, damage)
+            self.deal(d, hit, damage)
+
+        cleared = i[stealth]
+        self.stealth[a, cleared] = False
+        self.dodge[a, cleared] -= 0.4
+
+    def shuriken_storm(self, a, d, i):
+        used = np.minimum(self.rng.integers(2, 4, i.size), self.shurikens[a, i])
+        self.shurikens[a, i] -= used
+        for k in range(3):
+            j = i[used > k]
+            j = j[~self.attempt_dodge(d, j, 0.1)]
+            damage = (self.attack[a, j] * 0.6) + self.attack_boost[a, j]
+            damage = self.elemental(d, j, damage, 1.15, SHADOWED)
+            damage, miss = self.apply_dice(a, j, damage)
+            hit, damage = j[~miss], damage[~miss]
+            damage = self.attempt_block(d, hit, damage, 0.3)
+            self.deal(d, hit, damage, self.defense[d, hit] // 2)
+
+        shadowed = i[self.rng.random(i.size) < 0.6]
+        self.add_status(SHADOWED, d, shadowed)
+
+    def smoke_bomb(self, a, d, i):
+        heal = (self.max_hp[a, i] * 0.15).astype(np.int64)
+        self.hp[a, i] = np.minimum(self.max_hp[a, i], self.hp[a, i] + heal)
+        self.shadowstep_cd[a, i] = 0
+        self.add_status(UNTOUCHABLE, a, i)
+        self.smoke_bomb_used[a, i] = True
+
+
+def simulate_batch(fighter1, fighter2, n, max_turns=1000, rng=None):
+    """Run n bot battles between copies of fighter1 and fighter2"""
+    return BatchBattle(fighter1, fighter2, n, rng).run(max_turns)
@@ -1,266 +1,278 @@
-import time
-import numpy as np
+import random_stream
 from colorama import Fore, Style
-from game_utils import colored_text, print_separator, print_banner, battle_ascii, champion
-from knight import Knight
-from orc import Orc
-from mage import Mage
-from ninja import Ninja
-from items import Potion, Bomb
-from boss import Boss
+from game_utils import colored_text, print_separator, print_banner, battle_ascii, champion, display, pause, prompt, rendering, flush_output, is_headless, headless
+from policies import battle_view
+from profiler import NULL_PROFILER
+from status_effects import STUNNED_BIT, UNTOUCHABLE_BIT, BURNING_BIT, BLEEDING_BIT, FRIGHTENED_BIT, FROZEN_BIT, SHADOWED_BIT
+
+class BattleResult:
+    """Structured outcome of a finished battle"""
+    def __init__(self, winner, loser, turns, hp_history):
+        self.winner = winner          # None when nobody survived or the turn limit was hit
+        self.loser = loser
+        self.turns = turns
+        self.hp_history = hp_history  # [(p1 hp, p2 hp)] at the start and after every turn
+
+    @property
+    def is_draw(self):
+        return self.winner is None
+
+    def __repr__(self):
+        winner = self.winner.name if self.winner else "draw"
+        return f"BattleResult(winner={winner!r}, turns={self.turns})"
 
 class Battle:
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, rng=None, events=None, profiler=None):
         self.p1 = player1
         self.p2 = player2
         self.turn = 1
+        self.hp_history = []
+        # Every random draw in this battle comes from one stream (a numpy
+        # Generator, seed or RandomStream; defaults to the shared stream)
+        self.rng = random_stream.as_stream(rng)
         self.p1.p1, self.p1.p2 = self.p1, self.p2
         self.p2.p1, self.p2.p2 = self.p1, self.p2
+        self.p1.rng = self.p2.rng = self.rng
+        # Optional listener notified of every battle event (see event_log.EventLogWriter)
+        self.events = events
+        self.p1.events = self.p2.events = events
+        # Optional profiler.Profiler timing every phase of the turn (None: off)
+        self.profiler = profiler
 
     def display_health_bars(self):
-        print("\n")
+        if not rendering():
+            return
+        display("\n")
         print_separator("=", 45, Fore.MAGENTA)
-        print(f"{colored_text(self.p1.name, Fore.CYAN, Style.BRIGHT)}:")
-        print(f"{self.p1.health_bar()} {self.p1.hp}/{self.p1.max_hp} HP")
-        print("")
-        print(f"{colored_text(self.p2.name, Fore.YELLOW, Style.BRIGHT)}:")
-        print(f"{self.p2.health_bar()} {self.p2.hp}/{self.p2.max_hp} HP")
+        display(f"{colored_text(self.p1.name, Fore.CYAN, Style.BRIGHT)}:")
+        display(f"{self.p1.health_bar()} {self.p1.hp}/{self.p1.max_hp} HP")
+        display("")
+        display(f"{colored_text(self.p2.name, Fore.YELLOW, Style.BRIGHT)}:")
+        display(f"{self.p2.health_bar()} {self.p2.hp}/{self.p2.max_hp} HP")
         print_separator("=", 45, Fore.MAGENTA)
 
-    def fight(self):
-        print(battle_ascii())
-        print_banner("⚔️  BATTLE COMMENCES  ⚔️", Fore.RED)
-        print(colored_text(f"\n{self.p1.name} VS {self.p2.name}", Fore.WHITE, Style.BRIGHT))
+    def simulate(self, max_turns=1000):
+        """Run the battle headless: same rules, no output, no prompts, no delays"""
+        with headless():
+            return self.fight(max_turns)
 
-        self.p1.show_stats()
-        print("")
-        self.p2.show_stats()
-        time.sleep(2)
+    def record_hp(self):
+        self.hp_history.append((self.p1.hp, self.p2.hp))
+
+    def result(self, winner=None, turns=None):
+        if winner is None:
+            # Battle ended outside of a killing blow (status damage or turn limit)
+            if self.p1.is_alive() and not self.p2.is_alive():
+                winner = self.p1
+            elif self.p2.is_alive() and not self.p1.is_alive():
+                winner = self.p2
+        loser = None
+        if winner is not None:
+            loser = self.p2 if winner is self.p1 else self.p1
+        if self.events is not None:
+            self.events.victory(winner, turns if turns is not None else self.turn)
+        if self.profiler is not None:
+            self.profiler.close()
+        return BattleResult(winner, loser, turns if turns is not None else self.turn, self.hp_history)
+
+    def fight(self, max_turns=None):
+        # steps without external input never yields; it runs to the end and
+        # hands the BattleResult back through StopIteration
+        try:
+            next(self.steps(max_turns, external=False))
+        except StopIteration as done:
+            return done.value
 
+    def steps(self, max_turns=None, external=True, resume_after=None):
+        """The battle as a generator driven from outside (e.g. by a network session).
+
+        Whenever a fighter without a policy has to act, the generator yields
+        that fighter and waits for its move (id, menu choice or name) via
+        send(). The BattleResult comes back as StopIteration.value. With
+        external=False humans are prompted instead, which is what fight does.
+        resume_after continues a turn in progress right after that fighter's
+        move (a search picks up from a snapshot taken mid-turn).
+        """
+        presenting = rendering()
+        if presenting and resume_after is None:
+            display(battle_ascii())
+            print_banner("⚔️  BATTLE COMMENCES  ⚔️", Fore.RED)
+            display(colored_text(f"\n{self.p1.name} VS {self.p2.name}", Fore.WHITE, Style.BRIGHT))
+
+            self.p1.show_stats()
+            display("")
+            self.p2.show_stats()
+            pause(2)
+
+        profiler = self.profiler or NULL_PROFILER
+        start, stop = profiler.start, profiler.stop  # no-ops unless profiling
+        start("fight")
+        if resume_after is None:
+            self.hp_history = []
+            self.record_hp()
+            if self.events is not None:
+                self.events.begin_battle(self)
+        skip_until = resume_after  # fighters up to and including this one already moved
         while self.p1.is_alive() and self.p2.is_alive():
-            print(f"\n")
-            print_banner(f"TURN {self.turn}", Fore.YELLOW, "~")
-            self.display_health_bars()
+            if max_turns is not None and self.turn > max_turns:
+                break
+
+            start("turn")
+            if self.events is not None and skip_until is None:
+                self.events.turn_start(self.turn)
+
+            if presenting and skip_until is None:
+                display(f"\n")
+                print_banner(f"TURN {self.turn}", Fore.YELLOW, "~")
+                self.display_health_bars()
 
             for current, enemy in [(self.p1, self.p2), (self.p2, self.p1)]:
+                if skip_until is not None:
+                    if current is skip_until:
+                        skip_until = None
+                    continue
                 if not current.is_alive():
                     continue
 
-                if "STUNNED" in current.status_effects:
-                    print(colored_text(f"💫 {current.name} is STUNNED and loses their turn!", Fore.CYAN, Style.BRIGHT))
+                statuses = current.status_effects.mask
+                if statuses & STUNNED_BIT:
+                    display(colored_text(f"💫 {current.name} is STUNNED and loses their turn!", Fore.CYAN, Style.BRIGHT))
                     current.clear_status_effect("STUNNED")
-                    time.sleep(1.5)
+                    pause(1.5)
                     continue
 
-                if "UNTOUCHABLE" in current.status_effects:
-                    print(colored_text(f"👻 {current.name} is untouchable this turn!", Fore.MAGENTA, Style.BRIGHT))
+                if statuses & UNTOUCHABLE_BIT:
+                    display(colored_text(f"👻 {current.name} is untouchable this turn!", Fore.MAGENTA, Style.BRIGHT))
                     current.clear_status_effect("UNTOUCHABLE")
-                    time.sleep(1.5)
+                    pause(1.5)
                     continue
 
-                print(f"\n{colored_text(f'{current.name}\'s turn:', Fore.CYAN if current == self.p1 else Fore.YELLOW, Style.BRIGHT)}")
-                self.player_turn(current, enemy)
-                time.sleep(1)
+                turn_color = Fore.CYAN if current == self.p1 else Fore.YELLOW
+                display("\n" + colored_text(f"{current.name}'s turn:", turn_color, Style.BRIGHT))
+                choice = None
+                if external and current.policy is None:
+                    choice = yield current
+                hp_before = (self.p1.hp, self.p2.hp)
+                self.player_turn(current, enemy, choice)
+                self.log_damage(hp_before)
+                pause(1)
                 self.display_health_bars()
 
                 if not enemy.is_alive():
+                    self.record_hp()
                     self.victory_sequence(current, enemy)
-                    return
+                    flush_output()
+                    return self.result(current)
 
+            if self.events is not None:
+                self.events.turn_end(self.turn)
+            hp_before = (self.p1.hp, self.p2.hp)
             for player in [self.p1, self.p2]:
                 if player.equipment and player.equipment.durability > 0:
+                    start("wear_down")
                     player.equipment.wear_down()
+                    stop()
+                    if self.events is not None:
+                        self.events.equipment_wear(player, player.equipment.durability)
+                start("elemental_effects")
                 self.handle_elemental_effects(player)
-                if isinstance(player, Mage):
-                    player.reduce_cooldowns()
-                if isinstance(player, Ninja):
-                    player.reduce_cooldowns()
-                if isinstance(player, Boss):
-                    player.reduce_cooldowns()
+                stop()
+                start("reduce_cooldowns")
+                player.reduce_cooldowns()
+                stop()
+            self.log_damage(hp_before)
 
+            self.record_hp()
             self.turn += 1
-            time.sleep(1)
+            stop()
+            flush_output()  # one write per turn
+            pause(1)
+
+        flush_output()
+        return self.result(turns=self.turn - 1)
+
+    def log_damage(self, hp_before):
+        """Report HP changes since hp_before to the event listener"""
+        if self.events is None:
+            return
+        for player, hp in zip((self.p1, self.p2), hp_before):
+            if player.hp != hp:
+                self.events.damage(player, hp - player.hp)
+
+    def log_action(self, player, action):
+        if self.events is not None:
+            self.events.action(player, action.id)
 
     def handle_elemental_effects(self, player):
-        if "BURNING" in player.status_effects:
+        statuses = player.status_effects.mask
+        if not statuses:
+            return
+
+        if statuses & BURNING_BIT:
             burn_damage = int(player.max_hp * 0.05)
             player.hp -= burn_damage
-            print(colored_text(f"🔥 {player.name} takes {burn_damage} burn damage!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"🔥 {player.name} takes {burn_damage} burn damage!", Fore.RED, Style.BRIGHT))
         
-        if "BLEEDING" in player.status_effects:
+        if statuses & BLEEDING_BIT:
             bleed_damage = int(player.max_hp * 0.03)
             player.hp -= bleed_damage
-            print(colored_text(f"🩸 {player.name} takes {bleed_damage} bleed damage!", Fore.RED))
-            player.status_effects.remove("BLEEDING")
+            display(colored_text(f"🩸 {player.name} takes {bleed_damage} bleed damage!", Fore.RED))
+            player.clear_status_effect("BLEEDING")
 
-        if "FRIGHTENED" in player.status_effects:
-            print(colored_text(f"😰 {player.name} is still frightened!", Fore.YELLOW))
-            player.status_effects.remove("FRIGHTENED")
+        if statuses & FRIGHTENED_BIT:
+            display(colored_text(f"😰 {player.name} is still frightened!", Fore.YELLOW))
+            player.clear_status_effect("FRIGHTENED")
 
-        if "FROZEN" in player.status_effects:
-            print(colored_text(f"❄️ {player.name} is slowed by the freezing effect!", Fore.CYAN))
-            player.status_effects.remove("FROZEN")
+        if statuses & FROZEN_BIT:
+            display(colored_text(f"❄️ {player.name} is slowed by the freezing effect!", Fore.CYAN))
+            player.clear_status_effect("FROZEN")
 
-        if "SHADOWED" in player.status_effects:
-            print(colored_text(f"🌙 {player.name} struggles to see through the shadows!", Fore.MAGENTA))
-            player.status_effects.remove("SHADOWED")
+        if statuses & SHADOWED_BIT:
+            display(colored_text(f"🌙 {player.name} struggles to see through the shadows!", Fore.MAGENTA))
+            player.clear_status_effect("SHADOWED")
 
     def victory_sequence(self, winner, loser):
-        time.sleep(1)
-        print(colored_text(f"\n💀 {loser.name} is DEFEATED!", Fore.RED, Style.BRIGHT))
-        time.sleep(1)
+        pause(1)
+        display(colored_text(f"\n💀 {loser.name} is DEFEATED!", Fore.RED, Style.BRIGHT))
+        pause(1)
         print_banner(f"🏆 {winner.name} WINS! 🏆", Fore.GREEN)
         print_separator("=", 50, Fore.YELLOW)
-        print(colored_text(f"  {winner.name} stands victorious!", Fore.CYAN, Style.BRIGHT))
-        print(champion())
+        display(colored_text(f"  {winner.name} stands victorious!", Fore.CYAN, Style.BRIGHT))
+        display(champion())
         print_separator("=", 50, Fore.YELLOW)
         for _ in range(3):
-            print(colored_text("🎉", Fore.MAGENTA, Style.BRIGHT), end=" ")
-            time.sleep(0.3)
-        print("\n")
+            display(colored_text("🎉", Fore.MAGENTA, Style.BRIGHT), end=" ")
+            pause(0.3)
+        display("\n")
 
-    def player_turn(self, player, enemy):
-        is_bot = "Bot" in player.name
+    def player_turn(self, player, enemy, choice=None):
+        """One fighter's move; choice is a human's pick made elsewhere (see steps)"""
+        actions = player.actions
+        policy = player.policy
+        if policy is None and is_headless() and choice is None:
+            policy = player.default_policy
+        is_bot = policy is not None
+        profiler = self.profiler or NULL_PROFILER
+        profiler.start("select")
 
-        if isinstance(player, Boss):
-            choice = player.boss_ai_choice(enemy)
-            print(colored_text(f"🤖 {player.name} prepares a {choice.replace('_', ' ').title()}!", Fore.LIGHTBLACK_EX))
-            time.sleep(0.8)
-        
-            if choice == "claw_strike":
-                player.claw_strike(enemy, is_bot)
-            elif choice == "fire_breath":
-                player.fire_breath(enemy, is_bot)
-            elif choice == "wing_slam":
-                player.wing_slam(enemy, is_bot)
-            elif choice == "roar_of_terror":
-                player.roar_of_terror(enemy, is_bot)
-            elif choice == "berserker_fury":
-                player.berserker_fury(enemy, is_bot)
-            else:
-                player.claw_strike(enemy, is_bot)
-            return
-
-        if isinstance(player, Knight):
-            if is_bot:
-                choice = str(np.random.choice([1, 2, 3, 4, 5], p=[0.3, 0.2, 0.2, 0.2, 0.1]))
-                print(colored_text(f"🤖 {player.name} chooses option {choice}", Fore.LIGHTBLACK_EX))
-                time.sleep(0.8)
-            else:
-                print(colored_text("Choose your action:", Fore.WHITE, Style.BRIGHT))
-                print(f"{colored_text('1)', Fore.RED)} Sword Slash")
-                print(f"{colored_text('2)', Fore.YELLOW)} Shield Bash")
-                print(f"{colored_text('3)', Fore.MAGENTA)} Mighty Strike")
-                print(f"{colored_text('4)', Fore.CYAN)} Rapid Strikes (3 hits)")
-                print(f"{colored_text('5)', Fore.GREEN)} Use Item")
-                choice = input(colored_text("Enter choice (1-5): ", Fore.CYAN))
-
-            if choice == "1": player.sword_slash(enemy, is_bot)
-            elif choice == "2": player.shield_bash(enemy, is_bot)
-            elif choice == "3": player.mighty_strike(enemy, is_bot)
-            elif choice == "4": player.rapid_strikes(enemy, is_bot)
-            elif choice == "5" and not is_bot: self.use_item(player, enemy)
-            else: player.sword_slash(enemy, is_bot)
-
-        elif isinstance(player, Orc):
-            if is_bot:
-                if player.attack_buff_turns <= 0 and np.random.random() < 0.6:
-                    choice = "3"
-                else:
-                    choice = str(np.random.choice([1, 2, 3, 4], p=[0.5, 0.3, 0.1, 0.1]))
-                print(colored_text(f"🤖 {player.name} chooses option {choice}", Fore.LIGHTBLACK_EX))
-                time.sleep(0.8)
-            else:
-                print(colored_text("Choose your action:", Fore.WHITE, Style.BRIGHT))
-                print(f"{colored_text('1)', Fore.RED)} Cleave")
-                print(f"{colored_text('2)', Fore.MAGENTA)} Berserk Strike")
-                print(f"{colored_text('3)', Fore.GREEN)} Roar")
-                print(f"{colored_text('4)', Fore.GREEN)} Use Item")
-                choice = input(colored_text("Enter choice (1-4): ", Fore.CYAN))
-
-            if choice == "1": player.cleave(enemy, is_bot)
-            elif choice == "2": player.berserk_strike(enemy, is_bot)
-            elif choice == "3": player.roar(is_bot)
-            elif choice == "4" and not is_bot: self.use_item(player, enemy)
-            else: player.cleave(enemy, is_bot)
-
-        elif isinstance(player, Mage):
-            if is_bot:
-                if player.cooldowns["meteor"] == 0 and np.random.random() < 0.4:
-                    choice = "3"
-                elif player.hp < player.max_hp // 2 and player.cooldowns["heal"] == 0:
-                    choice = "2"
-                else:
-                    choice = str(np.random.choice([1, 2, 3], p=[0.6, 0.2, 0.2]))
-                print(colored_text(f"🤖 {player.name} chooses option {choice}", Fore.LIGHTBLACK_EX))
-                time.sleep(0.8)
-            else:
-                print(colored_text("Choose your action:", Fore.WHITE, Style.BRIGHT))
-                print(f"{colored_text('1)', Fore.CYAN)} Arcane Lance")
-                print(f"{colored_text('2)', Fore.GREEN)} Celestial Healing (self-heal)")
-                print(f"{colored_text('3)', Fore.RED)} Meteor Fall (AoE)")
-                choice = input(colored_text("Enter choice (1-3): ", Fore.CYAN))
-
-            if choice == "1": player.arcane_lance(enemy, is_bot)
-            elif choice == "2": player.celestial_healing()
-            elif choice == "3": player.meteor_fall([enemy], is_bot)
-            else: player.arcane_lance(enemy, is_bot)
-
-        elif isinstance(player, Ninja):
-            if is_bot:
-                if player.shadowstep_cooldown == 0 and np.random.random() < 0.3:
-                    choice = "1"
-                elif player.shuriken_count > 0 and np.random.random() < 0.4:
-                    choice = "3"
-                elif hasattr(player, 'smoke_bomb_used') and not player.smoke_bomb_used and player.hp < player.max_hp * 0.3:
-                    choice = "4"
-                else:
-                    choice = "2"
-                print(colored_text(f"🤖 {player.name} chooses option {choice}", Fore.LIGHTBLACK_EX))
-                time.sleep(0.8)
-            else:
-                print(colored_text("Choose your action:", Fore.WHITE, Style.BRIGHT))
-                print(f"{colored_text('1)', Fore.MAGENTA)} Shadowstep (Dodge boost)")
-                print(f"{colored_text('2)', Fore.CYAN)} Twin Fang Slash")
-                print(f"{colored_text('3)', Fore.YELLOW)} Shuriken Storm ({player.shuriken_count} left)")
-                print(f"{colored_text('4)', Fore.RED)} Smoke Bomb Escape")
-                print(f"{colored_text('5)', Fore.GREEN)} Use Item")
-                choice = input(colored_text("Enter choice (1-5): ", Fore.CYAN))
-
-            if choice == "1":
-                if not player.shadowstep(is_bot):
-                    player.twin_fang_slash(enemy, is_bot)
-            elif choice == "2":
-                player.twin_fang_slash(enemy, is_bot)
-            elif choice == "3":
-                if not player.shuriken_storm(enemy, is_bot):
-                    player.twin_fang_slash(enemy, is_bot)
-            elif choice == "4":
-                if not player.smoke_bomb_escape(is_bot):
-                    player.twin_fang_slash(enemy, is_bot)
-            elif choice == "5" and not is_bot:
-                self.use_item(player, enemy)
-            else:
-                player.twin_fang_slash(enemy, is_bot)
-
-    def use_item(self, player, enemy):
-        if not player.items:
-            print(colored_text("No items available!", Fore.RED))
-            return
-
-        print(colored_text("Available items:", Fore.CYAN))
-        for i, item in enumerate(player.items):
-            print(f"{i+1}) {item.name}")
+        if choice is not None:
+            action = actions.resolve(choice)
+        elif is_bot:
+            action = actions.resolve(policy.choose(battle_view(self.turn, player, enemy), self.rng), is_bot)
+            if rendering():
+                display(actions.announcement(player, action))
+            pause(0.8)
+        else:
+            display(colored_text("Choose your action:", Fore.WHITE, Style.BRIGHT))
+            for line in actions.menu_lines(player):
+                display(line)
+            action = actions.resolve(prompt(actions.prompt_text()))
 
-        try:
-            choice = int(input("Choose item: ")) - 1
-            if 0 <= choice < len(player.items):
-                item = player.items.pop(choice)
-                if isinstance(item, Potion):
-                    item.use(player)
-                elif isinstance(item, Bomb):
-                    item.use(player, enemy)
-            else:
-                print(colored_text("Invalid choice!", Fore.RED))
-        except (ValueError, IndexError):
-            print(colored_text("Invalid choice!", Fore.RED))
+        player.last_action = (self.turn, action.id)
+        self.log_action(player, action)
+        profiler.stop()
+        profiler.start("execute")
+        profiler.start_move(player, action)
+        actions.perform(action, player, enemy, is_bot)
+        profiler.stop()
+        profiler.stop()
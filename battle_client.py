@@ -0,0 +1,131 @@
+# battle_client.py - Line client and load tester for battle_server
+#
+# Without --load this is a thin interactive client: it prints the server's
+# narration, shows a prompt when it's your move and sends what you type
+# (a move id or name, plus an item number for Use Item).
+#
+# With --load N it opens N connections at once and plays every session as a
+# random bot (QUIET, so only ASK/END lines cross the wire), timing each move
+# from MOVE sent to the server's next ASK or END. The report gives moves per
+# second and latency percentiles, which should stay flat as N grows.
+
+import sys
+import time
+import random
+import asyncio
+
+async def _connect(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+# ====== Interactive Client ======
+async def play(host, port, unix_path, kind, pvp=False, bot=None):
+    reader, writer = await _connect(host, port, unix_path)
+    request = f"JOIN {kind}" if pvp else f"SOLO {kind}" + (f" {bot}" if bot else "")
+    writer.write(request.encode() + b"\n")
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        verb, _, rest = line.decode().rstrip("\n").partition(" ")
+        if verb == "TEXT":
+            print(rest)
+        elif verb == "ASK":
+            turn, hp, enemy_hp, available = rest.split()
+            move = await loop.run_in_executor(None, input, f"[turn {turn}] HP {hp} vs {enemy_hp} - move ({available}): ")
+            writer.write(f"MOVE {move}".encode() + b"\n")
+        elif verb == "END":
+            print(f"Battle over: {rest}")
+            break
+        elif verb == "WAIT":
+            print("Waiting for an opponent...")
+        elif verb != "HELLO":
+            print(line.decode().rstrip("\n"))
+    writer.close()
+
+# ====== Load Test ======
+class LoadStats:
+    def __init__(self):
+        self.latencies = []  # seconds from MOVE to the server's answer
+        self.sessions = 0
+        self.errors = 0
+
+async def bot_session(host, port, unix_path, stats, rounds, think, pvp, rng):
+    reader, writer = await _connect(host, port, unix_path)
+    kinds = ("Knight", "Orc", "Mage", "Ninja")
+
+    def request():
+        kind = rng.choice(kinds)
+        return f"JOIN {kind}" if pvp else f"SOLO {kind}"
+
+    writer.write(f"QUIET\n{request()}\n".encode())
+    sent_at = None
+    played = 0
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        verb, _, rest = line.decode().rstrip("\n").partition(" ")
+        if sent_at is not None and verb in ("ASK", "END"):
+            stats.latencies.append(time.perf_counter() - sent_at)
+            sent_at = None
+        if verb == "ASK":
+            available = rest.split()[3].split(",")
+            if think:
+                await asyncio.sleep(rng.uniform(0, think))
+            move = rng.choice([m for m in available if m != "5"] or available)  # 5 opens the item menu
+            sent_at = time.perf_counter()
+            writer.write(f"MOVE {move}\n".encode())
+        elif verb == "END":
+            played += 1
+            stats.sessions += 1
+            if played >= rounds:
+                break
+            writer.write(f"{request()}\n".encode())
+        elif verb == "ERR":
+            stats.errors += 1
+    writer.write(b"QUIT\n")
+    writer.close()
+
+async def load_test(host, port, unix_path, n, rounds=1, think=0.0, pvp=False, seed=None):
+    stats = LoadStats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*(bot_session(host, port, unix_path, stats, rounds, think, pvp,
+                                       random.Random(rng.random())) for _ in range(n)))
+    return stats, time.perf_counter() - start
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play on or load-test a battle server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--class", dest="kind", default="Knight", choices=["Knight", "Orc", "Mage", "Ninja"])
+    parser.add_argument("--bot", default=None, help="server bot class for a solo battle (default: random)")
+    parser.add_argument("--pvp", action="store_true", help="wait for another player instead of a bot")
+    parser.add_argument("--load", type=int, metavar="N", help="load test with N simultaneous bot sessions")
+    parser.add_argument("--rounds", type=int, default=1, help="battles per load-test connection")
+    parser.add_argument("--think", type=float, default=0.0, help="max seconds a load-test bot waits per move")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if not args.load:
+        try:
+            asyncio.run(play(args.host, args.port, args.unix, args.kind, args.pvp, args.bot))
+        except (KeyboardInterrupt, EOFError):
+            pass
+        sys.exit(0)
+
+    stats, elapsed = asyncio.run(load_test(args.host, args.port, args.unix, args.load,
+                                           args.rounds, args.think, args.pvp, args.seed))
+    moves = len(stats.latencies)
+    print(f"{args.load} connections, {stats.sessions} battles, {moves} moves in {elapsed:.2f}s "
+          f"({moves / elapsed:.0f} moves/s), {stats.errors} errors")
+    if moves:
+        latencies = sorted(stats.latencies)
+        for q in (50, 90, 99):
+            print(f"  p{q} latency {latencies[min(moves - 1, moves * q // 100)] * 1e3:.2f} ms")
@@ -0,0 +1,255 @@
+# battle_server.py - Many concurrent battles behind one socket
+#
+# One asyncio process hosts any number of battle sessions over TCP or a Unix
+# socket. A session is a Battle.steps generator: it only runs when a move
+# arrives, plays until the next human has to choose, and then sits suspended.
+# An idle session is a few objects and a parked generator (no thread, no
+# task, no timer), and a move only costs that one step, so latency doesn't
+# grow with the number of open sessions.
+#
+# Line protocol (UTF-8, one command per line):
+#   client -> server
+#     SOLO <class> [<bot class>]   fight a server bot (random class by default)
+#     JOIN <class>                 fight the next player who joins
+#     MOVE <id|name> [item no.]    your move (the item number is for Use Item)
+#     QUIET / TEXT                 turn battle narration off / on (default on)
+#     QUIT
+#   server -> client
+#     HELLO battle-server
+#     WAIT                         queued for an opponent
+#     START <session> <side> <your class> <opponent class>
+#     TEXT <line>                  narration
+#     ASK <turn> <your hp> <enemy hp> <available move ids, comma separated>
+#     END WIN|LOSS|DRAW <turns>
+#     ERR <message>
+
+import io
+import asyncio
+from collections import deque
+from game_utils import set_headless, set_renderer, use_renderer, use_console
+from renderer import Renderer, NullRenderer
+from random_stream import PyRandomStream
+from battle import Battle
+from tournament_runner import ROSTER
+
+def make_fighter(kind, name):
+    cls, hp, attack, defense = ROSTER[kind]
+    return cls(name, hp, attack, defense)
+
+class SessionConsole:
+    """Answers the prompts a move makes (the Use Item menu) from the MOVE line"""
+    __slots__ = ("answers",)
+
+    def __init__(self):
+        self.answers = deque()
+
+    def prompt(self, text=""):
+        return self.answers.popleft() if self.answers else ""
+
+    def pause(self, seconds):
+        pass
+
+class Connection:
+    __slots__ = ("writer", "text", "session", "fighter")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.text = True      # wants narration
+        self.session = None
+        self.fighter = None   # the fighter this connection plays
+
+    def send(self, line):
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+class Session:
+    """One battle driven step by step from network input"""
+    __slots__ = ("id", "battle", "steps", "seats", "console", "renderer", "buffer", "turn_of", "result")
+
+    def __init__(self, session_id, fighters, connections, max_turns=1000):
+        self.id = session_id
+        self.battle = Battle(*fighters, rng=PyRandomStream())
+        self.steps = self.battle.steps(max_turns)
+        self.seats = connections  # per side: Connection, or None for a server bot
+        self.console = SessionConsole()
+        self.buffer = io.StringIO()
+        if any(conn is not None and conn.text for conn in connections):
+            self.renderer = Renderer(stream=self.buffer, color=False)
+        else:
+            self.renderer = NullRenderer()
+        self.turn_of = None  # fighter whose move the session waits for
+        self.result = None
+
+    def advance(self, choice=None, item_answers=()):
+        """Play until the next human move; returns the narration produced"""
+        self.console.answers.extend(item_answers)
+        with use_renderer(self.renderer), use_console(self.console):
+            try:
+                self.turn_of = self.steps.send(choice)
+            except StopIteration as done:
+                self.turn_of = None
+                self.result = done.value
+        self.console.answers.clear()
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return text
+
+    def seat_of(self, fighter):
+        return self.seats[0] if fighter is self.battle.p1 else self.seats[1]
+
+class BattleServer:
+    def __init__(self, max_turns=1000):
+        self.max_turns = max_turns
+        self.lobby = deque()  # Connections waiting for a PvP opponent, with their class
+        self.next_id = 1
+        self.active = 0
+        self.finished = 0
+
+    # ====== Sessions ======
+    def start(self, kinds, connections):
+        session_id = self.next_id
+        self.next_id += 1
+        fighters = []
+        for side, (kind, conn) in enumerate(zip(kinds, connections)):
+            fighter = make_fighter(kind, f"{'Player' if conn else 'Bot'} {side + 1} {kind}")
+            if conn is None:
+                fighter.policy = fighter.default_policy
+            fighters.append(fighter)
+        session = Session(session_id, fighters, connections, self.max_turns)
+        self.active += 1
+        for side, conn in enumerate(connections):
+            if conn is not None:
+                conn.session = session
+                conn.fighter = fighters[side]
+                conn.send(f"START {session_id} {side + 1} {kinds[side]} {kinds[1 - side]}")
+        self.drive(session)
+
+    def drive(self, session, choice=None, item_answers=()):
+        """Advance a session and tell its players what happened"""
+        text = session.advance(choice, item_answers)
+        if text:
+            lines = [f"TEXT {line}" for line in text.splitlines()]
+            for conn in session.seats:
+                if conn is not None and conn.text:
+                    conn.send("\n".join(lines))
+        if session.result is not None:
+            self.finish(session)
+            return
+        fighter = session.turn_of
+        battle = session.battle
+        enemy = battle.p2 if fighter is battle.p1 else battle.p1
+        available = ",".join(str(a.id) for a in fighter.actions if a.is_available(fighter))
+        session.seat_of(fighter).send(f"ASK {battle.turn} {fighter.hp} {enemy.hp} {available}")
+
+    def finish(self, session, forfeit_by=None):
+        result = session.result
+        for conn in session.seats:
+            if conn is None:
+                continue
+            if forfeit_by is not None:
+                outcome = "LOSS" if conn is forfeit_by else "WIN"
+                turns = session.battle.turn
+            else:
+                outcome = "DRAW" if result.is_draw else ("WIN" if result.winner is conn.fighter else "LOSS")
+                turns = result.turns
+            conn.send(f"END {outcome} {turns}")
+            conn.session = conn.fighter = None
+        session.steps.close()
+        self.active -= 1
+        self.finished += 1
+
+    # ====== Commands ======
+    def command(self, conn, line):
+        verb, _, rest = line.strip().partition(" ")
+        verb = verb.upper()
+        args = rest.split()
+        if verb == "MOVE":
+            session = conn.session
+            if session is None or session.turn_of is not conn.fighter:
+                conn.send("ERR not your turn")
+            elif not args:
+                conn.send("ERR MOVE needs a move id or name")
+            else:
+                self.drive(session, args[0], args[1:])
+        elif verb in ("SOLO", "JOIN"):
+            if conn.session is not None or any(waiting is conn for waiting, _ in self.lobby):
+                conn.send("ERR already playing")
+            elif not args or args[0] not in ROSTER or (verb == "SOLO" and len(args) > 1 and args[1] not in ROSTER):
+                conn.send(f"ERR class must be one of {', '.join(ROSTER)}")
+            elif verb == "SOLO":
+                bot = args[1] if len(args) > 1 else PyRandomStream().choice(list(ROSTER))
+                self.start((args[0], bot), (conn, None))
+            else:
+                self.join(conn, args[0])
+        elif verb == "QUIET":
+            conn.text = False
+        elif verb == "TEXT":
+            conn.text = True
+        elif verb == "QUIT":
+            return False
+        else:
+            conn.send(f"ERR unknown command {verb}")
+        return True
+
+    def join(self, conn, kind):
+        while self.lobby:
+            other, other_kind = self.lobby.popleft()
+            if not other.writer.is_closing():
+                self.start((other_kind, kind), (other, conn))
+                return
+        self.lobby.append((conn, kind))
+        conn.send("WAIT")
+
+    def leave(self, conn):
+        """A connection went away: forfeit its battle or leave the lobby"""
+        session = conn.session
+        if session is not None:
+            self.finish(session, forfeit_by=conn)
+        self.lobby = deque((c, k) for c, k in self.lobby if c is not conn)
+
+    async def handle(self, reader, writer):
+        conn = Connection(writer)
+        conn.send("HELLO battle-server")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line or not self.command(conn, line.decode(errors="replace")):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(conn)
+            writer.close()
+
+async def serve(host="127.0.0.1", port=7777, unix_path=None, max_turns=1000):
+    """Run a BattleServer until cancelled"""
+    set_headless(True)  # no sleeps or dice prompts; sessions install their own renderer
+    set_renderer(NullRenderer())
+    server = BattleServer(max_turns)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path, backlog=4096)
+        print(f"Battle server listening on {unix_path}")
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+        print(f"Battle server listening on {host}:{port}")
+    async with listener:
+        try:
+            await listener.serve_forever()
+        finally:
+            print(f"{server.finished} battles finished, {server.active} still running")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host concurrent battle sessions over a socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-turns", type=int, default=1000)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_turns))
+    except KeyboardInterrupt:
+        pass
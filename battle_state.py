@@ -0,0 +1,140 @@
+# battle_state.py - Snapshot, restore and clone a battle in progress
+#
+# A battle's state is spread over both fighters (plain attributes, the
+# status flag set, items, equipment wear, cooldown dicts), the turn counter,
+# the HP history and the random stream. snapshot() packs all of it into
+# nested tuples of plain values (no object graph to walk, nothing shared
+# that can change later) and restore() writes it back into the same battle,
+# so a search can branch from one position thousands of times:
+#
+#     root = snapshot(battle)
+#     for move in candidates:
+#         restore(battle, root)
+#         ...play the move and look ahead...
+#
+# Between turns, snapshot/restore take a few microseconds each. Which plain
+# attributes are state is declared per class in `state_fields`; equipment
+# objects, items and policies are shared, only their wear is recorded. With
+# rng=False the stream is left alone, so repeated lookaheads from one root
+# see fresh dice instead of replaying the same rolls. Snapshotting a
+# RandomStream is nearly free; a PyRandomStream copies its whole Mersenne
+# Twister state (~15 us), so give searching battles a RandomStream.
+#
+# clone() builds an independent battle (fresh fighters and stream at the
+# same position) for what-if analysis that has to outlive the original.
+# Copying the fighters (clone_fighters) takes ~10 us; copying the stream adds
+# ~20 us for a RandomStream (a new bit generator) and ~30 us for a
+# PyRandomStream, so clone() costs 30-45 us in all. Pass rng to hand the
+# clone a stream of its own and skip the copy.
+
+from operator import attrgetter
+from status_effects import StatusEffects
+
+# ====== Per-class Layout ======
+_layouts = {}
+
+def _layout(cls):
+    """(getter, setter, has_cooldowns) for cls.state_fields, built once per class"""
+    layout = _layouts.get(cls)
+    if layout is None:
+        fields = cls.state_fields
+        layout = _layouts[cls] = (attrgetter(*fields), _setter(fields), hasattr(cls, "cooldowns"))
+    return layout
+
+def _setter(fields):
+    # One generated tuple assignment writes every field without a Python
+    # level loop (about 7x faster than setattr per field)
+    targets = ", ".join(f"f.{name}" for name in fields)
+    namespace = {}
+    exec(f"def set_fields(f, values):\n    {targets}, = values\n", namespace)
+    return namespace["set_fields"]
+
+_slot_copiers = {}
+
+def _copy_slots(obj):
+    """Shallow copy of a __slots__ object (copy.copy is ~10 us for a fighter)"""
+    cls = type(obj)
+    copier = _slot_copiers.get(cls)
+    if copier is None:
+        slots = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get("__slots__", ()))
+        copier = _slot_copiers[cls] = (attrgetter(*slots), _setter(slots))
+    get, set_slots = copier
+    twin = cls.__new__(cls)
+    set_slots(twin, get(obj))
+    return twin
+
+# ====== Fighters ======
+def fighter_state(fighter):
+    get, _, has_cooldowns = _layout(type(fighter))
+    equipment = fighter.equipment
+    statuses = fighter.status_effects
+    return (
+        get(fighter),
+        statuses.mask,
+        tuple(statuses.stacks),
+        tuple(fighter.items),
+        None if equipment is None else (equipment.durability, equipment.attack_boost, equipment.defense_boost),
+        fighter.cooldowns.copy() if has_cooldowns else None,
+    )
+
+def restore_fighter(fighter, state):
+    values, mask, stacks, items, wear, cooldowns = state
+    _, set_fields, _ = _layout(type(fighter))
+    set_fields(fighter, values)
+    statuses = fighter.status_effects
+    statuses.mask = mask
+    statuses.stacks[:] = stacks
+    fighter.items[:] = items
+    if wear is not None:
+        equipment = fighter.equipment
+        equipment.durability, equipment.attack_boost, equipment.defense_boost = wear
+    if cooldowns is not None:
+        fighter.cooldowns.update(cooldowns)
+
+# ====== Battles ======
+def snapshot(battle, rng=True):
+    """Full state of battle as plain tuples; rng=False leaves the stream out"""
+    return (
+        battle.turn,
+        tuple(battle.hp_history),
+        battle.rng.getstate() if rng else None,
+        fighter_state(battle.p1),
+        fighter_state(battle.p2),
+    )
+
+def restore(battle, state):
+    """Put battle back into a state taken by snapshot() from it"""
+    turn, hp_history, rng_state, p1_state, p2_state = state
+    battle.turn = turn
+    battle.hp_history[:] = hp_history
+    if rng_state is not None:
+        battle.rng.setstate(rng_state)
+    restore_fighter(battle.p1, p1_state)
+    restore_fighter(battle.p2, p2_state)
+
+def _copy_fighter(fighter):
+    twin = _copy_slots(fighter)  # shares every slot; now give it its own mutable parts
+    statuses = twin.status_effects = StatusEffects()
+    statuses.mask = fighter.status_effects.mask
+    statuses.stacks[:] = fighter.status_effects.stacks
+    twin.items = list(fighter.items)
+    if fighter.equipment is not None:
+        twin.equipment = _copy_slots(fighter.equipment)
+    if hasattr(fighter, "cooldowns"):
+        twin.cooldowns = fighter.cooldowns.copy()
+    return twin
+
+def clone_fighters(*fighters):
+    """Copies of fighters in their current state, sharing nothing mutable"""
+    return [_copy_fighter(fighter) for fighter in fighters]
+
+def clone(battle, rng=None):
+    """Independent copy of battle: new fighters, equipment and stream, same
+    state. rng (a seed, Generator or stream) replaces the copied stream.
+    Event listeners and profilers are not carried over."""
+    twin = type(battle)(*clone_fighters(battle.p1, battle.p2),
+                        rng=battle.rng.copy() if rng is None else rng)
+    twin.turn = battle.turn
+    twin.hp_history[:] = battle.hp_history
+    return twin
@@ -0,0 +1,261 @@
+# benchmarks.py - Speed benchmarks for moves, battles and tournaments
+#
+# Every benchmark is a setup function and the operation it prepares: setup
+# runs outside the timer (resetting HP, cooldowns and so on), the operation
+# is timed on its own with perf_counter_ns. All of it runs headless, so no
+# output is built and no pauses are slept. Results (ops/sec and latency
+# percentiles) can be saved as JSON and later compared against such a file
+# as a baseline: a benchmark whose median latency grew by more than the
+# threshold is reported as a regression and the run exits non-zero.
+#
+# startup.import_main times `import main` in fresh interpreters. The menu
+# must come up within an import-time budget and without loading numpy; a
+# run that breaks either rule also exits non-zero.
+
+import os
+import sys
+import json
+import platform
+import subprocess
+import time
+import numpy as np
+from random_stream import RandomStream
+from game_utils import headless
+from battle import Battle
+from tournament import Tournament
+from tournament_runner import ROSTER
+from boss import Boss
+import battle_state
+
+class BenchmarkResult:
+    """Latency samples of one benchmark, in nanoseconds"""
+    def __init__(self, name, samples):
+        self.name = name
+        self.samples = np.asarray(samples, dtype=np.int64)
+
+    @property
+    def ops_per_sec(self):
+        return self.samples.size / (self.samples.sum() / 1e9)
+
+    def percentile(self, q):
+        """Latency in microseconds"""
+        return float(np.percentile(self.samples, q)) / 1e3
+
+    def as_dict(self):
+        return {
+            "ops_per_sec": self.ops_per_sec,
+            "mean_us": float(self.samples.mean()) / 1e3,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "samples": int(self.samples.size),
+        }
+
+# ====== Benchmarks ======
+def _stream(seed):
+    return RandomStream(np.random.default_rng(seed))
+
+def _fighter(name, seed=0):
+    cls, hp, attack, defense = ROSTER[name]
+    fighter = cls(f"Bot {name}", hp, attack, defense)
+    fighter.policy = fighter.default_policy
+    fighter.rng = _stream(seed)
+    return fighter
+
+def _move(attacker, move, defender, reset=None, wrap_target=False):
+    """One move from a fresh start: HP, combo and statuses are restored before every call"""
+    handler = getattr(attacker, move)
+    target = [defender] if wrap_target else defender
+
+    def setup():
+        defender.hp = defender.max_hp
+        defender.status_effects.clear()
+        attacker.last_move = None
+        attacker.combo_counter = 0
+        if reset:
+            reset(attacker)
+        return ()
+
+    return setup, lambda: handler(target, True)
+
+def _boss():
+    boss = Boss("Ancient Shadow Dragon", 350, 28, 15, [])
+    boss.rng = _stream(0)
+    return boss
+
+def _fury_ready(boss):
+    boss.phase = 3
+    boss.cooldowns["berserker_fury"] = 0
+
+def _battle(first, second):
+    seeds = np.random.SeedSequence(0)
+
+    def setup():
+        return (Battle(_fighter(first), _fighter(second), rng=np.random.default_rng(seeds.spawn(1)[0])),)
+
+    return setup, lambda battle: battle.fight(max_turns=1000)
+
+def _tournament(player_class):
+    seeds = np.random.SeedSequence(0)
+
+    def setup():
+        rng = _stream(seeds.spawn(1)[0])
+        return (Tournament(_fighter(player_class), rng),)
+
+    return setup, lambda tournament: tournament.run_tournament()
+
+def _battle_state(operation):
+    """snapshot/restore/clone of a Mage vs Ninja battle five turns in"""
+    battle = Battle(_fighter("Mage"), _fighter("Ninja"), rng=_stream(0))
+    with headless():
+        battle.fight(max_turns=5)
+    state = battle_state.snapshot(battle)
+    return (lambda: (battle,)), {
+        "snapshot": battle_state.snapshot,
+        "restore": lambda battle: battle_state.restore(battle, state),
+        "clone": battle_state.clone,
+    }[operation]
+
+def default_benchmarks():
+    """{name: (setup, operation)}; operation(*setup()) is what gets timed"""
+    benchmarks = {
+        "move.knight.sword_slash": _move(_fighter("Knight"), "sword_slash", _fighter("Orc")),
+        "move.orc.berserk_strike": _move(_fighter("Orc"), "berserk_strike", _fighter("Knight"),
+                                         reset=lambda orc: setattr(orc, "hp", orc.max_hp)),
+        "move.mage.meteor_fall": _move(_fighter("Mage"), "meteor_fall", _fighter("Ninja"), wrap_target=True,
+                                       reset=lambda mage: mage.cooldowns.update(meteor=0)),
+        "move.ninja.shuriken_storm": _move(_fighter("Ninja"), "shuriken_storm", _fighter("Mage"),
+                                           reset=lambda ninja: setattr(ninja, "shuriken_count", 6)),
+        "move.boss.berserker_fury": _move(_boss(), "berserker_fury", _fighter("Knight"), reset=_fury_ready),
+    }
+    for first in ROSTER:
+        for second in ROSTER:
+            benchmarks[f"battle.{first.lower()}_vs_{second.lower()}"] = _battle(first, second)
+    for operation in ("snapshot", "restore", "clone"):
+        benchmarks[f"state.{operation}"] = _battle_state(operation)
+    benchmarks["tournament.bot"] = _tournament("Knight")
+    return benchmarks
+
+def run_benchmark(name, setup, operation, min_time=0.5, min_samples=20, max_samples=100_000, warmup=5):
+    """Time operation until min_time of it has been measured (and at least min_samples)"""
+    timer = time.perf_counter_ns
+    with headless():
+        for _ in range(warmup):
+            operation(*setup())
+        samples = []
+        measured = 0
+        while (measured < min_time * 1e9 or len(samples) < min_samples) and len(samples) < max_samples:
+            args = setup()
+            start = timer()
+            operation(*args)
+            elapsed = timer() - start
+            samples.append(elapsed)
+            measured += elapsed
+    return BenchmarkResult(name, samples)
+
+def run_benchmarks(benchmarks=None, pattern=None, **options):
+    """{name: BenchmarkResult} for every benchmark whose name contains pattern"""
+    benchmarks = benchmarks or default_benchmarks()
+    return {name: run_benchmark(name, setup, operation, **options)
+            for name, (setup, operation) in benchmarks.items()
+            if pattern is None or pattern in name}
+
+# ====== Startup ======
+STARTUP_HEAVY = ("numpy",)  # modules the menu must not load
+STARTUP_BUDGET_MS = 50.0     # median `import main` time allowed
+STARTUP_PROBE = """
+import time
+start = time.perf_counter_ns()
+import {module}
+elapsed = time.perf_counter_ns() - start
+import lazy_modules
+print(elapsed, *(int(lazy_modules.is_loaded(name)) for name in {heavy!r}))
+"""
+
+def measure_import(module="main", runs=10):
+    """(BenchmarkResult of importing module in fresh interpreters, heavy modules it loaded)"""
+    code = STARTUP_PROBE.format(module=module, heavy=STARTUP_HEAVY)
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                             capture_output=True, text=True).stdout.split()
+        samples.append(int(out[0]))
+        loaded.update(name for name, flag in zip(STARTUP_HEAVY, out[1:]) if flag == "1")
+    return BenchmarkResult(f"startup.import_{module}", samples), sorted(loaded)
+
+def check_startup(result, loaded, budget_ms):
+    """Problems with a measure_import result: over budget (median) or heavy imports"""
+    problems = []
+    if result.percentile(50) > budget_ms * 1e3:
+        problems.append(f"{result.name}: p50 {result.percentile(50) / 1e3:.1f}ms exceeds {budget_ms:g}ms budget")
+    for name in loaded:
+        problems.append(f"{result.name}: {name} is imported at startup")
+    return problems
+
+# ====== Reports ======
+def to_json(results):
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {name: result.as_dict() for name, result in results.items()},
+    }
+
+def compare(results, baseline, threshold=0.10):
+    """[(name, baseline p50, current p50, change)] of benchmarks slower than threshold"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        now = result.percentile(50)
+        change = now / before["p50_us"] - 1
+        if change > threshold:
+            regressions.append((name, before["p50_us"], now, change))
+    return regressions
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark moves, battles and tournaments")
+    parser.add_argument("-k", dest="pattern", default=None, help="only run benchmarks containing this")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds measured per benchmark")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown")
+    parser.add_argument("--import-budget", type=float, default=STARTUP_BUDGET_MS, metavar="MS",
+                        help="allowed median time of `import main`")
+    args = parser.parse_args()
+
+    results = run_benchmarks(pattern=args.pattern, min_time=args.min_time)
+    startup_problems = []
+    if args.pattern is None or args.pattern in "startup.import_main":
+        startup, loaded = measure_import("main")
+        results[startup.name] = startup
+        startup_problems = check_startup(startup, loaded, args.import_budget)
+    print(f"{'benchmark':<30} {'ops/sec':>12} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10}")
+    for name, result in results.items():
+        row = result.as_dict()
+        print(f"{name:<30} {row['ops_per_sec']:>12.1f} {row['p50_us']:>10.1f} "
+              f"{row['p90_us']:>10.1f} {row['p99_us']:>10.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(to_json(results), f, indent=2)
+
+    for problem in startup_problems:
+        print(f"STARTUP {problem}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for name, before, now, change in regressions:
+            print(f"REGRESSION {name}: p50 {before:.1f}us -> {now:.1f}us (+{change:.0%})")
+        if not regressions:
+            print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    if regressions or startup_problems:
+        sys.exit(1)
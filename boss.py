@@ -1,21 +1,44 @@
+from functools import lru_cache
 from colorama import Fore, Style
-import numpy as np
-import time
-from game_utils import colored_text, print_banner, print_separator
+import random_stream
+from status_effects import StatusEffects
+from actions import Action, ActionTable
+from policies import BossPolicy
+from game_utils import colored_text, print_banner, print_separator, display, pause, rendering, get_renderer
+
+@lru_cache(maxsize=256)
+def render_boss_bar(filled, bar_length, bar_color, use_color):
+    """Cached boss health bar (use_color keys the colored/plain variants apart)"""
+    bar = (colored_text('█' * filled, bar_color)
+           + colored_text('░' * (bar_length - filled), Fore.LIGHTBLACK_EX))
+    return f"[{bar}] BOSS"
 
 class Boss:
     """Special boss enemies with unique mechanics"""
+    __slots__ = (
+        "name", "hp", "max_hp", "attack", "defense", "special_abilities", "status_effects",
+        "equipment", "items", "gold", "phase", "max_phase", "rage_counter", "block_chance",
+        "dodge_chance", "last_move", "combo_counter", "elemental_affinity", "cooldowns",
+        "p1", "p2", "rng", "events", "tournament_wins", "policy", "last_action",
+    )
+    # Plain attributes a battle changes, captured by battle_state snapshots
+    state_fields = (
+        "hp", "max_hp", "attack", "defense", "equipment", "elemental_affinity", "combo_counter",
+        "last_move", "block_chance", "dodge_chance", "phase", "rage_counter",
+    )
+
     def __init__(self, name, hp, attack, defense, special_abilities):
-        self.name = name + " Bot"  # Add Bot to name for AI recognition
+        self.name = name + " Bot"
         self.hp = hp
         self.max_hp = hp
         self.attack = attack
         self.defense = defense
         self.special_abilities = special_abilities
-        self.status_effects = []
+        self.status_effects = StatusEffects()
         self.equipment = None
         self.items = []
         self.gold = 0
+        self.tournament_wins = 0
         self.phase = 1
         self.max_phase = 3
         self.rage_counter = 0
@@ -34,28 +57,35 @@ class Boss:
         # Battle references (set during battle)
         self.p1 = None  
         self.p2 = None  
+        self.rng = random_stream.default_stream()
+        self.events = None
+        self.policy = self.default_policy  # bosses are always AI controlled
+        self.last_action = None  # (turn, action id) of the latest move, set by the battle
     
     def is_alive(self):
         return self.hp > 0
     
     def clear_status_effect(self, effect):
         """Remove a status effect"""
-        if effect in self.status_effects:
-            self.status_effects.remove(effect)
+        if self.status_effects.remove(effect):
+            if self.events is not None:
+                self.events.status(self, effect, False)
     
     def add_status_effect(self, effect, duration=1):
         """Add status effect with resistance to CC spam"""
         if effect in ["STUNNED", "FROZEN"]:
             # 50% chance to resist if already affected
-            if effect in self.status_effects and np.random.random() < 0.5:
-                print(colored_text(f"👹 {self.name} resists {effect}!", Fore.MAGENTA))
+            if effect in self.status_effects and self.rng.random() < 0.5:
+                display(colored_text(f"👹 {self.name} resists {effect}!", Fore.MAGENTA))
                 return
                 
         if effect not in self.status_effects:
-            self.status_effects.append(effect)
+            self.status_effects.add(effect)
+            if self.events is not None:
+                self.events.status(self, effect, True)
             # Special handling for burning (reduced damage)
             if effect == "BURNING":
-                print(colored_text(f"🔥 {self.name} is burning (reduced effect)!", Fore.RED))
+                display(colored_text(f"🔥 {self.name} is burning (reduced effect)!", Fore.RED))
 
     def equip(self, equipment):
         """Equip an item and update elemental affinity"""
@@ -66,40 +96,39 @@ class Boss:
     def health_bar(self, bar_length=25):
         hp_ratio = self.hp / self.max_hp
         filled = int(bar_length * hp_ratio)
-        bar = (colored_text('█' * filled, 
-               Fore.RED if hp_ratio < 0.3 else Fore.YELLOW if hp_ratio < 0.6 else Fore.GREEN)
-               + colored_text('░' * (bar_length - filled), Fore.LIGHTBLACK_EX))
-        return f"[{bar}] BOSS"
+        bar_color = Fore.RED if hp_ratio < 0.3 else Fore.YELLOW if hp_ratio < 0.6 else Fore.GREEN
+        return render_boss_bar(filled, bar_length, bar_color, get_renderer().color)
     
     def show_stats(self):
+        if not rendering():
+            return
         print_separator("~", 40, Fore.RED)
-        print(colored_text(f"👹 {self.name} - Phase {self.phase}", Fore.RED, Style.BRIGHT))
-        print(f"HP: {self.health_bar()} {self.hp}/{self.max_hp}")
-        print(f"ATK: {colored_text(str(self.attack), Fore.RED)} | DEF: {colored_text(str(self.defense), Fore.BLUE)}")
+        display(colored_text(f"👹 {self.name} - Phase {self.phase}", Fore.RED, Style.BRIGHT))
+        display(f"HP: {self.health_bar()} {self.hp}/{self.max_hp}")
+        display(f"ATK: {colored_text(str(self.attack), Fore.RED)} | DEF: {colored_text(str(self.defense), Fore.BLUE)}")
         
         # Show equipment if exists
         if self.equipment:
-            print(f"Equip: {self.equipment.name}")
+            display(f"Equip: {self.equipment.name}")
         
         # Show active status effects
         if self.status_effects:
-            print(f"Status: {', '.join(self.status_effects)}")
+            display(f"Status: {', '.join(self.status_effects)}")
         
         # Show cooldowns
         active_cds = [name for name, cd in self.cooldowns.items() if cd > 0]
         if active_cds:
-            print(f"Cooldowns: {', '.join(active_cds)}")
+            display(f"Cooldowns: {', '.join(active_cds)}")
     
     def phase_transition(self):
         """Enhanced phase change with status cleansing"""
         if self.phase < self.max_phase and self.hp <= (self.max_hp * (self.max_phase - self.phase) / self.max_phase):
             self.phase += 1
-            print(colored_text(f"💀 {self.name} enters Phase {self.phase}!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"💀 {self.name} enters Phase {self.phase}!", Fore.RED, Style.BRIGHT))
             
             # Cleanse negative effects
             for effect in ["STUNNED", "FROZEN", "BURNING", "SHOCKED"]:
-                if effect in self.status_effects:
-                    self.status_effects.remove(effect)
+                self.clear_status_effect(effect)
             
             # Stat boosts
             self.attack = int(self.attack * 1.2)
@@ -112,159 +141,140 @@ class Boss:
             
             # Phase-specific buffs
             if self.phase == 2:
-                print(colored_text("🔥 Attacks now inflict BURNING!", Fore.RED))
+                display(colored_text("🔥 Attacks now inflict BURNING!", Fore.RED))
             elif self.phase == 3:
                 self.block_chance = 0.1  # Better blocking in final phase
-                print(colored_text("⚡ Entered BERSERK MODE! Cooldowns reduced!", Fore.YELLOW))
+                display(colored_text("⚡ Entered BERSERK MODE! Cooldowns reduced!", Fore.YELLOW))
             
-            time.sleep(2)
+            pause(2)
             return True
         return False
     # Boss Attack Methods
     def claw_strike(self, enemy, is_bot=True):
         """Basic claw attack"""
         if is_bot:
-            print(colored_text(f"🦅 {self.name} slashes with razor-sharp claws!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"🦅 {self.name} slashes with razor-sharp claws!", Fore.RED, Style.BRIGHT))
         
-        damage = np.random.randint(self.attack - 3, self.attack + 3)
+        damage = self.rng.randint(self.attack - 3, self.attack + 3)
         actual_damage = max(1, damage - enemy.defense)
         enemy.hp -= actual_damage
         
-        print(colored_text(f"💥 {enemy.name} takes {actual_damage} damage!", Fore.RED))
+        display(colored_text(f"💥 {enemy.name} takes {actual_damage} damage!", Fore.RED))
         
         # Phase 2+: Chance to inflict bleeding
-        if self.phase >= 2 and np.random.random() < 0.3:
-            enemy.status_effects.append("BLEEDING")
-            print(colored_text(f"🩸 {enemy.name} is bleeding!", Fore.RED))
+        if self.phase >= 2 and self.rng.random() < 0.3:
+            enemy.add_status_effect("BLEEDING")
+            display(colored_text(f"🩸 {enemy.name} is bleeding!", Fore.RED))
     
     def fire_breath(self, enemy, is_bot=True):
         """Fire breath attack with burning effect"""
         if self.cooldowns["fire_breath"] > 0:
-            print(colored_text(f"🔥 Fire Breath is on cooldown! Using claw strike instead.", Fore.YELLOW))
+            display(colored_text(f"🔥 Fire Breath is on cooldown! Using claw strike instead.", Fore.YELLOW))
             self.claw_strike(enemy, is_bot)
             return
         
         if is_bot:
-            print(colored_text(f"🔥 {self.name} unleashes a torrent of flames!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"🔥 {self.name} unleashes a torrent of flames!", Fore.RED, Style.BRIGHT))
         
-        damage = np.random.randint(self.attack + 5, self.attack + 10)
+        damage = self.rng.randint(self.attack + 5, self.attack + 10)
         actual_damage = max(1, damage - enemy.defense // 2)  # Fire breath bypasses some defense
         enemy.hp -= actual_damage
         
-        print(colored_text(f"🔥 {enemy.name} is engulfed in flames for {actual_damage} damage!", Fore.RED))
+        display(colored_text(f"🔥 {enemy.name} is engulfed in flames for {actual_damage} damage!", Fore.RED))
         
         # Apply burning effect
         if "BURNING" not in enemy.status_effects:
-            enemy.status_effects.append("BURNING")
-            print(colored_text(f"🔥 {enemy.name} is burning!", Fore.RED))
+            enemy.add_status_effect("BURNING")
+            display(colored_text(f"🔥 {enemy.name} is burning!", Fore.RED))
         
         self.cooldowns["fire_breath"] = 3
     
     def wing_slam(self, enemy, is_bot=True):
         """Powerful wing attack that can stun"""
         if self.cooldowns["wing_slam"] > 0:
-            print(colored_text(f"💨 Wing Slam is on cooldown! Using claw strike instead.", Fore.YELLOW))
+            display(colored_text(f"💨 Wing Slam is on cooldown! Using claw strike instead.", Fore.YELLOW))
             self.claw_strike(enemy, is_bot)
             return
         
         if is_bot:
-            print(colored_text(f"💨 {self.name} spreads massive wings and slams down!", Fore.MAGENTA, Style.BRIGHT))
+            display(colored_text(f"💨 {self.name} spreads massive wings and slams down!", Fore.MAGENTA, Style.BRIGHT))
         
-        damage = np.random.randint(self.attack + 3, self.attack + 8)
+        damage = self.rng.randint(self.attack + 3, self.attack + 8)
         actual_damage = max(1, damage - enemy.defense)
         enemy.hp -= actual_damage
         
-        print(colored_text(f"💥 {enemy.name} is crushed for {actual_damage} damage!", Fore.RED))
+        display(colored_text(f"💥 {enemy.name} is crushed for {actual_damage} damage!", Fore.RED))
         
         # Chance to stun
-        if np.random.random() < 0.4:
-            enemy.status_effects.append("STUNNED")
-            print(colored_text(f"💫 {enemy.name} is stunned by the impact!", Fore.CYAN))
+        if self.rng.random() < 0.4:
+            enemy.add_status_effect("STUNNED")
+            display(colored_text(f"💫 {enemy.name} is stunned by the impact!", Fore.CYAN))
         
         self.cooldowns["wing_slam"] = 2
     
     def roar_of_terror(self, enemy, is_bot=True):
         """Intimidating roar that reduces enemy stats"""
         if self.cooldowns["roar_of_terror"] > 0:
-            print(colored_text(f"👹 Roar of Terror is on cooldown! Using claw strike instead.", Fore.YELLOW))
+            display(colored_text(f"👹 Roar of Terror is on cooldown! Using claw strike instead.", Fore.YELLOW))
             self.claw_strike(enemy, is_bot)
             return
         
         if is_bot:
-            print(colored_text(f"👹 {self.name} lets out a bone-chilling roar!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"👹 {self.name} lets out a bone-chilling roar!", Fore.RED, Style.BRIGHT))
         
         # Reduce enemy attack temporarily
         original_attack = enemy.attack
         enemy.attack = max(1, int(enemy.attack * 0.8))
-        enemy.status_effects.append("FRIGHTENED")
+        enemy.add_status_effect("FRIGHTENED")
         
-        print(colored_text(f"😰 {enemy.name} is frightened and weakened! (Attack: {original_attack} → {enemy.attack})", Fore.YELLOW))
+        display(colored_text(f"😰 {enemy.name} is frightened and weakened! (Attack: {original_attack} → {enemy.attack})", Fore.YELLOW))
         
         self.cooldowns["roar_of_terror"] = 4
     
     def berserker_fury(self, enemy, is_bot=True):
         """Phase 3 ultimate attack - multiple strikes"""
         if self.phase < 3:
-            print(colored_text(f"😡 Not in final phase yet! Using claw strike instead.", Fore.YELLOW))
+            display(colored_text(f"😡 Not in final phase yet! Using claw strike instead.", Fore.YELLOW))
             self.claw_strike(enemy, is_bot)
             return
             
         if self.cooldowns["berserker_fury"] > 0:
-            print(colored_text(f"😡 Berserker Fury is on cooldown! Using claw strike instead.", Fore.YELLOW))
+            display(colored_text(f"😡 Berserker Fury is on cooldown! Using claw strike instead.", Fore.YELLOW))
             self.claw_strike(enemy, is_bot)
             return
         
         if is_bot:
-            print(colored_text(f"😡 {self.name} enters a berserker fury!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"😡 {self.name} enters a berserker fury!", Fore.RED, Style.BRIGHT))
         
         # Multiple attacks
         total_damage = 0
         for i in range(3):
-            damage = np.random.randint(self.attack - 2, self.attack + 2)
+            damage = self.rng.randint(self.attack - 2, self.attack + 2)
             actual_damage = max(1, damage - enemy.defense)
             enemy.hp -= actual_damage
             total_damage += actual_damage
-            print(colored_text(f"💥 Strike {i+1}: {actual_damage} damage!", Fore.RED))
-            time.sleep(0.5)
+            display(colored_text(f"💥 Strike {i+1}: {actual_damage} damage!", Fore.RED))
+            pause(0.5)
         
-        print(colored_text(f"🔥 Total fury damage: {total_damage}!", Fore.RED, Style.BRIGHT))
+        display(colored_text(f"🔥 Total fury damage: {total_damage}!", Fore.RED, Style.BRIGHT))
         self.cooldowns["berserker_fury"] = 5
     
-    def boss_ai_choice(self, enemy):
-        """AI logic for boss attacks"""
-        available_abilities = []
-        
-        # Check which abilities are available (not on cooldown)
-        if self.cooldowns["fire_breath"] == 0:
-            available_abilities.append("fire_breath")
-        if self.cooldowns["wing_slam"] == 0:
-            available_abilities.append("wing_slam")
-        if self.cooldowns["roar_of_terror"] == 0:
-            available_abilities.append("roar_of_terror")
-        if self.cooldowns["berserker_fury"] == 0 and self.phase >= 3:
-            available_abilities.append("berserker_fury")
-        
-        # Always have claw strike available
-        available_abilities.append("claw_strike")
-        
-        # AI decision making
-        if self.phase == 3 and "berserker_fury" in available_abilities and np.random.random() < 0.4:
-            return "berserker_fury"
-        
-        if self.hp < self.max_hp * 0.3 and "roar_of_terror" in available_abilities and np.random.random() < 0.5:
-            return "roar_of_terror"
-        
-        if self.phase >= 2 and "fire_breath" in available_abilities and np.random.random() < 0.3:
-            return "fire_breath"
-        
-        if "wing_slam" in available_abilities and np.random.random() < 0.25:
-            return "wing_slam"
-        
-        # Default to claw strike
-        return "claw_strike"
-    
     def reduce_cooldowns(self):
         """Reduce cooldowns at end of turn"""
         for ability in self.cooldowns:
             if self.cooldowns[ability] > 0:
-                self.cooldowns[ability] -= 1
\ No newline at end of file
+                self.cooldowns[ability] -= 1
+
+    # ====== Actions ======
+    actions = ActionTable([
+        Action("claw_strike", "Claw Strike", claw_strike),
+        Action("fire_breath", "Fire Breath", fire_breath,
+               available=lambda b: b.cooldowns["fire_breath"] == 0),
+        Action("wing_slam", "Wing Slam", wing_slam,
+               available=lambda b: b.cooldowns["wing_slam"] == 0),
+        Action("roar_of_terror", "Roar Of Terror", roar_of_terror,
+               available=lambda b: b.cooldowns["roar_of_terror"] == 0),
+        Action("berserker_fury", "Berserker Fury", berserker_fury,
+               available=lambda b: b.cooldowns["berserker_fury"] == 0 and b.phase >= 3),
+    ], announce="🤖 {f.name} prepares a {a.label}!")
+    default_policy = BossPolicy()
@@ -1,9 +1,41 @@
+from functools import lru_cache
 from colorama import Fore, Style
-from game_utils import colored_text, print_separator
-from items import Potion, Bomb
+from game_utils import colored_text, print_separator, display, prompt, rendering, get_renderer, roll_dice
+from items import STARTER_ITEMS, Potion, Bomb
+import random_stream
+from status_effects import StatusEffects
+
+# ====== Cached Rendering ======
+# A bar only depends on a few discrete inputs, so each variant is built once.
+# use_color is part of the key because colored_text output depends on it.
+@lru_cache(maxsize=512)
+def render_health_bar(filled_length, bar_length, bar_char, bar_color, critical, use_color):
+    empty_length = bar_length - filled_length
+    bar = colored_text(bar_char * filled_length, bar_color) + colored_text('░' * empty_length, Fore.LIGHTBLACK_EX)
+    
+    critical_indicator = ""
+    if critical:
+        critical_indicator = colored_text(" ⚠️ CRITICAL!", Fore.RED, Style.BRIGHT)
+    
+    return f"[{bar}]{critical_indicator}"
 
 # ====== Character Class ======
 class Character:
+    # Fixed layout: no per-instance __dict__, so every attribute is declared here
+    __slots__ = (
+        "name", "hp", "max_hp", "attack", "defense", "equipment", "items",
+        "status_effects", "elemental_affinity", "combo_counter", "last_move",
+        "block_chance", "rng", "events", "p1", "p2", "gold", "tournament_wins", "policy",
+        "last_action",
+    )
+
+    actions = None         # ActionTable of this class's moves, declared by each subclass
+    default_policy = None  # bot Policy used when a fighter has none of its own
+    # Plain attributes a battle changes, captured by battle_state snapshots
+    # (statuses, items, equipment wear and cooldowns are captured there too)
+    state_fields = ("hp", "max_hp", "attack", "defense", "equipment", "elemental_affinity",
+                    "combo_counter", "last_move", "block_chance")
+
     def __init__(self, name, hp, attack, defense):
         self.name = name
         self.hp = hp
@@ -11,16 +43,28 @@ class Character:
         self.attack = attack
         self.defense = defense
         self.equipment = None
-        self.items = [Potion(), Bomb()]  # Start with some items
-        self.status_effects = []
+        self.items = list(STARTER_ITEMS)  # Start with some items
+        self.status_effects = StatusEffects()
         self.elemental_affinity = None  # 'fire', 'ice', 'lightning', etc
         self.combo_counter = 0
         self.last_move = None
         self.block_chance = 0  # Base block chance
+        self.rng = random_stream.default_stream()  # Replaced by the battle's stream
+        self.events = None  # Battle event listener (e.g. an EventLogWriter), set by the battle
+        self.policy = None  # bot Policy choosing this fighter's moves; None means a human plays
+        self.last_action = None  # (turn, action id) of the latest move, set by the battle
+
+        # Battle references (set during battle)
+        self.p1 = None
+        self.p2 = None
+
+        # Tournament progress (gold is None until a Tournament hands out starting gold)
+        self.gold = None
+        self.tournament_wins = 0
     
     def equip(self, equipment):
         self.equipment = equipment
-        print(colored_text(f"⚔️ {self.name} equips {equipment.name}!", Fore.CYAN, Style.BRIGHT))
+        display(colored_text(f"⚔️ {self.name} equips {equipment.name}!", Fore.CYAN, Style.BRIGHT))
     
     def is_alive(self):
         return self.hp > 0
@@ -29,29 +73,30 @@ class Character:
         return self.hp <= (self.max_hp * 0.2)
     
     def show_stats(self):
+        if not rendering():
+            return
         print_separator("~", 35, Fore.BLUE)
         status_display = ""
         if self.status_effects:
             status_str = " ".join([colored_text(f"[{effect}]", Fore.CYAN) for effect in self.status_effects])
             status_display = f" {status_str}"
         
-        print(colored_text(f"{self.name}{status_display}", Fore.WHITE, Style.BRIGHT))
-        print(f"HP: {self.health_bar()} {self.hp}/{self.max_hp}")
+        display(colored_text(f"{self.name}{status_display}", Fore.WHITE, Style.BRIGHT))
+        display(f"HP: {self.health_bar()} {self.hp}/{self.max_hp}")
         
         # Color code stats
         atk_color = Fore.RED if self.attack >= 20 else Fore.YELLOW
         def_color = Fore.BLUE if self.defense >= 10 else Fore.WHITE
-        print(f"ATK: {colored_text(str(self.attack), atk_color)} | DEF: {colored_text(str(self.defense), def_color)}")
+        display(f"ATK: {colored_text(str(self.attack), atk_color)} | DEF: {colored_text(str(self.defense), def_color)}")
         
         if self.equipment:
-            print(f"Equipped: {colored_text(self.equipment.name, Fore.MAGENTA)} {self.equipment.durability_display()}")
+            display(f"Equipped: {colored_text(self.equipment.name, Fore.MAGENTA)} {self.equipment.durability_display()}")
         else:
-            print(colored_text("No equipment equipped", Fore.LIGHTBLACK_EX))
+            display(colored_text("No equipment equipped", Fore.LIGHTBLACK_EX))
 
     def health_bar(self, bar_length=20):
         hp_ratio = self.hp / self.max_hp
         filled_length = int(bar_length * hp_ratio)
-        empty_length = bar_length - filled_length
         
         # Color based on health
         if hp_ratio > 0.6:
@@ -64,20 +109,48 @@ class Character:
             bar_color = Fore.RED
             bar_char = '▒'
         
-        bar = colored_text(bar_char * filled_length, bar_color) + colored_text('░' * empty_length, Fore.LIGHTBLACK_EX)
-        
-        critical_indicator = ""
-        if self.is_critical():
-            critical_indicator = colored_text(" ⚠️ CRITICAL!", Fore.RED, Style.BRIGHT)
-        
-        return f"[{bar}]{critical_indicator}"
+        return render_health_bar(filled_length, bar_length, bar_char, bar_color,
+                                 self.is_critical(), get_renderer().color)
+
+    def roll(self, is_bot=False):
+        """Roll this fighter's d20 from the battle's stream"""
+        dice = roll_dice(is_bot, self.rng)
+        if self.events is not None:
+            self.events.dice(self, dice)
+        return dice
+
+    def reduce_cooldowns(self):
+        """Called at end of turn; classes with cooldowns override this"""
+        pass
+
+    def use_item(self, enemy, is_bot=False):
+        if not self.items:
+            display(colored_text("No items available!", Fore.RED))
+            return
+
+        display(colored_text("Available items:", Fore.CYAN))
+        for i, item in enumerate(self.items):
+            display(f"{i+1}) {item.name}")
+
+        try:
+            choice = int(prompt("Choose item: ")) - 1
+            if 0 <= choice < len(self.items):
+                item = self.items.pop(choice)
+                if isinstance(item, Potion):
+                    item.use(self)
+                elif isinstance(item, Bomb):
+                    item.use(self, enemy)
+            else:
+                display(colored_text("Invalid choice!", Fore.RED))
+        except (ValueError, IndexError):
+            display(colored_text("Invalid choice!", Fore.RED))
 
     def add_status_effect(self, effect, duration=1):
-        self.status_effects.append(effect)
-        if duration > 1:
-            # Could implement duration tracking here
-            pass
+        self.status_effects.add(effect, duration)
+        if self.events is not None:
+            self.events.status(self, effect, True)
 
     def clear_status_effect(self, effect):
-        if effect in self.status_effects:
-            self.status_effects.remove(effect)
\ No newline at end of file
+        if self.status_effects.remove(effect):
+            if self.events is not None:
+                self.events.status(self, effect, False)
\ No newline at end of file
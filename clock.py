@@ -0,0 +1,60 @@
+# clock.py - Pacing for animation delays
+#
+# Every delay in the game (dice rolls, turn pauses, special-move flourishes,
+# tournament interludes) is a game_utils.pause call, and pause hands it to
+# the active clock. A clock keeps the nominal pacing but decides what it
+# costs in wall time:
+#
+#   * Clock(speed) really waits, scaled: 1 is normal pace, 0.25 four times
+#     faster, 0 no waiting at all.
+#   * VirtualClock(speed) never waits; it only advances its own time, so
+#     demos, CI and long bot sessions run instantly while now() still reports
+#     when each step would have happened.
+
+import time
+
+class Clock:
+    """Wall-clock pacing with a speed multiplier"""
+    __slots__ = ("speed", "paced", "pauses")
+
+    def __init__(self, speed=1.0):
+        self.speed = check_speed(speed)
+        self.paced = 0.0  # nominal seconds of delay requested so far
+        self.pauses = 0
+
+    def now(self):
+        return time.monotonic()
+
+    def sleep(self, seconds, sleeper=None):
+        """Delay for `seconds` of game time. sleeper(real_seconds) does the
+        waiting (time.sleep by default; the async console passes its own)."""
+        self.paced += seconds
+        self.pauses += 1
+        real = seconds * self.speed
+        if real > 0:
+            (sleeper or time.sleep)(real)
+
+class VirtualClock(Clock):
+    """Simulated time: sleeps advance now() instantly and never block"""
+    __slots__ = ("time",)
+
+    def __init__(self, speed=1.0, start=0.0):
+        super().__init__(speed)
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds, sleeper=None):
+        self.paced += seconds
+        self.pauses += 1
+        self.advance(seconds * self.speed)
+
+    def advance(self, seconds):
+        self.time += seconds
+
+def check_speed(speed):
+    speed = float(speed)
+    if speed < 0:
+        raise ValueError(f"Clock speed must be >= 0, got {speed}")
+    return speed
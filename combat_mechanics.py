@@ -1,7 +1,6 @@
 # combat_mechanics.py
 from colorama import Fore, Style
-from game_utils import colored_text
-import numpy as np
+from game_utils import colored_text, display
 
 ELEMENTAL_EFFECTS = {
     'fire': {
@@ -45,9 +44,9 @@ def calculate_elemental_effects(attacker, defender, base_damage, element=None):
     modified_damage = base_damage * effect_info['damage_mod']
     
     # Chance to apply status effect
-    if np.random.random() < 0.4:  # 40% chance
+    if attacker.rng.random() < 0.4:  # 40% chance
         defender.add_status_effect(effect_info['effect'])
-        print(colored_text(
+        display(colored_text(
             f"✨ {defender.name} is {effect_info['effect']}! {effect_info['effect_desc']}!",
             effect_info['color'], Style.BRIGHT
         ))
@@ -64,7 +63,7 @@ def check_combo(character, current_move):
     
     if character.combo_counter >= 3:
         combo_bonus = 1.2 + (0.1 * character.combo_counter)
-        print(colored_text(
+        display(colored_text(
             f"🔥 COMBO x{character.combo_counter}! Damage multiplier: {combo_bonus:.1f}x",
             Fore.MAGENTA, Style.BRIGHT
         ))
@@ -72,10 +71,12 @@ def check_combo(character, current_move):
     return 1.0
 
 def attempt_block(defender, damage):
-    block_roll = np.random.random()
-    if block_roll < defender.block_chance:
+    blocked = defender.rng.random() < defender.block_chance
+    if defender.events is not None:
+        defender.events.block(defender, blocked)
+    if blocked:
         blocked_damage = damage * 0.5  # Blocks 50% of damage
-        print(colored_text(
+        display(colored_text(
             f"🛡️ {defender.name} blocks the attack! Reduces damage by 50%!",
             Fore.BLUE, Style.BRIGHT
         ))
@@ -85,8 +86,11 @@ def attempt_block(defender, damage):
 def attempt_dodge(defender, base_dodge_chance=0.0):
     """Check if defender dodges the attack completely"""
     dodge_chance = base_dodge_chance + getattr(defender, 'dodge_chance', 0)
-    if np.random.random() < dodge_chance:
-        print(colored_text(
+    dodged = defender.rng.random() < dodge_chance
+    if defender.events is not None:
+        defender.events.dodge(defender, dodged)
+    if dodged:
+        display(colored_text(
             f"💨 {defender.name} dodges the attack completely!",
             Fore.CYAN, Style.BRIGHT
         ))
@@ -0,0 +1,354 @@
+# combat_stats.py - Streaming combat statistics
+#
+# CombatStats is a battle event listener (install it like an EventLogWriter,
+# Battle(p1, p2, events=stats)) that folds every event into running
+# accumulators instead of keeping the events: per move, dice crits and
+# misses, block and dodge attempts, statuses applied (elemental procs
+# included) and the damage dealt; per matchup, results and turns-to-kill.
+# Means and variances use Welford's update and damage/turn distributions
+# go into fixed-bin histograms, so memory only grows with the number of
+# distinct moves and matchups, never with the number of battles.
+#
+# Collectors from parallel workers combine with merge: counts and histograms
+# add up, and Welford accumulators use Chan's pairwise formula, which gives
+# the same mean and variance as a single pass over all samples (up to
+# floating-point rounding).
+
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+# ====== Accumulators ======
+class Welford:
+    """Running count, mean, variance, min and max"""
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance (0 with fewer than two samples)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def as_dict(self):
+        if not self.n:
+            return {"n": 0}
+        return {"n": self.n, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+
+class Histogram:
+    """Counts in fixed-width bins, plus one underflow and one overflow bin"""
+    __slots__ = ("low", "width", "counts")
+
+    def __init__(self, low, width, bins):
+        self.low = low
+        self.width = width
+        self.counts = [0] * (bins + 2)
+
+    def add(self, x):
+        index = int((x - self.low) // self.width) + 1
+        if index < 0:
+            index = 0
+        elif index >= len(self.counts):
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+
+    def merge(self, other):
+        if (other.low, other.width, len(other.counts)) != (self.low, self.width, len(self.counts)):
+            raise ValueError("histograms with different bins can't be merged")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def percentile(self, q):
+        """Upper edge of the bin holding the q-th percentile (q in 0..100)"""
+        total = sum(self.counts)
+        if not total:
+            return None
+        index = int(np.searchsorted(np.cumsum(self.counts), total * q / 100))
+        return self.low + index * self.width
+
+    def as_dict(self):
+        return {"low": self.low, "width": self.width, "counts": list(self.counts)}
+
+# ====== Per-Move and Per-Matchup Tallies ======
+class MoveStats:
+    """Everything observed while one class move was being performed"""
+    __slots__ = ("uses", "landed", "rolls", "crits", "misses", "blocks", "block_attempts",
+                 "dodges", "dodge_attempts", "statuses", "damage", "damage_bins")
+
+    def __init__(self):
+        self.uses = 0
+        self.landed = 0          # uses that took HP off the target
+        self.rolls = 0           # d20 rolls (multi-hit moves roll several)
+        self.crits = 0           # natural 20s
+        self.misses = 0          # natural 1s
+        self.blocks = 0
+        self.block_attempts = 0
+        self.dodges = 0
+        self.dodge_attempts = 0
+        self.statuses = {}       # effect -> times applied (to either fighter)
+        self.damage = Welford()  # HP the target lost per use
+        self.damage_bins = Histogram(0, 5, 40)
+
+    def merge(self, other):
+        for name in ("uses", "landed", "rolls", "crits", "misses", "blocks",
+                     "block_attempts", "dodges", "dodge_attempts"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for effect, count in other.statuses.items():
+            self.statuses[effect] = self.statuses.get(effect, 0) + count
+        self.damage.merge(other.damage)
+        self.damage_bins.merge(other.damage_bins)
+
+    def as_dict(self):
+        return {
+            "uses": self.uses,
+            "hit_rate": _rate(self.landed, self.uses),
+            "crit_rate": _rate(self.crits, self.rolls),
+            "miss_rate": _rate(self.misses, self.rolls),
+            "block_rate": _rate(self.blocks, self.block_attempts),
+            "dodge_rate": _rate(self.dodges, self.dodge_attempts),
+            "status_rates": {effect: count / self.uses for effect, count in sorted(self.statuses.items())},
+            "damage": self.damage.as_dict(),
+            "damage_histogram": self.damage_bins.as_dict(),
+        }
+
+class MatchupStats:
+    """Results of one class pairing (first listed = player 1)"""
+    __slots__ = ("battles", "wins", "draws", "turns", "turns_bins")
+
+    def __init__(self):
+        self.battles = 0
+        self.wins = [0, 0]
+        self.draws = 0
+        self.turns = Welford()  # turns-to-kill of decided battles
+        self.turns_bins = Histogram(0, 5, 60)
+
+    def merge(self, other):
+        self.battles += other.battles
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.draws += other.draws
+        self.turns.merge(other.turns)
+        self.turns_bins.merge(other.turns_bins)
+
+    def as_dict(self):
+        return {
+            "battles": self.battles,
+            "win_rates": [_rate(w, self.battles) for w in self.wins],
+            "draw_rate": _rate(self.draws, self.battles),
+            "turns_to_kill": self.turns.as_dict(),
+            "turns_histogram": self.turns_bins.as_dict(),
+        }
+
+def _rate(count, total):
+    return count / total if total else None
+
+# ====== Collector ======
+class CombatStats:
+    """Battle event listener that keeps streaming statistics"""
+    def __init__(self):
+        self.moves = {}     # (class name, move name) -> MoveStats
+        self.matchups = {}  # (class name, class name) -> MatchupStats
+        self.fighters = ()
+        self.current = None  # MoveStats of the move being performed
+        self.actor = self.target = None
+        self.target_hp = 0
+
+    def move_stats(self, kind, move):
+        stats = self.moves.get((kind, move))
+        if stats is None:
+            stats = self.moves[(kind, move)] = MoveStats()
+        return stats
+
+    def matchup_stats(self, first, second):
+        stats = self.matchups.get((first, second))
+        if stats is None:
+            stats = self.matchups[(first, second)] = MatchupStats()
+        return stats
+
+    def finish_move(self):
+        """Close the move in progress, scoring the damage it dealt"""
+        stats = self.current
+        if stats is None:
+            return
+        dealt = self.target_hp - self.target.hp
+        stats.damage.add(dealt)
+        stats.damage_bins.add(dealt)
+        if dealt > 0:
+            stats.landed += 1
+        self.current = None
+        self.actor = self.target = None
+
+    def merge(self, other):
+        """Fold in another collector's totals (e.g. from a worker process)"""
+        for key, stats in other.moves.items():
+            self.move_stats(*key).merge(stats)
+        for key, stats in other.matchups.items():
+            self.matchup_stats(*key).merge(stats)
+        return self
+
+    def as_dict(self):
+        return {
+            "moves": {f"{kind}.{move}": stats.as_dict() for (kind, move), stats in sorted(self.moves.items())},
+            "matchups": {f"{a} vs {b}": stats.as_dict() for (a, b), stats in sorted(self.matchups.items())},
+        }
+
+    # ====== Battle Hooks ======
+    def begin_battle(self, battle):
+        self.finish_move()
+        self.fighters = (battle.p1, battle.p2)
+
+    def turn_start(self, turn):
+        pass
+
+    def action(self, fighter, action_id):
+        self.finish_move()
+        self.current = self.move_stats(type(fighter).__name__, fighter.actions[action_id].name)
+        self.current.uses += 1
+        self.actor = fighter
+        self.target = self.fighters[1] if fighter is self.fighters[0] else self.fighters[0]
+        self.target_hp = self.target.hp
+
+    def dice(self, fighter, roll):
+        stats = self.current
+        if stats is not None and fighter is self.actor:
+            stats.rolls += 1
+            if roll == 20:
+                stats.crits += 1
+            elif roll == 1:
+                stats.misses += 1
+
+    def block(self, defender, blocked):
+        if self.current is not None:
+            self.current.block_attempts += 1
+            self.current.blocks += blocked
+
+    def dodge(self, defender, dodged):
+        if self.current is not None:
+            self.current.dodge_attempts += 1
+            self.current.dodges += dodged
+
+    def damage(self, fighter, amount):
+        pass  # move damage is measured from the target's HP in finish_move
+
+    def status(self, fighter, effect, added):
+        if added and self.current is not None:
+            statuses = self.current.statuses
+            statuses[effect] = statuses.get(effect, 0) + 1
+
+    def turn_end(self, turn):
+        self.finish_move()
+
+    def equipment_wear(self, fighter, durability):
+        pass
+
+    def victory(self, winner, turns):
+        self.finish_move()
+        p1, p2 = self.fighters
+        stats = self.matchup_stats(type(p1).__name__, type(p2).__name__)
+        stats.battles += 1
+        if winner is None:
+            stats.draws += 1
+        else:
+            stats.wins[0 if winner is p1 else 1] += 1
+            stats.turns.add(turns)
+            stats.turns_bins.add(turns)
+        self.fighters = ()
+
+# ====== Parallel Collection ======
+def _run_chunk(fighter1, fighter2, n, seed_seq, max_turns):
+    from battle import Battle
+    from game_utils import headless
+    from tournament_runner import ROSTER
+
+    def bot(name):
+        cls, hp, attack, defense = ROSTER[name]
+        return cls(f"Bot {name}", hp, attack, defense)
+
+    stats = CombatStats()
+    rng = np.random.default_rng(seed_seq)
+    with headless():
+        for _ in range(n):
+            Battle(bot(fighter1), bot(fighter2), rng=rng, events=stats).fight(max_turns)
+    return stats
+
+def collect(fighter1, fighter2, n, seed=None, workers=None, chunk_size=1000, max_turns=1000):
+    """CombatStats of n headless bot battles between two ROSTER classes, run
+    across a process pool; one SeedSequence child per chunk, so (seed, n,
+    chunk_size) reproduce the totals whatever the worker count"""
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(sizes))
+    parts = [None] * len(sizes)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = {pool.submit(_run_chunk, fighter1, fighter2, size, seq, max_turns): index
+                   for index, (size, seq) in enumerate(zip(sizes, seed_seqs))}
+        for future in as_completed(futures):
+            parts[futures[future]] = future.result()
+    # Merge in chunk order so floating-point totals don't depend on scheduling
+    total = CombatStats()
+    for part in parts:
+        total.merge(part)
+    return total
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from tournament_runner import ROSTER
+
+    parser = argparse.ArgumentParser(description="Collect streaming combat statistics over bot battles")
+    parser.add_argument("fighter1", choices=list(ROSTER))
+    parser.add_argument("fighter2", choices=list(ROSTER))
+    parser.add_argument("-n", "--battles", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--json", metavar="FILE", help="write all statistics as JSON")
+    args = parser.parse_args()
+
+    stats = collect(args.fighter1, args.fighter2, args.battles, args.seed, args.workers, args.chunk_size)
+
+    for key, matchup in stats.matchups.items():
+        row = matchup.as_dict()
+        turns = row["turns_to_kill"]
+        print(f"{key[0]} vs {key[1]}: {matchup.battles} battles, win rates "
+              f"{row['win_rates'][0]:.3f} / {row['win_rates'][1]:.3f}, "
+              f"turns to kill {turns.get('mean', 0):.1f} ± {turns.get('std', 0):.1f}")
+    print(f"{'move':<30} {'uses':>8} {'hit':>6} {'crit':>6} {'block':>6} {'dodge':>6} {'dmg mean':>9} {'dmg std':>8}")
+    for (kind, move), move_stats in sorted(stats.moves.items()):
+        row = move_stats.as_dict()
+        cells = [f"{row[k]:>6.3f}" if row[k] is not None else f"{'-':>6}"
+                 for k in ("hit_rate", "crit_rate", "block_rate", "dodge_rate")]
+        print(f"{kind + '.' + move:<30} {row['uses']:>8} {' '.join(cells)} "
+              f"{move_stats.damage.mean:>9.2f} {move_stats.damage.std:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(stats.as_dict(), f, indent=2)
@@ -0,0 +1,214 @@
+# damage_model.py - Exact damage distributions per move
+#
+# The damage a move deals only depends on a few discrete random events: the
+# d20 roll, whether the defender blocks or dodges, whether the move whiffs,
+# and for the boss a uniform damage roll. Each hit is enumerated exactly and
+# multi-hit moves are convolved, so a move's full damage distribution is
+# computed without sampling. Results are cached per (class, move, attacker
+# stats, defender stats).
+#
+# The rules mirror knight.py, orc.py, mage.py, ninja.py, boss.py and
+# combat_mechanics.py, including the float-then-int rounding order.
+
+from functools import lru_cache
+import numpy as np
+from combat_mechanics import ELEMENTAL_EFFECTS
+from batch_battle import DICE_MULTIPLIERS, CLASS_IDS
+
+KIND_IDS = {cls.__name__: class_id for cls, class_id in CLASS_IDS.items()}  # moves are keyed by class name
+CLASS_ELEMENTS = {"Knight": None, "Orc": "fire", "Mage": "lightning", "Ninja": "shadow", "Boss": None}
+COMBO_MOVES = {"sword_slash", "mighty_strike", "cleave", "berserk_strike", "arcane_lance", "twin_fang_slash"}
+CLASS_DEFAULT = "class"  # element placeholder: use the class's natural affinity
+
+class DamageDistribution:
+    """Exact PMF of the damage a move deals: probs[k] = P(damage == k)"""
+    __slots__ = ("probs",)
+
+    def __init__(self, probs):
+        probs = np.asarray(probs, dtype=np.float64)
+        probs.flags.writeable = False  # instances are shared through the cache
+        self.probs = probs
+
+    def __add__(self, other):
+        """Distribution of the sum of two independent damages"""
+        return DamageDistribution(np.convolve(self.probs, other.probs))
+
+    def __repr__(self):
+        return f"DamageDistribution(mean={self.mean():.2f}, max={self.max()})"
+
+    def mean(self):
+        return float(np.dot(np.arange(self.probs.size), self.probs))
+
+    def std(self):
+        values = np.arange(self.probs.size)
+        return float(np.sqrt(np.dot((values - self.mean()) ** 2, self.probs)))
+
+    def max(self):
+        return int(np.flatnonzero(self.probs)[-1])
+
+    def prob_at_least(self, amount):
+        return float(self.probs[max(0, amount):].sum())
+
+    def percentile(self, q):
+        """Smallest damage d with P(damage <= d) >= q"""
+        return int(np.searchsorted(np.cumsum(self.probs), q - 1e-12))
+
+    def as_dict(self):
+        return {int(k): float(self.probs[k]) for k in np.flatnonzero(self.probs)}
+
+# ====== PMF Building Blocks ======
+def _pmf(outcomes):
+    """outcomes: iterable of (damage, probability)"""
+    outcomes = list(outcomes)
+    probs = np.zeros(max(d for d, _ in outcomes) + 1)
+    for damage, p in outcomes:
+        probs[damage] += p
+    return probs
+
+NO_DAMAGE = np.ones(1)
+
+def _gate(probs, fail_chance):
+    """With fail_chance the hit never lands (dodge, whiff)"""
+    fail_chance = min(max(fail_chance, 0.0), 1.0)
+    gated = probs * (1.0 - fail_chance)
+    gated[0] += fail_chance
+    return gated
+
+def _repeat(probs, times):
+    total = NO_DAMAGE
+    for _ in range(times):
+        total = np.convolve(total, probs)
+    return total
+
+def _mix(weighted):
+    """Mixture of (probability, pmf) pairs"""
+    probs = np.zeros(max(p.size for _, p in weighted))
+    for weight, p in weighted:
+        probs[:p.size] += weight * p
+    return probs
+
+def _dice_hit(kind, damage, block_chance, defense):
+    """One d20-scaled hit: roll, optional block (50%), then defense subtraction"""
+    row = DICE_MULTIPLIERS[KIND_IDS[kind]]
+    block_chance = min(max(block_chance, 0.0), 1.0)
+    outcomes = []
+    for roll in range(1, 21):
+        rolled = damage * row[roll]
+        if block_chance:
+            outcomes.append((max(0, int(rolled * 0.5) - defense), block_chance / 20))
+        outcomes.append((max(0, int(rolled) - defense), (1 - block_chance) / 20))
+    return _pmf(outcomes)
+
+def _uniform_hit(low, high, defense):
+    """Boss hit: randint(low, high) damage (high exclusive), at least 1 after defense"""
+    return _pmf((max(1, value - defense), 1 / (high - low)) for value in range(low, high))
+
+def _combo_multiplier(combo):
+    return 1.2 + (0.1 * combo) if combo >= 3 else 1.0
+
+def _elemental(damage, element):
+    effect = ELEMENTAL_EFFECTS.get(element) if element else None
+    return damage * effect['damage_mod'] if effect else damage
+
+# ====== Moves ======
+def _move_pmf(kind, move, attack, defense, attack_boost, block_chance, dodge_chance,
+              combo, element, buffed, stealth, shurikens):
+    combo = _combo_multiplier(combo)
+
+    if kind == "Knight":
+        if move == "sword_slash":
+            damage = _elemental((attack + attack_boost) * combo, element)
+            return _dice_hit(kind, damage, block_chance, defense)
+        if move == "shield_bash":
+            damage = _elemental((attack * 0.75) + attack_boost, element)
+            return _dice_hit(kind, damage, 0.0, defense)
+        if move == "mighty_strike":
+            damage = _elemental((attack * 1.5 * combo) + attack_boost, element)
+            return _gate(_dice_hit(kind, damage, block_chance * 0.5, defense), 0.3)
+        if move == "rapid_strikes":
+            damage = _elemental((attack * 0.6) + attack_boost, element)
+            return _repeat(_dice_hit(kind, damage, block_chance, defense), 3)
+
+    elif kind == "Orc":
+        buff = 1.2 if buffed else 1.0
+        if move == "cleave":
+            damage = (attack + attack_boost) * combo
+            damage = _elemental(damage * buff, element)
+            return _dice_hit(kind, damage, 0.0, defense)
+        if move == "berserk_strike":
+            damage = (attack * 1.8 * combo) + attack_boost
+            damage = _elemental(damage * buff, element)
+            return _dice_hit(kind, damage, block_chance * 0.5, defense)
+        if move == "roar":
+            return NO_DAMAGE
+
+    elif kind == "Mage":
+        if move == "arcane_lance":
+            damage = _elemental((attack + attack_boost) * combo, "lightning")
+            return _dice_hit(kind, damage, 0.0, defense)
+        if move == "meteor_fall":
+            return _dice_hit(kind, _elemental(attack * 2.2, "fire"), 0.0, defense)
+        if move == "celestial_healing":
+            return NO_DAMAGE
+
+    elif kind == "Ninja":
+        if move == "twin_fang_slash":
+            damage = (attack * 0.8 * combo) + attack_boost
+            damage = _elemental(damage * 1.3 if stealth else damage, element)
+            return _gate(_repeat(_dice_hit(kind, damage, block_chance, defense), 2), dodge_chance)
+        if move == "shuriken_storm":
+            if shurikens <= 0:
+                return NO_DAMAGE
+            damage = _elemental((attack * 0.6) + attack_boost, element)
+            star = _gate(_dice_hit(kind, damage, block_chance * 0.3, defense // 2), dodge_chance + 0.1)
+            # randint(2, 4) shurikens, capped by what is left
+            return _mix([(0.5, _repeat(star, min(2, shurikens))), (0.5, _repeat(star, min(3, shurikens)))])
+        if move in ("shadowstep", "smoke_bomb_escape"):
+            return NO_DAMAGE
+
+    elif kind == "Boss":
+        if move == "claw_strike":
+            return _uniform_hit(attack - 3, attack + 3, defense)
+        if move == "fire_breath":
+            return _uniform_hit(attack + 5, attack + 10, defense // 2)
+        if move == "wing_slam":
+            return _uniform_hit(attack + 3, attack + 8, defense)
+        if move == "berserker_fury":
+            return _repeat(_uniform_hit(attack - 2, attack + 2, defense), 3)
+        if move == "roar_of_terror":
+            return NO_DAMAGE
+
+    raise ValueError(f"unknown move {kind}.{move}")
+
+@lru_cache(maxsize=4096)
+def move_damage(kind, move, attack, defense, attack_boost=0, block_chance=0.0, dodge_chance=0.0,
+                combo=1, element=CLASS_DEFAULT, buffed=False, stealth=False, shurikens=6):
+    """Exact DamageDistribution of one use of kind.move.
+
+    combo is the combo counter the move will reach (3+ multiplies damage);
+    buffed (Orc roar), stealth (Shadowstep) and shurikens (left before the
+    storm) only matter for the moves they apply to. A move that isn't ready
+    (no shurikens left) deals no damage.
+    """
+    if element == CLASS_DEFAULT:
+        element = CLASS_ELEMENTS.get(kind)
+    return DamageDistribution(_move_pmf(kind, move, attack, defense, attack_boost, block_chance,
+                                        dodge_chance, combo, element, buffed, stealth, shurikens))
+
+def fighter_move_damage(attacker, move, defender):
+    """move_damage for live fighters, reading stats and combo/buff state off them"""
+    kind = type(attacker).__name__
+    combo = 1
+    if move in COMBO_MOVES and attacker.last_move == move:
+        combo = attacker.combo_counter + 1
+    return move_damage(
+        kind, move, attacker.attack, defender.defense,
+        attack_boost=attacker.equipment.attack_boost if attacker.equipment else 0,
+        block_chance=defender.block_chance,
+        dodge_chance=getattr(defender, "dodge_chance", 0),
+        combo=combo,
+        element=attacker.elemental_affinity,
+        buffed=getattr(attacker, "attack_buff_turns", 0) > 0,
+        stealth=getattr(attacker, "stealth_active", False),
+        shurikens=getattr(attacker, "shuriken_count", 0),
+    )
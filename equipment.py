@@ -1,8 +1,21 @@
+from functools import lru_cache
 from colorama import Fore, Style
-from game_utils import colored_text
+from game_utils import colored_text, display, get_renderer
+
+@lru_cache(maxsize=256)
+def render_durability(durability, max_durability, use_color):
+    ratio = durability / max_durability
+    if ratio > 0.6:
+        return colored_text(f"[{durability}/{max_durability}]", Fore.GREEN)
+    elif ratio > 0.3:
+        return colored_text(f"[{durability}/{max_durability}]", Fore.YELLOW)
+    else:
+        return colored_text(f"[{durability}/{max_durability}]", Fore.RED)
 
 # ====== Equipment Class ======
 class Equipment:
+    __slots__ = ("name", "attack_boost", "defense_boost", "max_durability", "durability")
+
     def __init__(self, name, attack_boost=0, defense_boost=0, durability=5):
         self.name = name
         self.attack_boost = attack_boost
@@ -13,22 +26,18 @@ class Equipment:
     def wear_down(self):
         self.durability -= 1
         if self.durability <= 0:
-            print(colored_text(f"💔 {self.name} BROKE!", Fore.RED, Style.BRIGHT))
+            display(colored_text(f"💔 {self.name} BROKE!", Fore.RED, Style.BRIGHT))
             self.attack_boost = 0
             self.defense_boost = 0
         elif self.durability == 1:
-            print(colored_text(f"⚠️  {self.name} is about to break!", Fore.YELLOW))
+            display(colored_text(f"⚠️  {self.name} is about to break!", Fore.YELLOW))
 
     def durability_display(self):
-        ratio = self.durability / self.max_durability
-        if ratio > 0.6:
-            return colored_text(f"[{self.durability}/{self.max_durability}]", Fore.GREEN)
-        elif ratio > 0.3:
-            return colored_text(f"[{self.durability}/{self.max_durability}]", Fore.YELLOW)
-        else:
-            return colored_text(f"[{self.durability}/{self.max_durability}]", Fore.RED) 
+        return render_durability(self.durability, self.max_durability, get_renderer().color)
 
 class ElementalEquipment(Equipment):
+    __slots__ = ("element",)
+
     def __init__(self, name, element, attack_boost=0, defense_boost=0, durability=5):
         super().__init__(name, attack_boost, defense_boost, durability)
         self.element = element
@@ -36,7 +45,7 @@ class ElementalEquipment(Equipment):
     def on_equip(self, character):
         super().on_equip(character)
         character.elemental_affinity = self.element
-        print(colored_text(
+        display(colored_text(
             f"✨ {character.name} gains {self.element} affinity!",
             Fore.MAGENTA, Style.BRIGHT
         ))
\ No newline at end of file
@@ -0,0 +1,141 @@
+# event_log.py - Compact binary battle event stream
+#
+# Every event is one fixed 8-byte little-endian record:
+#     kind (u8) | actor slot (u8) | turn (u16) | value (i32)
+# Records are packed into an in-memory buffer and written out in large
+# chunks, and read back lazily with a generator, so millions of battles can
+# be archived and scanned without holding them in memory.
+
+import struct
+from collections import namedtuple
+import status_effects
+
+MAGIC = b"BTLLOG1\0"
+RECORD = struct.Struct("<BBHi")
+
+# Event kinds
+(BATTLE_START, FIGHTER, TURN_START, ACTION, DICE, BLOCK, DODGE,
+ DAMAGE, STATUS_ADDED, STATUS_CLEARED, EQUIPMENT_WEAR, VICTORY) = range(12)
+
+EVENT_NAMES = (
+    "BATTLE_START", "FIGHTER", "TURN_START", "ACTION", "DICE", "BLOCK", "DODGE",
+    "DAMAGE", "STATUS_ADDED", "STATUS_CLEARED", "EQUIPMENT_WEAR", "VICTORY",
+)
+
+NO_ACTOR = 255  # events that belong to the battle rather than a fighter
+
+# Value encodings
+CLASS_CODES = {"Knight": 1, "Orc": 2, "Mage": 3, "Ninja": 4, "Boss": 5}
+STATUS_CODES = {name: index + 1 for name, index in status_effects.STATUS_INDEX.items()}  # 0 = unknown
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+Event = namedtuple("Event", "kind actor turn value")
+
+
+class EventLogWriter:
+    """Buffered writer; install on a battle with Battle(p1, p2, events=writer)"""
+    def __init__(self, file, buffer_size=1 << 16):
+        self._owns_file = isinstance(file, str)
+        self.file = open(file, "wb") if self._owns_file else file
+        self.buffer_size = buffer_size
+        self.buffer = bytearray(MAGIC)
+        self.battles = 0
+        self.turn = 0
+        self.slots = {}
+
+    def emit(self, kind, actor, value):
+        self.buffer += RECORD.pack(kind, actor, self.turn & 0xFFFF, value)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def slot(self, fighter):
+        return self.slots.get(id(fighter), NO_ACTOR)
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ====== Battle Hooks ======
+    def begin_battle(self, battle):
+        self.slots = {id(battle.p1): 0, id(battle.p2): 1}
+        self.turn = 0
+        self.emit(BATTLE_START, NO_ACTOR, self.battles)
+        self.battles += 1
+        for fighter in (battle.p1, battle.p2):
+            self.emit(FIGHTER, self.slot(fighter), CLASS_CODES.get(type(fighter).__name__, 0))
+
+    def turn_start(self, turn):
+        self.turn = turn
+        self.emit(TURN_START, NO_ACTOR, turn)
+
+    def action(self, fighter, action_id):
+        self.emit(ACTION, self.slot(fighter), action_id)
+
+    def dice(self, fighter, roll):
+        self.emit(DICE, self.slot(fighter), roll)
+
+    def block(self, defender, blocked):
+        """Called for every block attempt; only successful blocks are logged"""
+        if blocked:
+            self.emit(BLOCK, self.slot(defender), 0)
+
+    def dodge(self, defender, dodged):
+        if dodged:
+            self.emit(DODGE, self.slot(defender), 0)
+
+    def damage(self, fighter, amount):
+        """HP lost by fighter (negative for healing)"""
+        self.emit(DAMAGE, self.slot(fighter), amount)
+
+    def status(self, fighter, effect, added):
+        self.emit(STATUS_ADDED if added else STATUS_CLEARED, self.slot(fighter), STATUS_CODES.get(effect, 0))
+
+    def turn_end(self, turn):
+        pass  # the next TURN_START (or VICTORY) already marks the boundary
+
+    def equipment_wear(self, fighter, durability):
+        self.emit(EQUIPMENT_WEAR, self.slot(fighter), durability)
+
+    def victory(self, winner, turns):
+        self.emit(VICTORY, NO_ACTOR if winner is None else self.slot(winner), turns)
+
+
+def read_events(file, chunk_records=8192):
+    """Yield every Event in a log written by EventLogWriter"""
+    owns_file = isinstance(file, str)
+    f = open(file, "rb") if owns_file else file
+    try:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not a battle event log")
+        while True:
+            chunk = f.read(RECORD.size * chunk_records)
+            if not chunk:
+                break
+            usable = len(chunk) - len(chunk) % RECORD.size  # ignore a torn trailing record
+            for record in RECORD.iter_unpack(chunk[:usable]):
+                yield Event(*record)
+    finally:
+        if owns_file:
+            f.close()
+
+def format_event(event):
+    name = EVENT_NAMES[event.kind]
+    value = event.value
+    if event.kind in (STATUS_ADDED, STATUS_CLEARED):
+        value = STATUS_NAMES.get(value, value)
+    actor = "-" if event.actor == NO_ACTOR else f"P{event.actor + 1}"
+    return f"turn {event.turn:>3} {actor:>2} {name:<14} {value}"
@@ -1,21 +1,142 @@
-import numpy as np
-import time
+import random_stream
+import atexit
+from contextlib import contextmanager
 from colorama import init, Fore, Back, Style
+from renderer import Renderer, NullRenderer
+from clock import Clock
 
-# Initialize colorama
-init(autoreset=True)
+# ====== Presentation Switch ======
+# All game text goes through the active renderer. When headless, the combat
+# rules run unchanged but output goes to a NullRenderer, nobody is prompted
+# and no animation delays are slept.
+_headless = False
+_console = None  # optional front end for prompts and delays (see async_game)
+_clock = Clock()  # paces every pause (see clock.py)
+# colorama's init (stdout wrapping) waits until something is actually shown
+_renderer = Renderer(setup=lambda: init(autoreset=True))
+atexit.register(lambda: _renderer.flush())
+
+def set_headless(enabled):
+    global _headless
+    _headless = bool(enabled)
+
+def is_headless():
+    return _headless
+
+def get_renderer():
+    return _renderer
+
+def set_renderer(renderer):
+    global _renderer
+    _renderer.flush()
+    _renderer = renderer
+
+@contextmanager
+def use_renderer(renderer):
+    previous = _renderer
+    set_renderer(renderer)
+    try:
+        yield renderer
+    finally:
+        set_renderer(previous)
+
+@contextmanager
+def headless():
+    """Temporarily disable all presentation (printing, prompts, sleeps)"""
+    previous = _headless
+    set_headless(True)
+    try:
+        with use_renderer(NullRenderer()):
+            yield
+    finally:
+        set_headless(previous)
+
+def get_console():
+    return _console
+
+def set_console(console):
+    """Route prompt, pause and background through console (None: block in place)"""
+    global _console
+    _console = console
+
+@contextmanager
+def use_console(console):
+    previous = _console
+    set_console(console)
+    try:
+        yield console
+    finally:
+        set_console(previous)
+
+def get_clock():
+    return _clock
+
+def set_clock(clock):
+    """Pace every pause with clock (Clock(speed) or VirtualClock())"""
+    global _clock
+    _clock = clock
+
+@contextmanager
+def use_clock(clock):
+    previous = _clock
+    set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+def rendering():
+    """False when output is discarded, so callers can skip building it"""
+    return _renderer.enabled
+
+def display(*args, sep=" ", end="\n"):
+    if _renderer.enabled:
+        _renderer.write(sep.join(map(str, args)) + end)
+
+def flush_output():
+    _renderer.flush()
+
+def prompt(text=""):
+    _renderer.flush()
+    if _console is not None:
+        return _console.prompt(text)
+    return input(text)
+
+def pause(seconds):
+    if not _headless:
+        _renderer.flush()
+        _clock.sleep(seconds, _console.pause if _console is not None else None)
+
+def background(fn, *args):
+    """Start fn(*args) alongside whatever the game waits on next and return a
+    Future. Without a console (or when headless) it simply runs right away."""
+    if _console is not None and not _headless:
+        return _console.background(fn, *args)
+    from concurrent.futures import Future  # slow to import; startup doesn't need it
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except BaseException as exc:
+        future.set_exception(exc)
+    return future
 
 # ====== Color Helpers ======
 def colored_text(text, color=Fore.WHITE, style=Style.NORMAL):
+    if not _renderer.color:
+        return text
     return f"{style}{color}{text}{Style.RESET_ALL}"
 
 def print_banner(text, color=Fore.CYAN, char="=", width=50):
-    print(colored_text(char * width, color))
-    print(colored_text(f"{text:^{width}}", color, Style.BRIGHT))
-    print(colored_text(char * width, color))
+    if not _renderer.enabled:
+        return
+    display(colored_text(char * width, color))
+    display(colored_text(f"{text:^{width}}", color, Style.BRIGHT))
+    display(colored_text(char * width, color))
 
 def print_separator(char="-", width=40, color=Fore.YELLOW):
-    print(colored_text(char * width, color))
+    if not _renderer.enabled:
+        return
+    display(colored_text(char * width, color))
 
 # ====== ASCII Art ======
 def champion():
@@ -39,30 +160,34 @@ def battle_ascii():
     """, Fore.RED, Style.BRIGHT)
 
 # ====== Roll Dice ======
-def roll_dice(is_bot=False):
+def roll_dice(is_bot=False, rng=None):
+    rng = rng or random_stream.default_stream()
+    if _headless:
+        return rng.d20()
+
     if not is_bot:
-        input(colored_text("Press Enter to roll the d20...", Fore.YELLOW, Style.BRIGHT))
+        prompt(colored_text("Press Enter to roll the d20...", Fore.YELLOW, Style.BRIGHT))
     
-    print(colored_text("🎲 Rolling...", Fore.CYAN))
+    display(colored_text("🎲 Rolling...", Fore.CYAN))
     
     # Dramatic rolling animation
     for i in range(3):
-        print(colored_text(f"   {'.' * (i + 1)}", Fore.WHITE))
-        time.sleep(0.3)
+        display(colored_text(f"   {'.' * (i + 1)}", Fore.WHITE))
+        pause(0.3)
     
-    result = np.random.randint(1, 21)
+    result = rng.d20()
     
     # Color based on roll quality
     if result == 20:
-        print(colored_text(f"🎯 NATURAL 20! You rolled: {result}! 🎯", Fore.MAGENTA, Style.BRIGHT))
+        display(colored_text(f"🎯 NATURAL 20! You rolled: {result}! 🎯", Fore.MAGENTA, Style.BRIGHT))
     elif result == 1:
-        print(colored_text(f"💥 CRITICAL FAIL! You rolled: {result}! 💥", Fore.RED, Style.BRIGHT))
+        display(colored_text(f"💥 CRITICAL FAIL! You rolled: {result}! 💥", Fore.RED, Style.BRIGHT))
     elif result >= 16:
-        print(colored_text(f"⚡ EXCELLENT! You rolled: {result}!", Fore.GREEN, Style.BRIGHT))
+        display(colored_text(f"⚡ EXCELLENT! You rolled: {result}!", Fore.GREEN, Style.BRIGHT))
     elif result >= 11:
-        print(colored_text(f"✓ Good roll: {result}", Fore.YELLOW))
+        display(colored_text(f"✓ Good roll: {result}", Fore.YELLOW))
     else:
-        print(colored_text(f"📉 Low roll: {result}", Fore.RED))
+        display(colored_text(f"📉 Low roll: {result}", Fore.RED))
     
-    time.sleep(0.8)
+    pause(0.8)
     return result
\ No newline at end of file
@@ -1,8 +1,10 @@
 from colorama import Fore, Style
-from game_utils import colored_text
+from game_utils import colored_text, display
 
 # ====== Item Classes ======
 class Potion:
+    __slots__ = ("name", "heal_amount")
+
     def __init__(self, heal_amount=30):
         self.name = "Health Potion"
         self.heal_amount = heal_amount
@@ -11,9 +13,11 @@ class Potion:
         old_hp = character.hp
         character.hp = min(character.max_hp, character.hp + self.heal_amount)
         healed = character.hp - old_hp
-        print(colored_text(f"🧪 {character.name} drinks a potion and heals {healed} HP!", Fore.GREEN, Style.BRIGHT))
+        display(colored_text(f"🧪 {character.name} drinks a potion and heals {healed} HP!", Fore.GREEN, Style.BRIGHT))
 
 class Bomb:
+    __slots__ = ("name", "damage")
+
     def __init__(self, damage=25):
         self.name = "Explosive Bomb"
         self.damage = damage
@@ -23,5 +27,8 @@ class Bomb:
         final_damage = max(0, self.damage - target.defense // 2)  # Armor partially protects
         target.hp -= final_damage
         user.hp -= 5  # Self damage from explosion
-        print(colored_text(f"💣 {user.name} throws a bomb! Deals {final_damage} damage to {target.name}!", Fore.RED, Style.BRIGHT))
-        print(colored_text(f"💥 {user.name} takes 5 blast damage!", Fore.YELLOW))
\ No newline at end of file
+        display(colored_text(f"💣 {user.name} throws a bomb! Deals {final_damage} damage to {target.name}!", Fore.RED, Style.BRIGHT))
+        display(colored_text(f"💥 {user.name} takes 5 blast damage!", Fore.YELLOW))
+
+# Items carry no per-owner state, so every fighter starts with the same instances
+STARTER_ITEMS = (Potion(), Bomb())
@@ -1,11 +1,13 @@
-import numpy as np
 from colorama import Fore, Style
 from character import Character
-from game_utils import colored_text, roll_dice
-import time
+from actions import Action, ActionTable
+from policies import WeightedPolicy
+from game_utils import colored_text, display, pause
 from combat_mechanics import calculate_elemental_effects, check_combo, attempt_block
 
 class Knight(Character):
+    __slots__ = ()
+
     def __init__(self, name, hp, attack, defense):
         super().__init__(name, hp, attack, defense)
         self.block_chance = 0.3  # Knights have higher block chance
@@ -20,7 +22,7 @@ class Knight(Character):
         damage, crit_miss_result = self.apply_dice(damage, is_bot)
         
         if crit_miss_result == "miss":
-            print(colored_text(f"⚡ {self.name}'s Sword Slash MISSES completely!", Fore.BLUE))
+            display(colored_text(f"⚡ {self.name}'s Sword Slash MISSES completely!", Fore.BLUE))
             return
             
         # Block chance
@@ -30,9 +32,9 @@ class Knight(Character):
         enemy.hp -= final_damage
         
         if crit_miss_result == "crit":
-            print(colored_text(f"💥 {self.name} lands a CRITICAL Sword Slash! Deals {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
+            display(colored_text(f"💥 {self.name} lands a CRITICAL Sword Slash! Deals {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
         else:
-            print(colored_text(f"⚔️ {self.name} uses Sword Slash! Deals {final_damage} damage to {enemy.name}.", Fore.RED))
+            display(colored_text(f"⚔️ {self.name} uses Sword Slash! Deals {final_damage} damage to {enemy.name}.", Fore.RED))
 
     def shield_bash(self, enemy, is_bot=False):
         damage = (self.attack * 0.75) + (self.equipment.attack_boost if self.equipment else 0)
@@ -40,28 +42,28 @@ class Knight(Character):
         damage, crit_miss_result = self.apply_dice(damage, is_bot)
         
         if crit_miss_result == "miss":
-            print(colored_text(f"🛡️ {self.name}'s Shield Bash misses!", Fore.BLUE))
+            display(colored_text(f"🛡️ {self.name}'s Shield Bash misses!", Fore.BLUE))
             return
             
         final_damage = max(0, int(damage) - enemy.defense)
         enemy.hp -= final_damage
-        print(colored_text(f"🛡️ {self.name} uses Shield Bash! Deals {final_damage} damage!", Fore.YELLOW))
+        display(colored_text(f"🛡️ {self.name} uses Shield Bash! Deals {final_damage} damage!", Fore.YELLOW))
         
         # Enhanced stun chance with elemental effects
         stun_chance = 0.4 if "FROZEN" in enemy.status_effects else 0.3
-        if np.random.random() < stun_chance:
+        if self.rng.random() < stun_chance:
             enemy.add_status_effect("STUNNED")
-            print(colored_text(f"💫 {enemy.name} is STUNNED!", Fore.CYAN, Style.BRIGHT))
+            display(colored_text(f"💫 {enemy.name} is STUNNED!", Fore.CYAN, Style.BRIGHT))
 
     def mighty_strike(self, enemy, is_bot=False):
-        if np.random.random() < 0.7:
+        if self.rng.random() < 0.7:
             combo_multiplier = check_combo(self, "mighty_strike")
             damage = (self.attack * 1.5 * combo_multiplier) + (self.equipment.attack_boost if self.equipment else 0)
             damage = calculate_elemental_effects(self, enemy, damage)
             damage, crit_miss_result = self.apply_dice(damage, is_bot)
             
             if crit_miss_result == "miss":
-                print(colored_text(f"💪 {self.name}'s Mighty Strike misses!", Fore.BLUE))
+                display(colored_text(f"💪 {self.name}'s Mighty Strike misses!", Fore.BLUE))
                 return
                 
             # Block chance is halved for mighty strikes
@@ -74,14 +76,14 @@ class Knight(Character):
             enemy.hp -= final_damage
             
             if crit_miss_result == "crit":
-                print(colored_text(f"🔥 DEVASTATING CRITICAL MIGHTY STRIKE! {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
+                display(colored_text(f"🔥 DEVASTATING CRITICAL MIGHTY STRIKE! {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
             else:
-                print(colored_text(f"💪 {self.name} uses Mighty Strike! Deals {final_damage} damage!", Fore.RED, Style.BRIGHT))
+                display(colored_text(f"💪 {self.name} uses Mighty Strike! Deals {final_damage} damage!", Fore.RED, Style.BRIGHT))
         else:
-            print(colored_text(f"💢 {self.name} WHIFFS the Mighty Strike!", Fore.BLUE))
+            display(colored_text(f"💢 {self.name} WHIFFS the Mighty Strike!", Fore.BLUE))
 
     def rapid_strikes(self, enemy, is_bot=False):
-        print(colored_text(f"⚔️ {self.name} prepares a flurry of strikes!", Fore.CYAN, Style.BRIGHT))
+        display(colored_text(f"⚔️ {self.name} prepares a flurry of strikes!", Fore.CYAN, Style.BRIGHT))
         
         total_damage = 0
         hits = 3  # Number of hits
@@ -95,27 +97,38 @@ class Knight(Character):
             enemy.hp -= final_damage
             total_damage += final_damage
             
-            print(colored_text(f"  Strike {i+1}: {final_damage} damage", Fore.YELLOW))
-            time.sleep(0.3)
+            display(colored_text(f"  Strike {i+1}: {final_damage} damage", Fore.YELLOW))
+            pause(0.3)
         
-        print(colored_text(f"⚔️ Total damage: {total_damage}!", Fore.RED, Style.BRIGHT))
+        display(colored_text(f"⚔️ Total damage: {total_damage}!", Fore.RED, Style.BRIGHT))
 
     def apply_dice(self, dmg, is_bot=False):
-        dice = roll_dice(is_bot)
+        dice = self.roll(is_bot)
         
         # Critical hit/miss system
         if dice == 1:
-            print(colored_text("💥 CRITICAL MISS!", Fore.RED, Style.BRIGHT))
+            display(colored_text("💥 CRITICAL MISS!", Fore.RED, Style.BRIGHT))
             return 0, "miss"
         elif dice == 20:
-            print(colored_text("🎯 CRITICAL HIT! 2x DAMAGE!", Fore.MAGENTA, Style.BRIGHT))
+            display(colored_text("🎯 CRITICAL HIT! 2x DAMAGE!", Fore.MAGENTA, Style.BRIGHT))
             return dmg * 2, "crit"
         elif dice <= 5:
-            print(colored_text(f"📉 Dice {dice}: Weak hit!", Fore.RED))
+            display(colored_text(f"📉 Dice {dice}: Weak hit!", Fore.RED))
             return dmg * 0.8, "normal"
         elif dice <= 15:
-            print(colored_text(f"⚡ Dice {dice}: Normal hit.", Fore.YELLOW))
+            display(colored_text(f"⚡ Dice {dice}: Normal hit.", Fore.YELLOW))
             return dmg, "normal"
         else:
-            print(colored_text(f"🔥 Dice {dice}: Strong hit!", Fore.GREEN))
-            return dmg * 1.2, "normal"
\ No newline at end of file
+            display(colored_text(f"🔥 Dice {dice}: Strong hit!", Fore.GREEN))
+            return dmg * 1.2, "normal"
+
+    # ====== Actions ======
+    actions = ActionTable([
+        Action("sword_slash", "Sword Slash", sword_slash, Fore.RED, bot_weight=0.3),
+        Action("shield_bash", "Shield Bash", shield_bash, Fore.YELLOW, bot_weight=0.2),
+        Action("mighty_strike", "Mighty Strike", mighty_strike, Fore.MAGENTA, bot_weight=0.2),
+        Action("rapid_strikes", "Rapid Strikes (3 hits)", rapid_strikes, Fore.CYAN, bot_weight=0.2),
+        Action("use_item", "Use Item", Character.use_item, Fore.GREEN, bot_weight=0.1,
+               available=lambda f: bool(f.items), humans_only=True),
+    ])
+    default_policy = WeightedPolicy.from_table(actions)
@@ -0,0 +1,40 @@
+# lazy_modules.py - Deferred imports for fast startup
+#
+# lazy_import("numpy") returns the module object right away but only runs
+# the module's code the first time one of its attributes is used (via
+# importlib's LazyLoader). Modules on the interactive path import numpy this
+# way, so launching the menu doesn't pay for it; simulations load it on
+# their first array operation and everything after that is a plain module.
+
+import sys
+import types
+import importlib.util
+
+_registered = {}  # name -> module object handed out by lazy_import
+
+def lazy_import(name):
+    """Module `name`, loaded on first attribute access"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _registered[name] = module
+    return module
+
+def is_loaded(name):
+    """True once a module has really been imported (not just lazily registered)"""
+    module = sys.modules.get(name)
+    if module is None:
+        return False
+    if _registered.get(name) is not module:
+        return True  # imported the normal way
+    # LazyLoader swaps in a module subclass until the first attribute access
+    # runs the real loader, then turns it back into a plain module
+    return type(module) is types.ModuleType
@@ -1,9 +1,13 @@
 from character import Character
-from game_utils import colored_text, roll_dice
+from actions import Action, ActionTable
+from policies import MagePolicy
+from game_utils import colored_text, display
 from combat_mechanics import calculate_elemental_effects, check_combo
 from colorama import Fore, Style
 
 class Mage(Character):
+    __slots__ = ("cooldowns",)
+
     def __init__(self, name, hp, attack, defense):
         super().__init__(name, hp, attack, defense)
         self.cooldowns = {"heal": 0, "meteor": 0}
@@ -16,34 +20,34 @@ class Mage(Character):
         damage, crit_miss_result = self.apply_dice(damage, is_bot)
 
         if crit_miss_result == "miss":
-            print(colored_text(f"⚡ {self.name}'s Arcane Lance MISSES!", Fore.BLUE))
+            display(colored_text(f"⚡ {self.name}'s Arcane Lance MISSES!", Fore.BLUE))
             return
 
         final_damage = max(0, int(damage) - enemy.defense)
         enemy.hp -= final_damage
 
         if crit_miss_result == "crit":
-            print(colored_text(f"⚡ CRITICAL LIGHTNING STRIKE! {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
+            display(colored_text(f"⚡ CRITICAL LIGHTNING STRIKE! {final_damage} damage!", Fore.MAGENTA, Style.BRIGHT))
         else:
-            print(colored_text(f"⚡ {self.name} casts Arcane Lance! Deals {final_damage} lightning damage.", Fore.CYAN))
+            display(colored_text(f"⚡ {self.name} casts Arcane Lance! Deals {final_damage} lightning damage.", Fore.CYAN))
 
     def celestial_healing(self):
         if self.cooldowns["heal"] > 0:
-            print(colored_text(f"⛔ Celestial Healing is on cooldown ({self.cooldowns['heal']} turns left)!", Fore.RED))
+            display(colored_text(f"⛔ Celestial Healing is on cooldown ({self.cooldowns['heal']} turns left)!", Fore.RED))
             return
 
         heal_amount = int(self.attack * 1.5)
         self.hp = min(self.max_hp, self.hp + heal_amount)
         self.cooldowns["heal"] = 3
 
-        print(colored_text(f"🌟 {self.name} heals for {heal_amount} HP using Celestial Healing!", Fore.GREEN, Style.BRIGHT))
+        display(colored_text(f"🌟 {self.name} heals for {heal_amount} HP using Celestial Healing!", Fore.GREEN, Style.BRIGHT))
 
     def meteor_fall(self, enemies, is_bot=False):
         if self.cooldowns["meteor"] > 0:
-            print(colored_text(f"⛔ Meteor Fall is on cooldown ({self.cooldowns['meteor']} turns left)!", Fore.RED))
+            display(colored_text(f"⛔ Meteor Fall is on cooldown ({self.cooldowns['meteor']} turns left)!", Fore.RED))
             return
 
-        print(colored_text(f"☄️ {self.name} channels METEOR FALL... A fiery doom descends!", Fore.YELLOW, Style.BRIGHT))
+        display(colored_text(f"☄️ {self.name} channels METEOR FALL... A fiery doom descends!", Fore.YELLOW, Style.BRIGHT))
 
         for enemy in enemies:
             base_damage = self.attack * 2.2
@@ -51,21 +55,21 @@ class Mage(Character):
             damage, crit_miss_result = self.apply_dice(damage, is_bot)
 
             if crit_miss_result == "miss":
-                print(colored_text(f"💫 Meteor misses {enemy.name}!", Fore.BLUE))
+                display(colored_text(f"💫 Meteor misses {enemy.name}!", Fore.BLUE))
                 continue
 
             final_damage = max(0, int(damage) - enemy.defense)
             enemy.hp -= final_damage
 
             if crit_miss_result == "crit":
-                print(colored_text(f"🔥 DIRECT METEOR HIT on {enemy.name}! {final_damage} damage!", Fore.MAGENTA))
+                display(colored_text(f"🔥 DIRECT METEOR HIT on {enemy.name}! {final_damage} damage!", Fore.MAGENTA))
             else:
-                print(colored_text(f"🔥 Meteor Fall hits {enemy.name} for {final_damage} damage!", Fore.RED))
+                display(colored_text(f"🔥 Meteor Fall hits {enemy.name} for {final_damage} damage!", Fore.RED))
 
         self.cooldowns["meteor"] = 4
 
     def apply_dice(self, dmg, is_bot=False):
-        dice = roll_dice(is_bot)
+        dice = self.roll(is_bot)
         if dice == 1:
             return 0, "miss"
         elif dice == 20:
@@ -81,3 +85,15 @@ class Mage(Character):
         for key in self.cooldowns:
             if self.cooldowns[key] > 0:
                 self.cooldowns[key] -= 1
+
+    # ====== Actions ======
+    actions = ActionTable([
+        Action("arcane_lance", "Arcane Lance", arcane_lance, Fore.CYAN, bot_weight=0.6),
+        Action("celestial_healing", "Celestial Healing (self-heal)",
+               lambda self, enemy, is_bot: self.celestial_healing(), Fore.GREEN, bot_weight=0.2,
+               available=lambda f: f.cooldowns["heal"] == 0),
+        Action("meteor_fall", "Meteor Fall (AoE)",
+               lambda self, enemy, is_bot: self.meteor_fall([enemy], is_bot), Fore.RED, bot_weight=0.2,
+               available=lambda f: f.cooldowns["meteor"] == 0),
+    ])
+    default_policy = MagePolicy.from_table(actions)
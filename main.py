@@ -1,58 +1,58 @@
-import time
-import numpy as np
+import random_stream
 from colorama import Fore, Style
-from game_utils import colored_text, print_banner, print_separator
-from equipment import Equipment, ElementalEquipment
-from tournament import start_tournament_mode
-from knight import Knight
-from orc import Orc
-from mage import Mage
-from ninja import Ninja
-from battle import Battle
+from game_utils import colored_text, print_banner, print_separator, display, prompt, pause, set_clock
+
+# Fighter classes, equipment, Battle and the tournament are imported by the
+# mode that uses them, so the menu comes up without loading the game engine.
 
 # ====== Main Menu ======
 def main_menu():
     while True:
         print_banner("⚔️  BATTLE ARENA  ⚔️", Fore.MAGENTA)
-        print(colored_text("1) Player vs Bot", Fore.CYAN, Style.BRIGHT))
-        print(colored_text("2) Player vs Player", Fore.YELLOW, Style.BRIGHT))
-        print(colored_text("3) Tournament Mode", Fore.MAGENTA, Style.BRIGHT))
-        print(colored_text("4) Quit", Fore.RED))
+        display(colored_text("1) Player vs Bot", Fore.CYAN, Style.BRIGHT))
+        display(colored_text("2) Player vs Player", Fore.YELLOW, Style.BRIGHT))
+        display(colored_text("3) Tournament Mode", Fore.MAGENTA, Style.BRIGHT))
+        display(colored_text("4) Quit", Fore.RED))
         print_separator("=", 30, Fore.MAGENTA)
-        choice = input(colored_text("Enter choice (1/2/3/4): ", Fore.WHITE, Style.BRIGHT))
+        choice = prompt(colored_text("Enter choice (1/2/3/4): ", Fore.WHITE, Style.BRIGHT))
         
         if choice == "1":
             start_game_vs_bot()
         elif choice == "2":
             start_game_vs_player()
         elif choice == "3":
+            from tournament import start_tournament_mode
             start_tournament_mode()
         elif choice == "4":
-            print(colored_text("⚔️ Farewell, warrior! ⚔️", Fore.CYAN, Style.BRIGHT))
+            display(colored_text("⚔️ Farewell, warrior! ⚔️", Fore.CYAN, Style.BRIGHT))
             break
         else:
-            print(colored_text("Invalid choice!", Fore.RED))
+            display(colored_text("Invalid choice!", Fore.RED))
 
 def choose_character(player_name="Player"):
     print_banner(f"{player_name} - Choose Your Fighter", Fore.BLUE)
-    print(colored_text("1) 🛡️  Knight", Fore.CYAN, Style.BRIGHT))
-    print(colored_text("   • High defense, balanced attacks", Fore.LIGHTBLACK_EX))
-    print(colored_text("   • Special: Shield Bash (stun chance)", Fore.LIGHTBLACK_EX))
-    print()
-    print(colored_text("2) 🪓 Orc", Fore.RED, Style.BRIGHT))
-    print(colored_text("   • High attack, brutal strikes", Fore.LIGHTBLACK_EX))
-    print(colored_text("   • Special: Roar (damage buff)", Fore.LIGHTBLACK_EX))
-    print()
-    print(colored_text("3) 🧙‍♂️ Mage", Fore.MAGENTA, Style.BRIGHT))
-    print(colored_text("   • Ranged spellcaster, heals and nukes", Fore.LIGHTBLACK_EX))
-    print(colored_text("   • Special: Celestial Healing & Meteor Fall", Fore.LIGHTBLACK_EX))
-    print()
-    print(colored_text("4) 🥷 Ninja", Fore.YELLOW, Style.BRIGHT))
-    print(colored_text("   • High speed, stealth attacks", Fore.LIGHTBLACK_EX))
-    print(colored_text("   • Special: Shadowstep & Shuriken Storm", Fore.LIGHTBLACK_EX))
+    display(colored_text("1) 🛡️  Knight", Fore.CYAN, Style.BRIGHT))
+    display(colored_text("   • High defense, balanced attacks", Fore.LIGHTBLACK_EX))
+    display(colored_text("   • Special: Shield Bash (stun chance)", Fore.LIGHTBLACK_EX))
+    display()
+    display(colored_text("2) 🪓 Orc", Fore.RED, Style.BRIGHT))
+    display(colored_text("   • High attack, brutal strikes", Fore.LIGHTBLACK_EX))
+    display(colored_text("   • Special: Roar (damage buff)", Fore.LIGHTBLACK_EX))
+    display()
+    display(colored_text("3) 🧙‍♂️ Mage", Fore.MAGENTA, Style.BRIGHT))
+    display(colored_text("   • Ranged spellcaster, heals and nukes", Fore.LIGHTBLACK_EX))
+    display(colored_text("   • Special: Celestial Healing & Meteor Fall", Fore.LIGHTBLACK_EX))
+    display()
+    display(colored_text("4) 🥷 Ninja", Fore.YELLOW, Style.BRIGHT))
+    display(colored_text("   • High speed, stealth attacks", Fore.LIGHTBLACK_EX))
+    display(colored_text("   • Special: Shadowstep & Shuriken Storm", Fore.LIGHTBLACK_EX))
     print_separator("=", 35, Fore.BLUE)
 
-    choice = input(colored_text("Enter 1, 2, 3, or 4: ", Fore.WHITE, Style.BRIGHT))
+    choice = prompt(colored_text("Enter 1, 2, 3, or 4: ", Fore.WHITE, Style.BRIGHT))
+    from knight import Knight
+    from orc import Orc
+    from mage import Mage
+    from ninja import Ninja
     if choice == "1":
         return Knight(f"{player_name} Knight", 150, 15, 8)
     elif choice == "2":
@@ -62,31 +62,32 @@ def choose_character(player_name="Player"):
     elif choice == "4":
         return Ninja(f"{player_name} Ninja", 130, 17, 4)
     else:
-        print(colored_text("Defaulting to Knight!", Fore.YELLOW))
+        display(colored_text("Defaulting to Knight!", Fore.YELLOW))
         return Knight(f"{player_name} Knight", 120, 15, 8)
 
 def choose_equipment():
     print_banner("⚔️  Choose Your Equipment  ⚔️", Fore.MAGENTA)
-    print(colored_text("1) ⚔️  Sword", Fore.RED, Style.BRIGHT))
-    print(colored_text("   • +5 Attack Power", Fore.LIGHTBLACK_EX))
-    print("")
-    print(colored_text("2) 🛡️  Armor", Fore.BLUE, Style.BRIGHT))
-    print(colored_text("   • +4 Defense", Fore.LIGHTBLACK_EX))
-    print("")
-    print(colored_text("3) 🛡️  Shield", Fore.CYAN, Style.BRIGHT))
-    print(colored_text("   • +2 Defense", Fore.LIGHTBLACK_EX))
-    print("")
-    print(colored_text("4) 🔥 Flaming Sword", Fore.RED, Style.BRIGHT))
-    print(colored_text("   • +4 Attack, Fire affinity", Fore.LIGHTBLACK_EX))
-    print("")
-    print(colored_text("5) ❄️ Frost Armor", Fore.CYAN, Style.BRIGHT))
-    print(colored_text("   • +3 Defense, Ice affinity", Fore.LIGHTBLACK_EX))
-    print("")
-    print(colored_text("6) 🌙 Shadow Daggers", Fore.MAGENTA, Style.BRIGHT))
-    print(colored_text("   • +3 Attack, Shadow affinity", Fore.LIGHTBLACK_EX))
+    display(colored_text("1) ⚔️  Sword", Fore.RED, Style.BRIGHT))
+    display(colored_text("   • +5 Attack Power", Fore.LIGHTBLACK_EX))
+    display("")
+    display(colored_text("2) 🛡️  Armor", Fore.BLUE, Style.BRIGHT))
+    display(colored_text("   • +4 Defense", Fore.LIGHTBLACK_EX))
+    display("")
+    display(colored_text("3) 🛡️  Shield", Fore.CYAN, Style.BRIGHT))
+    display(colored_text("   • +2 Defense", Fore.LIGHTBLACK_EX))
+    display("")
+    display(colored_text("4) 🔥 Flaming Sword", Fore.RED, Style.BRIGHT))
+    display(colored_text("   • +4 Attack, Fire affinity", Fore.LIGHTBLACK_EX))
+    display("")
+    display(colored_text("5) ❄️ Frost Armor", Fore.CYAN, Style.BRIGHT))
+    display(colored_text("   • +3 Defense, Ice affinity", Fore.LIGHTBLACK_EX))
+    display("")
+    display(colored_text("6) 🌙 Shadow Daggers", Fore.MAGENTA, Style.BRIGHT))
+    display(colored_text("   • +3 Attack, Shadow affinity", Fore.LIGHTBLACK_EX))
     print_separator("=", 30, Fore.MAGENTA)
     
-    choice = input(colored_text("Enter 1-6: ", Fore.WHITE, Style.BRIGHT))
+    choice = prompt(colored_text("Enter 1-6: ", Fore.WHITE, Style.BRIGHT))
+    from equipment import Equipment, ElementalEquipment
     if choice == "1":
         return Equipment("Sword", attack_boost=5)
     elif choice == "2":
@@ -100,16 +101,17 @@ def choose_equipment():
     elif choice == "6":
         return ElementalEquipment("Shadow Daggers", "shadow", attack_boost=3)
     else:
-        print(colored_text("Defaulting to Sword!", Fore.YELLOW))
+        display(colored_text("Defaulting to Sword!", Fore.YELLOW))
         return Equipment("Sword", attack_boost=5)
 
 def start_game_vs_player():
     print_banner("⚔️  PLAYER VS PLAYER  ⚔️", Fore.GREEN)
     p1 = choose_character("Player 1")
     p1.equip(choose_equipment())
-    print("")
+    display("")
     p2 = choose_character("Player 2") 
     p2.equip(choose_equipment())
+    from battle import Battle
     battle = Battle(p1, p2)
     battle.fight()
 
@@ -117,8 +119,14 @@ def start_game_vs_bot():
     print_banner("🤖  PLAYER VS BOT  🤖", Fore.CYAN)
     p1 = choose_character("Player")
     p1.equip(choose_equipment())
-    
-    bot_class = np.random.choice(["Knight", "Orc", "Mage", "Ninja"])
+    from knight import Knight
+    from orc import Orc
+    from mage import Mage
+    from ninja import Ninja
+    from equipment import Equipment, ElementalEquipment
+    from battle import Battle
+
+    bot_class = random_stream.choice(["Knight", "Orc", "Mage", "Ninja"])
     if bot_class == "Knight":
         bot = Knight("Bot Knight", 150, 15, 8)
     elif bot_class == "Orc":
@@ -128,7 +136,7 @@ def start_game_vs_bot():
     else:  # Ninja
         bot = Ninja("Bot Ninja", 130, 17, 4)
 
-    bot_equipment = np.random.choice([
+    bot_equipment = random_stream.choice([
         Equipment("Sword", attack_boost=5),
         Equipment("Armor", defense_boost=4),
         Equipment("Shield", defense_boost=2),
@@ -137,12 +145,33 @@ def start_game_vs_bot():
         ElementalEquipment("Shadow Daggers", "shadow", attack_boost=3)
     ])
     bot.equip(bot_equipment)
-    print(colored_text(f"\n🤖 Bot chose {bot_class} with {bot_equipment.name}!", Fore.YELLOW, Style.BRIGHT))
-    time.sleep(1.5)
-    
+    bot.policy = bot.default_policy
+    display(colored_text(f"\n🤖 Bot chose {bot_class} with {bot_equipment.name}!", Fore.YELLOW, Style.BRIGHT))
+    pause(1.5)
+
     battle = Battle(p1, bot)
     battle.fight()
 
 # ====== Run Game ======
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Battle Arena")
+    parser.add_argument("--blocking", action="store_true",
+                        help="classic loop that blocks on input() and sleep (no asyncio)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="animation pace: 1 normal, 0.25 four times faster, 0 no delays")
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="never wait; animation delays only advance simulated time")
+    args = parser.parse_args()
+    from clock import Clock, VirtualClock, check_speed
+    try:
+        speed = check_speed(args.speed)
+    except ValueError as exc:
+        parser.error(str(exc))
+    set_clock(VirtualClock(speed) if args.virtual_clock else Clock(speed))
+    if args.blocking:
+        main_menu()
+    else:
+        import async_game
+        async_game.run(main_menu)
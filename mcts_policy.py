@@ -0,0 +1,185 @@
+# mcts_policy.py - Monte Carlo tree search bot policy
+#
+# MCTSPolicy plays one fighter (the tournament's final boss) by searching
+# instead of following fixed odds. Every decision it copies both fighters
+# into a private search battle (battle_state.clone_fighters) and, until the
+# wall-clock budget runs out, replays the position from a snapshot:
+#
+#   * Selection/expansion walks a tree of moves. A node's children are keyed
+#     by (searching fighter's move?, action id), so the opponent's replies
+#     are part of the tree. Our moves maximise UCT, the opponent's minimise
+#     it (a human is assumed to play well). The tree is open-loop: dice are
+#     re-rolled on every pass, so a node holds the average over outcomes.
+#   * The rollout continues with both classes' default policies for a few
+#     turns and scores the result: 1 win, 0 loss, otherwise the HP balance.
+#
+# The game rules are not duplicated: the search drives Battle.steps with
+# both fighters' policies cleared, so every move is sent in from here.
+# After a decision the subtree of the chosen move is kept, and next turn it
+# is entered through the reply the opponent actually made (fighter
+# .last_action), so earlier work carries over.
+
+import math
+import time
+from random_stream import RandomStream
+from lazy_modules import lazy_import
+from game_utils import headless
+from policies import Policy, battle_view
+from battle import Battle
+import battle_state
+
+np = lazy_import("numpy")
+
+class Node:
+    __slots__ = ("visits", "value", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0    # summed results, from the searching fighter's side
+        self.children = {}  # (searcher moved, action id) -> Node
+
+def _available_ids(fighter):
+    mask = fighter.actions.available_mask(fighter)
+    return [action.id for action in fighter.actions if mask >> (action.id - 1) & 1]
+
+class MCTSPolicy(Policy):
+    """Tree search for `fighter` under a per-decision time budget (seconds)"""
+    def __init__(self, fighter, budget=0.005, iterations=None, rollout_turns=6,
+                 exploration=1.4, seed=None):
+        self.fighter = fighter
+        self.budget = budget            # None: only the iteration cap applies
+        self.iterations = iterations    # cap per decision (None: until the budget runs out)
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.seed = seed
+        self.stream = None              # search dice, created on first use
+        self.tree = None                # subtree of the last move played
+        self.anchor = None              # (enemy, turn) of the last decision
+        self.last_iterations = 0        # passes made for the last decision
+
+    # ====== Decision ======
+    def choose(self, view, rng):
+        start = time.perf_counter()
+        me = self.fighter
+        enemy = me.p2 if me.p1 is me else me.p1
+        if self.stream is None:
+            self.stream = RandomStream(np.random.default_rng(self.seed))
+        root = self.reused_tree(view.turn, enemy)
+
+        with headless():
+            p1, p2 = battle_state.clone_fighters(me.p1, me.p2)
+            p1.policy = p2.policy = None  # every move comes from the search
+            search = Battle(p1, p2, rng=self.stream)
+            search.turn = view.turn
+            searcher, opponent = (p1, p2) if me is me.p1 else (p2, p1)
+            state = battle_state.snapshot(search, rng=False)
+
+            deadline = None if self.budget is None else start + self.budget
+            passes = 0
+            while self.iterations is None or passes < self.iterations:
+                self.search_pass(search, searcher, opponent, root)
+                battle_state.restore(search, state)
+                passes += 1
+                if deadline is not None:
+                    # stop unless an average pass still fits in the budget
+                    now = time.perf_counter()
+                    if now + (now - start) / passes >= deadline:
+                        break
+        self.last_iterations = passes
+
+        choices = [(root.children[key].visits, key[1]) for key in root.children
+                   if key[0] and key[1] in _available_ids(me)]
+        if not choices:
+            return me.actions.default.id
+        action_id = max(choices)[1]
+        self.tree = root.children[(True, action_id)]
+        self.anchor = (enemy, view.turn)
+        return action_id
+
+    def reused_tree(self, turn, enemy):
+        """The kept subtree if this decision follows the last one, else a new root"""
+        node, anchor = self.tree, self.anchor
+        self.tree = self.anchor = None
+        if node is None or anchor[0] is not enemy or turn != anchor[1] + 1:
+            return Node()
+        # The opponent had one slot in between: later in the last turn when it
+        # moves second, earlier in this turn when it moves first
+        reply_turn = turn if enemy is enemy.p1 else anchor[1]
+        stamp = enemy.last_action
+        if stamp is not None and stamp[0] == reply_turn:
+            node = node.children.get((False, stamp[1]))
+        return node or Node()
+
+    # ====== One Pass ======
+    def search_pass(self, battle, searcher, opponent, root):
+        path = [root]
+        node = root
+        steps = None
+        mover = searcher  # the searcher is mid-turn, already past its status checks
+        result = None
+        while True:
+            is_searcher = mover is searcher
+            node, action_id, expanded = self.select(node, is_searcher, _available_ids(mover))
+            path.append(node)
+            try:
+                if steps is None:
+                    battle.player_turn(searcher, opponent, action_id)
+                    steps = battle.steps(external=True, resume_after=searcher)
+                    mover = next(steps)
+                else:
+                    mover = steps.send(action_id)
+            except StopIteration:
+                result = self.score(searcher, opponent)
+                break
+            if expanded:
+                result = self.rollout(battle, steps, mover, searcher, opponent)
+                break
+        if steps is not None:
+            steps.close()
+        for visited in path:
+            visited.visits += 1
+            visited.value += result
+
+    def select(self, node, is_searcher, ids):
+        """(child, action id, newly expanded): an untried move first, else UCT"""
+        children = node.children
+        untried = [i for i in ids if (is_searcher, i) not in children]
+        if untried:
+            action_id = untried[int(self.stream.random() * len(untried))]
+            child = children[(is_searcher, action_id)] = Node()
+            return child, action_id, True
+        log_visits = math.log(node.visits or 1)
+        best = best_id = None
+        best_score = -1.0
+        for action_id in ids:
+            child = children[(is_searcher, action_id)]
+            mean = child.value / child.visits if child.visits else 0.5
+            if not is_searcher:
+                mean = 1.0 - mean  # the opponent picks what is worst for us
+            score = mean + self.exploration * math.sqrt(log_visits / (child.visits or 1))
+            if score > best_score:
+                best, best_id, best_score = child, action_id, score
+        return best, best_id, False
+
+    def rollout(self, battle, steps, mover, searcher, opponent):
+        """Default policies for rollout_turns more turns, then a score"""
+        stream = self.stream
+        last_turn = battle.turn + self.rollout_turns
+        try:
+            while battle.turn <= last_turn:
+                enemy = opponent if mover is searcher else searcher
+                choice = mover.default_policy.choose(battle_view(battle.turn, mover, enemy), stream)
+                # as in player_turn, a bot picking a human-only move plays the default
+                mover = steps.send(mover.actions.resolve(choice, True).id)
+        except StopIteration:
+            pass
+        return self.score(searcher, opponent)
+
+    @staticmethod
+    def score(searcher, opponent):
+        if not opponent.is_alive():
+            return 1.0 if searcher.is_alive() else 0.5
+        if not searcher.is_alive():
+            return 0.0
+        balance = searcher.hp / searcher.max_hp - opponent.hp / opponent.max_hp
+        return 0.5 + 0.5 * balance
@@ -0,0 +1,208 @@
+# policies.py - Bot policies
+#
+# A policy looks at a read-only BattleView and returns the id of the move to
+# play (the 1-based position in the fighter's ActionTable, which is also the
+# menu number). Battle asks fighter.policy every turn; a fighter without a
+# policy is controlled by a human (or, when headless, by its class's
+# default_policy).
+#
+# choose_batch evaluates a policy over many states at once. There the view
+# holds NumPy arrays instead of numbers (one element per state), rng is a
+# numpy Generator, and the result is an array of ids. batch_battle uses this.
+# probabilities gives the distribution choose draws from for one view, which
+# markov_battle uses to solve matchups exactly.
+
+from collections import namedtuple
+from random_stream import RandomStream, AliasTable
+from lazy_modules import lazy_import
+
+np = lazy_import("numpy")  # only the batched paths need it
+
+FighterView = namedtuple("FighterView", [
+    "kind",        # class name, e.g. "Knight"
+    "hp", "max_hp", "attack", "defense",
+    "statuses",    # StatusEffects.mask
+    "available",   # bit (id - 1) set for every move a bot can play right now
+    "buff_turns",  # Orc roar turns left (0 for other classes)
+    "phase",       # boss phase (1 for regular fighters)
+])
+BattleView = namedtuple("BattleView", "turn me enemy")
+
+# Views are built twice per turn, so skip namedtuple's keyword-argument __new__
+_tuple_new = tuple.__new__
+
+def fighter_view(fighter):
+    return _tuple_new(FighterView, (
+        type(fighter).__name__, fighter.hp, fighter.max_hp, fighter.attack, fighter.defense,
+        fighter.status_effects.mask, fighter.actions.available_mask(fighter),
+        getattr(fighter, "attack_buff_turns", 0), getattr(fighter, "phase", 1),
+    ))
+
+def battle_view(turn, fighter, enemy):
+    return _tuple_new(BattleView, (turn, fighter_view(fighter), fighter_view(enemy)))
+
+def is_available(view, action_id):
+    """Works on scalar and batched views alike"""
+    return (view.available >> (action_id - 1)) & 1 == 1
+
+# ====== Policy Base ======
+class Policy:
+    def choose(self, view, rng):
+        """Action id for one BattleView (rng is a RandomStream)"""
+        raise NotImplementedError
+
+    def choose_batch(self, view, rng):
+        """Action ids for a batched BattleView (rng is a numpy Generator).
+
+        The fallback evaluates one state at a time; policies that matter for
+        bulk simulation override it with array operations.
+        """
+        stream = RandomStream(rng)
+        n = len(view.me.hp)
+        rows = [BattleView(view.turn, _row(view.me, k), _row(view.enemy, k)) for k in range(n)]
+        return np.array([self.choose(row, stream) for row in rows], np.int64)
+
+    def probabilities(self, view, samples=4000):
+        """{action id: probability} of choose for one BattleView.
+
+        The fallback estimates them by sampling choose with a fixed seed; the
+        built-in policies override it with exact values.
+        """
+        stream = RandomStream(np.random.default_rng(0))
+        counts = {}
+        for _ in range(samples):
+            action_id = self.choose(view, stream)
+            counts[action_id] = counts.get(action_id, 0) + 1
+        return {action_id: count / samples for action_id, count in counts.items()}
+
+def _row(view, k):
+    return FighterView(*(v if np.isscalar(v) else v[k] for v in view))
+
+def _blend(first_id, first_p, rest):
+    """Pick first_id with first_p, otherwise follow the {id: p} dict rest"""
+    probs = {action_id: p * (1 - first_p) for action_id, p in rest.items()}
+    probs[first_id] = probs.get(first_id, 0.0) + first_p
+    return probs
+
+class WeightedPolicy(Policy):
+    """Fixed random mix of moves"""
+    def __init__(self, ids, weights):
+        self.ids = list(ids)
+        self.weights = list(weights)
+        self.table = AliasTable(self.weights)
+        self.id_array = None  # built on first batched use
+        total = sum(self.weights)
+        self.probs = {}
+        for action_id, weight in zip(self.ids, self.weights):
+            self.probs[action_id] = self.probs.get(action_id, 0.0) + weight / total
+
+    @classmethod
+    def from_table(cls, table):
+        """Mix given by the bot weights declared in an ActionTable"""
+        moves = [action for action in table if action.bot_weight > 0]
+        return cls([a.id for a in moves], [a.bot_weight for a in moves])
+
+    def choose(self, view, rng):
+        return self.ids[self.table.draw(rng)]
+
+    def choose_batch(self, view, rng):
+        if self.id_array is None:
+            self.id_array = np.array(self.ids)
+        return self.id_array[self.table.draw_batch(rng, len(view.me.hp))]
+
+    def probabilities(self, view):
+        return dict(self.probs)
+
+# ====== Class Policies ======
+# Ids are menu numbers: Knight 1 Sword Slash .. 4 Rapid Strikes, Orc 1 Cleave,
+# 2 Berserk Strike, 3 Roar, Mage 1 Arcane Lance, 2 Celestial Healing,
+# 3 Meteor Fall, Ninja 1 Shadowstep, 2 Twin Fang Slash, 3 Shuriken Storm,
+# 4 Smoke Bomb Escape.
+
+class OrcPolicy(WeightedPolicy):
+    """Roar whenever the buff is down (60%), otherwise the weighted mix"""
+    def choose(self, view, rng):
+        if view.me.buff_turns <= 0 and rng.random() < 0.6:
+            return 3
+        return super().choose(view, rng)
+
+    def choose_batch(self, view, rng):
+        roar_first = (view.me.buff_turns <= 0) & (rng.random(len(view.me.hp)) < 0.6)
+        return np.where(roar_first, 3, super().choose_batch(view, rng))
+
+    def probabilities(self, view):
+        return _blend(3, 0.6 if view.me.buff_turns <= 0 else 0.0, self.probs)
+
+class MagePolicy(WeightedPolicy):
+    """Meteor when ready (40%), heal below half HP, otherwise the weighted mix"""
+    def choose(self, view, rng):
+        me = view.me
+        if is_available(me, 3) and rng.random() < 0.4:
+            return 3
+        if me.hp < me.max_hp // 2 and is_available(me, 2):
+            return 2
+        return super().choose(view, rng)
+
+    def choose_batch(self, view, rng):
+        me = view.me
+        meteor_first = is_available(me, 3) & (rng.random(len(me.hp)) < 0.4)
+        heal_next = (me.hp < me.max_hp // 2) & is_available(me, 2)
+        return np.where(meteor_first, 3, np.where(heal_next, 2, super().choose_batch(view, rng)))
+
+    def probabilities(self, view):
+        me = view.me
+        rest = {2: 1.0} if me.hp < me.max_hp // 2 and is_available(me, 2) else self.probs
+        return _blend(3, 0.4 if is_available(me, 3) else 0.0, rest)
+
+class NinjaPolicy(Policy):
+    """Shadowstep (30%), shurikens (40%), smoke bomb when low, else Twin Fang"""
+    def choose(self, view, rng):
+        me = view.me
+        if is_available(me, 1) and rng.random() < 0.3:
+            return 1
+        if is_available(me, 3) and rng.random() < 0.4:
+            return 3
+        if is_available(me, 4) and me.hp < me.max_hp * 0.3:
+            return 4
+        return 2
+
+    def choose_batch(self, view, rng):
+        me = view.me
+        n = len(me.hp)
+        step = is_available(me, 1) & (rng.random(n) < 0.3)
+        storm = ~step & is_available(me, 3) & (rng.random(n) < 0.4)
+        smoke = ~step & ~storm & is_available(me, 4) & (me.hp < me.max_hp * 0.3)
+        return np.select([step, storm, smoke], [1, 3, 4], 2)
+
+    def probabilities(self, view):
+        me = view.me
+        probs = {4: 1.0} if is_available(me, 4) and me.hp < me.max_hp * 0.3 else {2: 1.0}
+        probs = _blend(3, 0.4 if is_available(me, 3) else 0.0, probs)
+        return _blend(1, 0.3 if is_available(me, 1) else 0.0, probs)
+
+class BossPolicy(Policy):
+    """Phase- and HP-driven ability picks, defaulting to Claw Strike"""
+    CLAW_STRIKE, FIRE_BREATH, WING_SLAM, ROAR_OF_TERROR, BERSERKER_FURY = range(1, 6)
+
+    def choose(self, view, rng):
+        me = view.me
+        if me.phase == 3 and is_available(me, self.BERSERKER_FURY) and rng.random() < 0.4:
+            return self.BERSERKER_FURY
+        if me.hp < me.max_hp * 0.3 and is_available(me, self.ROAR_OF_TERROR) and rng.random() < 0.5:
+            return self.ROAR_OF_TERROR
+        if me.phase >= 2 and is_available(me, self.FIRE_BREATH) and rng.random() < 0.3:
+            return self.FIRE_BREATH
+        if is_available(me, self.WING_SLAM) and rng.random() < 0.25:
+            return self.WING_SLAM
+        return self.CLAW_STRIKE
+
+    def probabilities(self, view):
+        me = view.me
+        probs = {self.CLAW_STRIKE: 1.0}
+        probs = _blend(self.WING_SLAM, 0.25 if is_available(me, self.WING_SLAM) else 0.0, probs)
+        fire = me.phase >= 2 and is_available(me, self.FIRE_BREATH)
+        probs = _blend(self.FIRE_BREATH, 0.3 if fire else 0.0, probs)
+        roar = me.hp < me.max_hp * 0.3 and is_available(me, self.ROAR_OF_TERROR)
+        probs = _blend(self.ROAR_OF_TERROR, 0.5 if roar else 0.0, probs)
+        fury = me.phase == 3 and is_available(me, self.BERSERKER_FURY)
+        return _blend(self.BERSERKER_FURY, 0.4 if fury else 0.0, probs)
@@ -0,0 +1,161 @@
+# profiler.py - Opt-in timing of the battle loop
+#
+# Install a Profiler on a battle with Battle(p1, p2, profiler=profiler) and
+# Battle.fight times its phases with perf_counter_ns: each turn, action
+# selection, move execution (one section per class move, e.g. Knight.sword_slash),
+# equipment wear_down, handle_elemental_effects and cooldown reduction. Without
+# a profiler the battle times against NULL_PROFILER, whose calls do nothing,
+# so profiled and plain battles run the same code.
+#
+# Sections nest, so timings are kept per stack path ("fight;turn;execute;
+# Knight.sword_slash"). They can be exported as JSON or in the collapsed-stack
+# format read by flame graph tools (flamegraph.pl, speedscope, inferno), where
+# every line is a path followed by the time spent in it but not in its children.
+
+import json
+from time import perf_counter_ns
+
+class SectionStats:
+    """Calls and inclusive time of one stack path"""
+    __slots__ = ("calls", "total_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+
+class Profiler:
+    """Aggregates section timings across any number of battles"""
+    def __init__(self):
+        self.sections = {}  # path -> SectionStats
+        self.stack = []     # [(path, start ns)] of the open sections
+
+    def start(self, name):
+        path = f"{self.stack[-1][0]};{name}" if self.stack else name
+        self.stack.append((path, perf_counter_ns()))
+
+    def start_move(self, fighter, action):
+        """Open the section of one class move, e.g. Knight.sword_slash"""
+        self.start(f"{type(fighter).__name__}.{action.name}")
+
+    def stop(self):
+        end = perf_counter_ns()
+        path, start = self.stack.pop()
+        stats = self.sections.get(path)
+        if stats is None:
+            stats = self.sections[path] = SectionStats()
+        stats.calls += 1
+        stats.total_ns += end - start
+
+    def close(self):
+        """Stop every open section (a battle can end in the middle of a turn)"""
+        while self.stack:
+            self.stop()
+
+    def merge(self, other):
+        """Add the timings of another profiler (e.g. one from a worker process)"""
+        for path, theirs in other.sections.items():
+            stats = self.sections.get(path)
+            if stats is None:
+                stats = self.sections[path] = SectionStats()
+            stats.calls += theirs.calls
+            stats.total_ns += theirs.total_ns
+
+    def self_times(self):
+        """{path: ns spent in the section itself, not in its child sections}"""
+        own = {path: stats.total_ns for path, stats in self.sections.items()}
+        for path, stats in self.sections.items():
+            parent, _, _ = path.rpartition(";")
+            if parent in own:
+                own[parent] -= stats.total_ns
+        return own
+
+    # ====== Export ======
+    def as_dict(self):
+        own = self.self_times()
+        return {
+            path: {
+                "calls": stats.calls,
+                "total_ns": stats.total_ns,
+                "self_ns": own[path],
+                "mean_ns": stats.total_ns / stats.calls,
+            }
+            for path, stats in sorted(self.sections.items())
+        }
+
+    def to_json(self, file=None, indent=2):
+        """JSON text of as_dict(), also written to file (a path) when given"""
+        text = json.dumps(self.as_dict(), indent=indent)
+        if file is not None:
+            with open(file, "w") as f:
+                f.write(text + "\n")
+        return text
+
+    def collapsed(self):
+        """Collapsed-stack lines ("a;b;c <self ns>") for flame graph tools"""
+        return [f"{path} {max(0, ns)}" for path, ns in sorted(self.self_times().items())]
+
+    def write_collapsed(self, file):
+        with open(file, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def report(self, top=20):
+        """Text table of the sections with the most self time"""
+        own = self.self_times()
+        total = sum(max(0, ns) for ns in own.values()) or 1
+        lines = [f"{'section':<50} {'calls':>9} {'self ms':>10} {'self %':>7} {'mean us':>9}"]
+        for path in sorted(own, key=own.get, reverse=True)[:top]:
+            stats = self.sections[path]
+            lines.append(f"{path:<50} {stats.calls:>9} {own[path] / 1e6:>10.2f} "
+                         f"{own[path] / total:>7.1%} {stats.total_ns / stats.calls / 1e3:>9.2f}")
+        return "\n".join(lines)
+
+class NullProfiler:
+    """Stand-in when timing is off: every call is a no-op"""
+    __slots__ = ()
+
+    def start(self, name):
+        pass
+
+    def start_move(self, fighter, action):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+if __name__ == "__main__":
+    import argparse
+    import numpy as np
+    from battle import Battle
+    from game_utils import headless
+    from tournament_runner import ROSTER
+
+    parser = argparse.ArgumentParser(description="Profile headless bot battles phase by phase")
+    parser.add_argument("fighter1", choices=list(ROSTER))
+    parser.add_argument("fighter2", choices=list(ROSTER))
+    parser.add_argument("-n", "--battles", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", metavar="FILE", help="write section timings as JSON")
+    parser.add_argument("--collapsed", metavar="FILE", help="write collapsed stacks for flame graphs")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    def bot(name):
+        cls, hp, attack, defense = ROSTER[name]
+        return cls(f"Bot {name}", hp, attack, defense)
+
+    profiler = Profiler()
+    rng = np.random.default_rng(args.seed)
+    with headless():
+        for _ in range(args.battles):
+            Battle(bot(args.fighter1), bot(args.fighter2), rng=rng, profiler=profiler).fight(max_turns=1000)
+
+    print(profiler.report(args.top))
+    if args.json:
+        profiler.to_json(args.json)
+    if args.collapsed:
+        profiler.write_collapsed(args.collapsed)
@@ -0,0 +1,226 @@
+# random_stream.py - Buffered random numbers for dice rolls and proc checks
+#
+# Scalar calls like np.random.random() or np.random.randint(1, 21) each pay
+# several microseconds of NumPy overhead. A RandomStream instead draws large
+# blocks of uniforms and d20 rolls in one vectorized call, converts them to
+# plain Python numbers and hands them out from a cursor, refilling when a
+# block runs dry.
+#
+# numpy is imported lazily: the shared default stream is a PyRandomStream
+# built on the standard library, so menus and single interactive battles
+# never load numpy. Seeded and batched runs use numpy-backed streams.
+
+from functools import lru_cache
+from random import Random
+from lazy_modules import lazy_import
+
+np = lazy_import("numpy")
+
+DEFAULT_BLOCK_SIZE = 4096
+
+class RandomStream:
+    def __init__(self, generator=None, block_size=DEFAULT_BLOCK_SIZE):
+        self.generator = generator if generator is not None else np.random.default_rng()
+        self.block_size = block_size
+        self._uniforms = []
+        self._uniform_pos = 0
+        self._d20s = []
+        self._d20_pos = 0
+        self._generator_state = None  # bit generator state since the last refill, once asked for
+
+    def _refill_uniforms(self):
+        self._uniforms = self.generator.random(self.block_size).tolist()
+        self._uniform_pos = 0
+        self._generator_state = None
+
+    def _refill_d20s(self):
+        self._d20s = self.generator.integers(1, 21, self.block_size).tolist()
+        self._d20_pos = 0
+        self._generator_state = None
+
+    # ====== Position Snapshots ======
+    # Blocks are replaced on refill, never changed in place, so a snapshot can
+    # hold on to them. The generator only moves when a block is refilled, so
+    # its state is read once per block and restoring within the same block
+    # just resets the cursors.
+    def getstate(self):
+        state = self._generator_state
+        if state is None:
+            state = self._generator_state = self.generator.bit_generator.state
+        return (state, self._uniforms, self._uniform_pos, self._d20s, self._d20_pos)
+
+    def setstate(self, state):
+        generator_state, self._uniforms, self._uniform_pos, self._d20s, self._d20_pos = state
+        if generator_state is not self._generator_state:
+            self.generator.bit_generator.state = generator_state
+            self._generator_state = generator_state
+
+    def copy(self):
+        """Independent stream continuing from the same position"""
+        # A fixed seed skips gathering OS entropy; setstate overwrites it anyway
+        twin = RandomStream(np.random.Generator(type(self.generator.bit_generator)(0)), self.block_size)
+        twin.setstate(self.getstate())
+        return twin
+
+    def random(self):
+        """Uniform float in [0, 1)"""
+        if self._uniform_pos >= len(self._uniforms):
+            self._refill_uniforms()
+        value = self._uniforms[self._uniform_pos]
+        self._uniform_pos += 1
+        return value
+
+    def d20(self):
+        """Integer in [1, 20]"""
+        if self._d20_pos >= len(self._d20s):
+            self._refill_d20s()
+        value = self._d20s[self._d20_pos]
+        self._d20_pos += 1
+        return value
+
+    def randint(self, low, high):
+        """Integer in [low, high), like np.random.randint"""
+        return low + int(self.random() * (high - low))
+
+    def choice(self, options, p=None):
+        """Pick one element of options, optionally weighted by p"""
+        if p is None:
+            return options[int(self.random() * len(options))]
+        return options[alias_table(tuple(p)).index(self.random())]
+
+class PyRandomStream:
+    """Same interface as RandomStream on the standard library's Mersenne
+    Twister: no numpy needed, and no blocks to refill"""
+    def __init__(self, seed=None):
+        self.generator = Random(seed)
+        self.random = self.generator.random
+
+    def d20(self):
+        return int(self.random() * 20) + 1
+
+    def getstate(self):
+        """Full Mersenne Twister state (copies 625 words: ~15 us, unlike RandomStream)"""
+        return self.generator.getstate()
+
+    def setstate(self, state):
+        self.generator.setstate(state)
+
+    def copy(self):
+        twin = PyRandomStream(0)  # seeded: no OS entropy, setstate overwrites it
+        twin.setstate(self.getstate())
+        return twin
+
+    randint = RandomStream.randint
+    choice = RandomStream.choice
+
+# ====== Weighted Sampling ======
+class AliasTable:
+    """Walker/Vose alias table: O(n) setup, then O(1) weighted draws.
+
+    Each of the n columns is picked uniformly; a column keeps its own index
+    with probability prob[k] and otherwise yields alias[k].
+    """
+    __slots__ = ("n", "prob", "alias", "prob_array", "alias_array")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("weights must contain a positive entry")
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [k for k, s in enumerate(scaled) if s < 1.0]
+        large = [k for k, s in enumerate(scaled) if s >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left over is 1.0 up to rounding error
+
+        self.n = n
+        self.prob = prob
+        self.alias = alias
+        self.prob_array = None
+        self.alias_array = None
+
+    def index(self, u):
+        """Weighted index from one uniform u in [0, 1)"""
+        x = u * self.n
+        k = int(x)
+        if k == self.n:  # u * n can round up to n
+            k -= 1
+        return k if x - k < self.prob[k] else self.alias[k]
+
+    def indices(self, u):
+        """Vectorized index over an array of uniforms"""
+        if self.prob_array is None:  # built on first batched use
+            self.prob_array = np.array(self.prob)
+            self.alias_array = np.array(self.alias)
+        x = np.asarray(u) * self.n
+        k = np.minimum(x.astype(np.int64), self.n - 1)
+        return np.where(x - k < self.prob_array[k], k, self.alias_array[k])
+
+    def draw(self, rng):
+        """One index from a RandomStream"""
+        return self.index(rng.random())
+
+    def draw_batch(self, generator, size):
+        """size indices from a numpy Generator"""
+        return self.indices(generator.random(size))
+
+@lru_cache(maxsize=256)
+def alias_table(weights):
+    """Shared AliasTable for a tuple of weights, built on first use"""
+    return AliasTable(weights)
+
+# ====== Construction Helpers ======
+def as_stream(rng=None):
+    """Wrap whatever the caller passed (None, seed, Generator or stream) in a RandomStream"""
+    if rng is None:
+        return default_stream()
+    if isinstance(rng, (RandomStream, PyRandomStream)):
+        return rng
+    if isinstance(rng, np.random.Generator):
+        return RandomStream(rng)
+    return RandomStream(np.random.default_rng(rng))
+
+def spawn_generators(seed, n, bit_generator=None):
+    """n statistically independent Generators derived from one seed via SeedSequence.spawn.
+
+    Children are safe to hand to separate processes: their streams never
+    overlap, and the same (seed, index) always replays the same stream.
+    """
+    bit_generator = bit_generator or np.random.PCG64
+    return [np.random.Generator(bit_generator(child)) for child in np.random.SeedSequence(seed).spawn(n)]
+
+# ====== Shared Default Stream ======
+_stream = None
+
+def default_stream():
+    global _stream
+    if _stream is None:
+        _stream = PyRandomStream()
+    return _stream
+
+def set_default_stream(stream):
+    global _stream
+    _stream = stream
+
+def seed(value=None):
+    """Reseed the shared stream (value may be an int or a SeedSequence)"""
+    set_default_stream(RandomStream(np.random.default_rng(value)))
+
+def random():
+    return default_stream().random()
+
+def d20():
+    return default_stream().d20()
+
+def randint(low, high):
+    return default_stream().randint(low, high)
+
+def choice(options, p=None):
+    return default_stream().choice(options, p)
@@ -0,0 +1,50 @@
+# renderer.py - Output sinks for game text
+#
+# Game code never prints directly: it hands finished lines to the active
+# renderer (see game_utils.display). A Renderer batches everything written
+# since the last flush into a single write, so a whole turn reaches the
+# terminal at once. A NullRenderer drops everything and tells callers to skip
+# formatting altogether.
+
+import sys
+
+class Renderer:
+    def __init__(self, stream=None, color=None, setup=None):
+        self._stream = stream
+        self.setup = setup      # called once, before the first flush (terminal setup)
+        if color is None:
+            isatty = getattr(stream or sys.stdout, "isatty", None)
+            color = bool(isatty and isatty())
+        self.color = color      # emit ANSI color codes
+        self.enabled = True     # False means callers may skip building output
+        self.lines = []
+
+    @property
+    def stream(self):
+        # Resolved late so colorama's stdout wrapper (or a redirect) is honored
+        return self._stream or sys.stdout
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def flush(self):
+        if self.setup is not None:
+            setup, self.setup = self.setup, None
+            setup()
+        if self.lines:
+            stream = self.stream
+            stream.write("".join(self.lines))
+            stream.flush()
+            self.lines.clear()
+
+class NullRenderer(Renderer):
+    """Sink that discards all output"""
+    def __init__(self):
+        super().__init__(color=False)
+        self.enabled = False
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
@@ -0,0 +1,77 @@
+# status_effects.py - Status effects as an integer flag set plus a stack array
+#
+# Each effect owns one bit in `mask` and one slot in `stacks`. A stack count
+# doubles as a duration: STUNNED twice means two lost turns, and clearing an
+# effect removes one stack, dropping the bit only when none are left. Checks,
+# adds and clears are constant time and never allocate.
+#
+# batch_battle stores the same layout as a (N_STATUSES, 2, n) stack array,
+# so STATUS_INDEX / the index constants below address both.
+
+(STUNNED, FROZEN, BURNING, SHOCKED, SHADOWED,
+ BUFFED, UNTOUCHABLE, BLEEDING, FRIGHTENED) = range(9)
+
+STATUS_NAMES = (
+    "STUNNED", "FROZEN", "BURNING", "SHOCKED", "SHADOWED",
+    "BUFFED", "UNTOUCHABLE", "BLEEDING", "FRIGHTENED",
+)
+N_STATUSES = len(STATUS_NAMES)
+STATUS_INDEX = {name: i for i, name in enumerate(STATUS_NAMES)}
+STATUS_BITS = {name: 1 << i for i, name in enumerate(STATUS_NAMES)}
+
+STUNNED_BIT = 1 << STUNNED
+FROZEN_BIT = 1 << FROZEN
+BURNING_BIT = 1 << BURNING
+SHADOWED_BIT = 1 << SHADOWED
+UNTOUCHABLE_BIT = 1 << UNTOUCHABLE
+BLEEDING_BIT = 1 << BLEEDING
+FRIGHTENED_BIT = 1 << FRIGHTENED
+
+class StatusEffects:
+    __slots__ = ("mask", "stacks")
+
+    def __init__(self):
+        self.mask = 0
+        self.stacks = [0] * N_STATUSES
+
+    def __contains__(self, effect):
+        return bool(self.mask & STATUS_BITS[effect])
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __len__(self):
+        return bin(self.mask).count("1")
+
+    def __iter__(self):
+        """Names of the active effects, in bit order"""
+        mask = self.mask
+        for i, name in enumerate(STATUS_NAMES):
+            if mask & (1 << i):
+                yield name
+
+    def __repr__(self):
+        return f"StatusEffects({list(self)})"
+
+    def count(self, effect):
+        return self.stacks[STATUS_INDEX[effect]]
+
+    def add(self, effect, stacks=1):
+        i = STATUS_INDEX[effect]
+        self.stacks[i] += stacks
+        self.mask |= 1 << i
+
+    def remove(self, effect):
+        """Drop one stack; returns False if the effect was not active"""
+        i = STATUS_INDEX[effect]
+        if not self.stacks[i]:
+            return False
+        self.stacks[i] -= 1
+        if not self.stacks[i]:
+            self.mask &= ~(1 << i)
+        return True
+
+    def clear(self):
+        self.mask = 0
+        for i in range(N_STATUSES):
+            self.stacks[i] = 0
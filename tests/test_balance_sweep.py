@@ -0,0 +1,34 @@
+# test_balance_sweep.py - Sweep budgets that could never finish are rejected
+
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+import balance_sweep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATS = {"Knight": (150, 12, 5), "Orc": (180, 14, 3)}
+
+@pytest.mark.parametrize("options", [{"batch_size": 1}, {"batch_size": 0}, {"max_battles": 0}])
+def test_evaluate_point_rejects_empty_budget(options):
+    with pytest.raises(ValueError):
+        balance_sweep.evaluate_point(0, STATS, np.random.SeedSequence(1), **options)
+
+@pytest.mark.parametrize("options", [{"batch_size": 1}, {"max_battles": 0}])
+def test_run_sweep_rejects_empty_budget(options):
+    with pytest.raises(ValueError):
+        balance_sweep.run_sweep({}, ["Knight", "Orc"], seed=1, workers=1, **options)
+
+def test_smallest_budget_finishes():
+    result = balance_sweep.evaluate_point(0, STATS, np.random.SeedSequence(1),
+                                          batch_size=2, max_battles=10)
+    assert all(m.battles >= 10 for m in result.matchups) or result.pruned
+
+@pytest.mark.parametrize("flag", ["--batch-size=1", "--max-battles=0"])
+def test_cli_rejects_empty_budget(flag):
+    run = subprocess.run([sys.executable, "balance_sweep.py", "Knight.hp=150:151", flag],
+                         cwd=ROOT, capture_output=True, text=True)
+    assert run.returncode == 2
+    assert flag.split("=")[0] in run.stderr
@@ -0,0 +1,51 @@
+# test_batch_battle.py - The vectorized engine plays the same game as Battle
+#
+# For a few pairings, a seeded simulate_batch run is compared with a loop
+# of scalar Battle.simulate calls: win rates must agree within sampling
+# error, and so must the mean battle length.
+
+import numpy as np
+import pytest
+from battle import Battle
+from batch_battle import simulate_batch, DRAW
+from equipment import Equipment
+from tournament_runner import ROSTER
+
+SCALAR_BATTLES = 600
+BATCH_BATTLES = 20_000
+
+def bot(kind, equipped=False):
+    cls, hp, attack, defense = ROSTER[kind]
+    fighter = cls(f"Bot {kind}", hp, attack, defense)
+    fighter.policy = fighter.default_policy
+    if equipped:
+        fighter.equipment = Equipment("Sword", attack_boost=4, durability=5)
+    return fighter
+
+def scalar_runs(first, second, equipped, seed):
+    winners, turns = [], []
+    for i in range(SCALAR_BATTLES):
+        p1, p2 = bot(first, equipped), bot(second, equipped)
+        result = Battle(p1, p2, rng=np.random.default_rng([seed, i])).simulate(max_turns=1000)
+        winners.append(DRAW if result.winner is None else (0 if result.winner is p1 else 1))
+        turns.append(result.turns)
+    return np.array(winners), np.array(turns)
+
+@pytest.mark.parametrize("first, second, equipped", [
+    ("Knight", "Orc", False),
+    ("Mage", "Ninja", False),
+    ("Ninja", "Knight", True),
+    ("Orc", "Mage", True),
+])
+def test_batch_matches_scalar_battles(first, second, equipped):
+    winners, turns = scalar_runs(first, second, equipped, seed=3)
+    batch = simulate_batch(bot(first, equipped), bot(second, equipped), BATCH_BATTLES,
+                           rng=np.random.default_rng(4))
+
+    scalar_rate = np.mean(winners == 0)
+    rate = batch.win_rate(0)
+    se = np.sqrt(rate * (1 - rate) * (1 / SCALAR_BATTLES + 1 / BATCH_BATTLES))
+    assert abs(scalar_rate - rate) <= 4 * se + 1e-9
+
+    se_turns = np.std(turns) * np.sqrt(1 / SCALAR_BATTLES + 1 / BATCH_BATTLES)
+    assert abs(np.mean(turns) - batch.mean_turns()) <= 4 * se_turns + 1e-9
@@ -0,0 +1,61 @@
+# test_battle_state.py - snapshot/restore and clone replay a battle exactly
+#
+# Every ROSTER pairing is played a few turns in, snapshotted (or cloned) and
+# fought to the end; the restored battle and the clone must then reach the
+# same result turn for turn.
+
+import itertools
+import numpy as np
+import pytest
+from random_stream import RandomStream, PyRandomStream
+from game_utils import headless
+from battle import Battle
+from tournament_runner import ROSTER
+from equipment import Equipment
+import battle_state
+
+PAIRINGS = list(itertools.product(ROSTER, repeat=2))
+STREAMS = {
+    "numpy": lambda seed: RandomStream(np.random.default_rng(seed)),
+    "stdlib": PyRandomStream,
+}
+
+def make_fighter(kind):
+    cls, hp, attack, defense = ROSTER[kind]
+    fighter = cls(f"Bot {kind}", hp, attack, defense)
+    fighter.policy = fighter.default_policy
+    fighter.equipment = Equipment("Sword", attack_boost=5, durability=3)
+    return fighter
+
+def mid_battle(first, second, stream, seed):
+    battle = Battle(make_fighter(first), make_fighter(second), rng=STREAMS[stream](seed))
+    with headless():
+        battle.fight(max_turns=3)
+    return battle
+
+def outcome(battle, result):
+    """(winning side or None, turns, HP after every turn)"""
+    winner = None if result.winner is None else (1 if result.winner is battle.p1 else 2)
+    return winner, result.turns, list(result.hp_history)
+
+@pytest.mark.parametrize("stream", sorted(STREAMS))
+@pytest.mark.parametrize("first, second", PAIRINGS)
+def test_restore_replays_battle(first, second, stream):
+    battle = mid_battle(first, second, stream, seed=11)
+    state = battle_state.snapshot(battle)
+    with headless():
+        before = outcome(battle, battle.fight(max_turns=200))
+        battle_state.restore(battle, state)
+        after = outcome(battle, battle.fight(max_turns=200))
+    assert after == before
+
+@pytest.mark.parametrize("stream", sorted(STREAMS))
+@pytest.mark.parametrize("first, second", PAIRINGS)
+def test_clone_replays_battle(first, second, stream):
+    battle = mid_battle(first, second, stream, seed=23)
+    twin = battle_state.clone(battle)
+    assert twin.p1 is not battle.p1 and twin.p1.equipment is not battle.p1.equipment
+    with headless():
+        original = outcome(battle, battle.fight(max_turns=200))
+        cloned = outcome(twin, twin.fight(max_turns=200))
+    assert cloned == original
@@ -0,0 +1,30 @@
+# test_combat_stats.py - Merged accumulators equal a single pass
+
+import numpy as np
+import pytest
+from combat_stats import Welford
+
+def accumulate(values):
+    acc = Welford()
+    for x in values:
+        acc.add(float(x))
+    return acc
+
+@pytest.mark.parametrize("cuts", [[0], [1], [300, 301, 750], [999]])
+def test_merged_welford_matches_one_pass(cuts):
+    samples = np.random.default_rng(9).normal(40.0, 12.0, 1000)
+    merged = Welford()
+    for chunk in np.split(samples, cuts):  # uneven chunks, some empty or single
+        merged.merge(accumulate(chunk))
+    single = accumulate(samples)
+
+    assert merged.n == single.n == samples.size
+    assert merged.mean == pytest.approx(np.mean(samples), rel=1e-12)
+    assert merged.variance == pytest.approx(np.var(samples, ddof=1), rel=1e-10)
+    assert merged.variance == pytest.approx(single.variance, rel=1e-10)
+    assert (merged.min, merged.max) == (samples.min(), samples.max())
+
+def test_merge_with_empty_is_identity():
+    acc = accumulate([3.0, 5.0, 10.0])
+    acc.merge(Welford())
+    assert (acc.n, acc.mean, acc.variance) == (3, 6.0, pytest.approx(13.0))
@@ -0,0 +1,59 @@
+# test_damage_model.py - Exact move PMFs agree with playing the moves
+#
+# Each case builds a fresh attacker and defender, plays the real move a few
+# thousand times on a seeded stream and compares the sampled damage with
+# fighter_move_damage's exact distribution.
+
+import numpy as np
+import pytest
+from random_stream import RandomStream
+from game_utils import headless
+from knight import Knight
+from orc import Orc
+from mage import Mage
+from ninja import Ninja
+from damage_model import fighter_move_damage
+
+SAMPLES = 4000
+CASES = [
+    (Knight, "sword_slash", Orc),
+    (Knight, "rapid_strikes", Ninja),
+    (Orc, "berserk_strike", Knight),
+    (Mage, "meteor_fall", Knight),
+    (Ninja, "twin_fang_slash", Mage),
+    (Ninja, "shuriken_storm", Knight),
+]
+
+def setup(attacker_cls, move, defender_cls, stream):
+    attacker = attacker_cls("A", 100, 15, 5)
+    defender = defender_cls("D", 100, 15, 5)
+    attacker.rng = defender.rng = stream
+    attacker.last_move, attacker.combo_counter = move, 2  # this use reaches combo 3
+    if attacker_cls is Orc:
+        attacker.attack_buff_turns = 1
+    if attacker_cls is Ninja and move == "twin_fang_slash":
+        attacker.stealth_active = True
+    return attacker, defender
+
+def play(attacker, move, defender):
+    handler = getattr(attacker, move)
+    if move == "meteor_fall":
+        handler([defender], True)
+    else:
+        handler(defender, True)
+    return defender.max_hp - defender.hp
+
+@pytest.mark.parametrize("attacker_cls, move, defender_cls", CASES)
+def test_exact_pmf_matches_sampled_moves(attacker_cls, move, defender_cls):
+    stream = RandomStream(np.random.default_rng(7))
+    attacker, defender = setup(attacker_cls, move, defender_cls, stream)
+    exact = fighter_move_damage(attacker, move, defender)
+    with headless():
+        damage = np.array([play(attacker, move, defender) for attacker, defender in
+                           (setup(attacker_cls, move, defender_cls, stream) for _ in range(SAMPLES))])
+    assert exact.probs.sum() == pytest.approx(1.0)
+    assert damage.max() <= exact.max()
+    # the sampled mean is within 5 standard errors of the exact one
+    assert abs(damage.mean() - exact.mean()) <= 5 * exact.std() / np.sqrt(SAMPLES) + 1e-9
+    counts = np.bincount(damage, minlength=exact.probs.size) / SAMPLES
+    assert 0.5 * np.abs(counts - exact.probs).sum() < 0.06  # total variation distance
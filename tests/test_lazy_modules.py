@@ -0,0 +1,16 @@
+# test_lazy_modules.py - is_loaded tells a registered module from a loaded one
+
+import sys
+import lazy_modules
+
+def test_lazy_module_loads_on_first_attribute():
+    sys.modules.pop("colorsys", None)
+    module = lazy_modules.lazy_import("colorsys")
+    assert "colorsys" in sys.modules
+    assert not lazy_modules.is_loaded("colorsys")
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert lazy_modules.is_loaded("colorsys")
+
+def test_plain_imports_count_as_loaded():
+    assert lazy_modules.is_loaded("os")
+    assert not lazy_modules.is_loaded("no_such_module_here")
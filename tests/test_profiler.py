@@ -0,0 +1,25 @@
+# test_profiler.py - Profiling times a battle without changing it
+
+import itertools
+import pytest
+from battle import Battle
+from game_utils import headless
+from profiler import Profiler
+from tournament_runner import ROSTER
+
+def bot(kind):
+    cls, hp, attack, defense = ROSTER[kind]
+    fighter = cls(f"Bot {kind}", hp, attack, defense)
+    fighter.policy = fighter.default_policy
+    return fighter
+
+@pytest.mark.parametrize("first, second", list(itertools.product(ROSTER, repeat=2)))
+def test_profiled_battle_matches_plain(first, second):
+    with headless():
+        plain = Battle(bot(first), bot(second), rng=5).fight(max_turns=200)
+        profiler = Profiler()
+        profiled = Battle(bot(first), bot(second), rng=5, profiler=profiler).fight(max_turns=200)
+    assert (profiled.turns, profiled.hp_history) == (plain.turns, plain.hp_history)
+    assert not profiler.stack
+    for section in ("fight;turn;select", "fight;turn;execute", "fight;turn;reduce_cooldowns"):
+        assert profiler.sections[section].calls > 0
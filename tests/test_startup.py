@@ -0,0 +1,44 @@
+# test_startup.py - The menu must start fast and without the battle engine
+#
+# `import main` runs in fresh interpreters, so nothing imported by the test
+# process leaks in. numpy always shows up in sys.modules (random_stream
+# registers it with a LazyLoader), so "loaded" means lazy_modules.is_loaded.
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+from benchmarks import STARTUP_BUDGET_MS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+import lazy_modules
+print(json.dumps({
+    "ms": elapsed * 1e3,
+    "numpy": lazy_modules.is_loaded("numpy"),
+    "battle": "battle" in sys.modules,
+    "knight": "knight" in sys.modules,
+}))
+"""
+
+def probe():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+def test_import_main_within_budget():
+    samples = [probe()["ms"] for _ in range(RUNS)]
+    assert statistics.median(samples) < STARTUP_BUDGET_MS, samples
+
+def test_import_main_skips_heavy_modules():
+    loaded = probe()
+    assert not loaded["numpy"]
+    assert not loaded["battle"]
+    assert not loaded["knight"]
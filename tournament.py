@@ -1,9 +1,8 @@
 # tournament_fixed.py - Fixed version with working bots and boss
 
 from colorama import Fore, Style
-import numpy as np
-import time
-from game_utils import colored_text, print_banner, print_separator
+import random_stream
+from game_utils import colored_text, print_banner, print_separator, display, pause, prompt, is_headless
 from equipment import Equipment, ElementalEquipment
 from knight import Knight
 from orc import Orc
@@ -12,6 +11,7 @@ from ninja import Ninja
 from boss import Boss
 from battle import Battle
 from items import Potion, Bomb
+from mcts_policy import MCTSPolicy
 
 class Arena:
     def __init__(self, name, description, effects, color):
@@ -33,11 +33,11 @@ class Arena:
                         player.defense = int(player.defense * effect_value)
             elif effect_type == "lightning_chance":
                 # Lightning strikes randomly during battle
-                if np.random.random() < effect_value:
-                    target = np.random.choice([battle.p1, battle.p2])
-                    damage = np.random.randint(10, 20)
+                if battle.rng.random() < effect_value:
+                    target = battle.rng.choice([battle.p1, battle.p2])
+                    damage = battle.rng.randint(10, 20)
                     target.hp -= damage
-                    print(colored_text(f"⚡ Lightning strikes {target.name} for {damage} damage!", Fore.YELLOW, Style.BRIGHT))
+                    display(colored_text(f"⚡ Lightning strikes {target.name} for {damage} damage!", Fore.YELLOW, Style.BRIGHT))
             elif effect_type == "healing_aura":
                 # Gradual healing each turn
                 for player in [battle.p1, battle.p2]:
@@ -48,7 +48,7 @@ class Arena:
                 for player in [battle.p1, battle.p2]:
                     poison_damage = int(player.max_hp * effect_value)
                     player.hp -= poison_damage
-                    print(colored_text(f"☠️ Poison mist damages {player.name} for {poison_damage}!", Fore.GREEN))
+                    display(colored_text(f"☠️ Poison mist damages {player.name} for {poison_damage}!", Fore.GREEN))
 
 class Weather:
     def __init__(self, name, description, effects, color):
@@ -88,18 +88,32 @@ class Shop:
     
     def display_shop(self, player):
         print_banner("🏪  TOURNAMENT SHOP  🏪", Fore.YELLOW)
-        print(colored_text(f"Gold: {player.gold} 💰", Fore.YELLOW, Style.BRIGHT))
+        display(colored_text(f"Gold: {player.gold} 💰", Fore.YELLOW, Style.BRIGHT))
         print_separator("=", 50, Fore.YELLOW)
         
         for i, (name, info) in enumerate(self.items.items(), 1):
             color = Fore.GREEN if player.gold >= info["price"] else Fore.RED
-            print(colored_text(f"{i}) {name} - {info['price']} gold", color, Style.BRIGHT))
-            print(colored_text(f"   {info['description']}", Fore.LIGHTBLACK_EX))
-            print()
+            display(colored_text(f"{i}) {name} - {info['price']} gold", color, Style.BRIGHT))
+            display(colored_text(f"   {info['description']}", Fore.LIGHTBLACK_EX))
+            display()
         
-        print(colored_text("0) Exit Shop", Fore.CYAN))
+        display(colored_text("0) Exit Shop", Fore.CYAN))
         print_separator("=", 50, Fore.YELLOW)
     
+    def auto_buy(self, player):
+        """Bot shopping: best affordable equipment first, then potions and bombs"""
+        items_list = list(self.items.items())
+        by_price = sorted(range(len(items_list)), key=lambda i: items_list[i][1]["price"], reverse=True)
+        for i in by_price:
+            item = items_list[i][1]["item"]
+            if isinstance(item, Equipment) and player.gold >= items_list[i][1]["price"]:
+                self.buy_item(player, i + 1)
+                break
+        for i in by_price:
+            item = items_list[i][1]["item"]
+            if not isinstance(item, Equipment) and player.gold >= items_list[i][1]["price"]:
+                self.buy_item(player, i + 1)
+
     def buy_item(self, player, choice):
         items_list = list(self.items.items())
         if 1 <= choice <= len(items_list):
@@ -110,27 +124,29 @@ class Shop:
                     player.equip(item_info["item"])
                 else:
                     player.items.append(item_info["item"])
-                print(colored_text(f"✅ Purchased {item_name}!", Fore.GREEN, Style.BRIGHT))
+                display(colored_text(f"✅ Purchased {item_name}!", Fore.GREEN, Style.BRIGHT))
                 return True
             else:
-                print(colored_text("💸 Not enough gold!", Fore.RED))
+                display(colored_text("💸 Not enough gold!", Fore.RED))
                 return False
         return False
 
 
 class Tournament:
-    def __init__(self, player):
+    def __init__(self, player, rng=None, boss_search=None):
+        """boss_search: search passes per final boss move (reproducible), 0 for
+        the scripted boss; None searches on a time budget when a human plays"""
         self.player = player
-        # Initialize tournament-specific attributes if they don't exist
-        if not hasattr(self.player, 'gold'):
-            self.player.gold = 500  # Starting gold
-        if not hasattr(self.player, 'tournament_wins'):
-            self.player.tournament_wins = 0
-        if not hasattr(self.player, 'items'):
-            self.player.items = []
+        self.rng = random_stream.as_stream(rng)
+        # Hand out starting gold the first time this fighter enters a tournament
+        if self.player.gold is None:
+            self.player.gold = 500
             
         self.current_round = 1
         self.max_rounds = 4  # 3 regular rounds + 1 boss fight
+        self.is_bot = self.player.policy is not None or is_headless()
+        # Bot runs can deadlock (e.g. two Ninjas stacking Shadowstep dodge), so cap them
+        self.max_turns = 1000 if self.is_bot else None
         
         # Tournament progression
         self.opponents = self.generate_opponents()
@@ -167,14 +183,19 @@ class Tournament:
         self.final_boss = Boss("Ancient Shadow Dragon", 350, 28, 15, 
                              ["Claw Strike", "Fire Breath", "Wing Slam", "Roar of Terror", "Berserker Fury"])
         self.final_boss.equip(ElementalEquipment("Dragon Scale Armor", "fire", defense_boost=7))
+        if boss_search is None and not self.is_bot:
+            self.final_boss.policy = MCTSPolicy(self.final_boss)  # 5 ms per move
+        elif boss_search:
+            self.final_boss.policy = MCTSPolicy(self.final_boss, budget=None, iterations=boss_search,
+                                                seed=self.rng.randint(0, 2**31))
     
     def generate_opponents(self):
         """Generate tournament opponents with proper Bot names"""
         opponents = []
         
         # Round 1: Weak bots
-        opponent_class = np.random.choice([Knight, Orc, Mage, Ninja])
-        # Create bot with adjusted stats - make sure to pass name with "Bot" in it
+        opponent_class = self.rng.choice([Knight, Orc, Mage, Ninja])
+        # Create bot with adjusted stats
         bot_name = f"Novice {opponent_class.__name__} Bot"
         
         if opponent_class == Knight:
@@ -201,7 +222,7 @@ class Tournament:
         opponents.append(opponent)
         
         # Round 2: Equal bots
-        opponent_class = np.random.choice([Knight, Orc, Mage, Ninja])
+        opponent_class = self.rng.choice([Knight, Orc, Mage, Ninja])
         bot_name = f"Veteran {opponent_class.__name__} Bot"
         
         if opponent_class == Knight:
@@ -228,7 +249,7 @@ class Tournament:
         opponents.append(opponent)
         
         # Round 3: Strong bots
-        opponent_class = np.random.choice([Knight, Orc, Mage, Ninja])
+        opponent_class = self.rng.choice([Knight, Orc, Mage, Ninja])
         bot_name = f"Elite {opponent_class.__name__} Bot"
         
         if opponent_class == Knight:
@@ -253,80 +274,89 @@ class Tournament:
                            defense=int(self.player.defense * 1.2))
         
         opponents.append(opponent)
-        
+
+        for opponent in opponents:
+            opponent.policy = opponent.default_policy
         return opponents
     
     def display_tournament_status(self):
         """Display current tournament progress"""
         print_banner("🏆  TOURNAMENT STATUS  🏆", Fore.MAGENTA)
-        print(colored_text(f"Round: {self.current_round}/4", Fore.CYAN, Style.BRIGHT))
-        print(colored_text(f"Wins: {self.player.tournament_wins}", Fore.GREEN, Style.BRIGHT))
-        print(colored_text(f"Gold: {self.player.gold} 💰", Fore.YELLOW, Style.BRIGHT))
+        display(colored_text(f"Round: {self.current_round}/4", Fore.CYAN, Style.BRIGHT))
+        display(colored_text(f"Wins: {self.player.tournament_wins}", Fore.GREEN, Style.BRIGHT))
+        display(colored_text(f"Gold: {self.player.gold} 💰", Fore.YELLOW, Style.BRIGHT))
         print_separator("=", 30, Fore.MAGENTA)
     
     def shop_phase(self):
         """Allow player to shop between rounds"""
         if self.current_round > 1:  # No shop before first round
             print_banner("🛒  SHOP PHASE  🛒", Fore.YELLOW)
-            print(colored_text("You can buy items and equipment!", Fore.CYAN))
-            
+            display(colored_text("You can buy items and equipment!", Fore.CYAN))
+
+            if self.is_bot:
+                self.shop.auto_buy(self.player)
+                return
+
             while True:
                 self.shop.display_shop(self.player)
                 try:
-                    choice = int(input(colored_text("Enter choice: ", Fore.CYAN)))
+                    choice = int(prompt(colored_text("Enter choice: ", Fore.CYAN)))
                     if choice == 0:
                         break
                     else:
                         self.shop.buy_item(self.player, choice)
-                        time.sleep(1)
+                        pause(1)
                 except ValueError:
-                    print(colored_text("Invalid input!", Fore.RED))
+                    display(colored_text("Invalid input!", Fore.RED))
     
+    def prepare_round(self, round_num):
+        """Draw a round's arena, weather, opponent and opponent equipment"""
+        # Select random arena and weather
+        arena = self.rng.choice(self.arenas)
+        weather = self.rng.choice(self.weather_conditions)
+        if round_num == 4:
+            return arena, weather, self.final_boss, None
+
+        # Regular tournament opponent, with some equipment
+        opponent = self.opponents[self.current_opponent_index]
+        self.current_opponent_index += 1
+        equipment_options = [
+            Equipment("Tournament Sword", attack_boost=self.rng.randint(3, 7)),
+            Equipment("Tournament Armor", defense_boost=self.rng.randint(2, 5)),
+            ElementalEquipment("Elemental Weapon", self.rng.choice(["fire", "ice", "lightning"]), 
+                             attack_boost=self.rng.randint(3, 6))
+        ]
+        return arena, weather, opponent, self.rng.choice(equipment_options)
+
     def battle_phase(self):
         """Execute a tournament battle"""
-        # Select random arena and weather
-        arena = np.random.choice(self.arenas)
-        weather = np.random.choice(self.weather_conditions)
+        arena, weather, opponent, equipment = self.prepare_round(self.current_round)
         
         print_banner(f"🏟️  ROUND {self.current_round} BATTLE  🏟️", Fore.BLUE)
-        print(colored_text(f"Arena: {arena.name}", arena.color, Style.BRIGHT))
-        print(colored_text(f"Weather: {weather.name}", weather.color))
-        print(colored_text(f"Effect: {arena.description}", Fore.LIGHTBLACK_EX))
+        display(colored_text(f"Arena: {arena.name}", arena.color, Style.BRIGHT))
+        display(colored_text(f"Weather: {weather.name}", weather.color))
+        display(colored_text(f"Effect: {arena.description}", Fore.LIGHTBLACK_EX))
         if weather.name != "Sunny":
-            print(colored_text(f"Weather Effect: {weather.description}", Fore.LIGHTBLACK_EX))
+            display(colored_text(f"Weather Effect: {weather.description}", Fore.LIGHTBLACK_EX))
         print_separator("=", 40, Fore.BLUE)
-        time.sleep(2)
+        pause(2)
         
-        if self.current_round == 4:
-            # Boss fight
-            opponent = self.final_boss
-            print(colored_text("👹 FINAL BOSS BATTLE! 👹", Fore.RED, Style.BRIGHT))
-        else:
-            # Regular tournament opponent
-            opponent = self.opponents[self.current_opponent_index]
-            self.current_opponent_index += 1
-            
-            # Give opponent some equipment
-            equipment_options = [
-                Equipment("Tournament Sword", attack_boost=np.random.randint(3, 7)),
-                Equipment("Tournament Armor", defense_boost=np.random.randint(2, 5)),
-                ElementalEquipment("Elemental Weapon", np.random.choice(["fire", "ice", "lightning"]), 
-                                 attack_boost=np.random.randint(3, 6))
-            ]
-            if hasattr(opponent, 'equip'):  # Make sure the opponent has equip method
-                opponent.equip(np.random.choice(equipment_options))
+        if opponent is self.final_boss:
+            display(colored_text("👹 FINAL BOSS BATTLE! 👹", Fore.RED, Style.BRIGHT))
+        elif hasattr(opponent, 'equip'):  # Make sure the opponent has equip method
+            opponent.equip(equipment)
         
         # Create battle with environmental effects
-        battle = Battle(self.player, opponent)
+        battle = Battle(self.player, opponent, self.rng)
         
         # Apply arena and weather effects before battle
         arena.apply_effects(battle)
         weather.apply_effects(battle)
         
         # Start the battle
-        battle.fight()
+        battle.fight(self.max_turns)
         
-        if self.player.is_alive():
+        if self.player.is_alive() and not opponent.is_alive():
             # Award gold based on round
             gold_reward = 50 * self.current_round
             if self.current_round == 4:  # Boss fight
@@ -335,27 +365,28 @@ class Tournament:
             self.player.gold += gold_reward
             self.player.tournament_wins += 1
             
-            print(colored_text(f"💰 Victory! Earned {gold_reward} gold!", Fore.YELLOW, Style.BRIGHT))
+            display(colored_text(f"💰 Victory! Earned {gold_reward} gold!", Fore.YELLOW, Style.BRIGHT))
             
             # Restore some HP after victory
             heal_amount = int(self.player.max_hp * 0.3)
             self.player.hp = min(self.player.max_hp, self.player.hp + heal_amount)
-            print(colored_text(f"❤️ Restored {heal_amount} HP!", Fore.GREEN))
+            display(colored_text(f"❤️ Restored {heal_amount} HP!", Fore.GREEN))
             
             return True
         else:
-            print(colored_text("💀 Tournament Over! You were defeated!", Fore.RED, Style.BRIGHT))
+            display(colored_text("💀 Tournament Over! You were defeated!", Fore.RED, Style.BRIGHT))
             return False
     
     def run_tournament(self):
         """Main tournament loop"""
         print_banner("🏆  WELCOME TO THE TOURNAMENT  🏆", Fore.MAGENTA)
-        print(colored_text("Fight through 4 rounds to become champion!", Fore.CYAN, Style.BRIGHT))
-        print(colored_text("• Win battles to earn gold", Fore.YELLOW))
-        print(colored_text("• Shop for better equipment between rounds", Fore.YELLOW))
-        print(colored_text("• Face the final boss in round 4!", Fore.RED))
+        display(colored_text("Fight through 4 rounds to become champion!", Fore.CYAN, Style.BRIGHT))
+        display(colored_text("• Win battles to earn gold", Fore.YELLOW))
+        display(colored_text("• Shop for better equipment between rounds", Fore.YELLOW))
+        display(colored_text("• Face the final boss in round 4!", Fore.RED))
         print_separator("=", 50, Fore.MAGENTA)
-        input(colored_text("Press Enter to begin...", Fore.CYAN, Style.BRIGHT))
+        if not self.is_bot:
+            prompt(colored_text("Press Enter to begin...", Fore.CYAN, Style.BRIGHT))
         
         for round_num in range(1, 5):
             self.current_round = round_num
@@ -368,20 +399,20 @@ class Tournament:
             if not self.battle_phase():
                 # Player was defeated
                 print_banner("💀  TOURNAMENT ENDED  💀", Fore.RED)
-                print(colored_text(f"You reached Round {round_num}", Fore.YELLOW))
-                print(colored_text(f"Total Wins: {self.player.tournament_wins}", Fore.GREEN))
+                display(colored_text(f"You reached Round {round_num}", Fore.YELLOW))
+                display(colored_text(f"Total Wins: {self.player.tournament_wins}", Fore.GREEN))
                 return False
             
             if round_num == 4:
                 # Tournament completed!
                 print_banner("🏆  TOURNAMENT CHAMPION!  🏆", Fore.YELLOW)
-                print(colored_text("You have conquered the tournament!", Fore.MAGENTA, Style.BRIGHT))
-                print(colored_text("🎉 ULTIMATE VICTORY! 🎉", Fore.CYAN, Style.BRIGHT))
+                display(colored_text("You have conquered the tournament!", Fore.MAGENTA, Style.BRIGHT))
+                display(colored_text("🎉 ULTIMATE VICTORY! 🎉", Fore.CYAN, Style.BRIGHT))
                 return True
             
             # Rest between rounds
-            print(colored_text(f"Round {round_num} complete! Preparing for next round...", Fore.GREEN))
-            time.sleep(2)
+            display(colored_text(f"Round {round_num} complete! Preparing for next round...", Fore.GREEN))
+            pause(2)
         
         return True
 
@@ -0,0 +1,95 @@
+# tournament_runner.py - Run many headless bot tournaments across a process pool
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from random_stream import RandomStream
+from game_utils import headless
+from knight import Knight
+from orc import Orc
+from mage import Mage
+from ninja import Ninja
+from tournament import Tournament
+
+# Same stat lines the player picks from in main.choose_character
+ROSTER = {
+    "Knight": (Knight, 150, 15, 8),
+    "Orc": (Orc, 170, 18, 6),
+    "Mage": (Mage, 140, 16, 5),
+    "Ninja": (Ninja, 130, 17, 4),
+}
+
+class TournamentResult:
+    """Summary of one bot tournament run"""
+    def __init__(self, run_id, player_class, champion, wins, gold, hp):
+        self.run_id = run_id
+        self.player_class = player_class
+        self.champion = champion
+        self.wins = wins
+        self.gold = gold
+        self.hp = hp
+
+    def __repr__(self):
+        return (f"TournamentResult(run_id={self.run_id}, player_class={self.player_class!r}, "
+                f"champion={self.champion}, wins={self.wins})")
+
+def run_bot_tournament(run_id, seed_seq, player_class=None, boss_search=0):
+    """Play one full tournament (shop, battles, boss) with a bot entrant
+    (boss_search: search passes per boss move, 0 for the scripted boss)"""
+    rng = RandomStream(np.random.default_rng(seed_seq))
+    if player_class is None:
+        player_class = rng.choice(list(ROSTER))
+    cls, hp, attack, defense = ROSTER[player_class]
+    player = cls(f"Bot {player_class}", hp, attack, defense)
+    player.policy = player.default_policy
+
+    with headless():
+        champion = Tournament(player, rng, boss_search).run_tournament()
+    return TournamentResult(run_id, player_class, champion, player.tournament_wins, player.gold, player.hp)
+
+def _run_chunk(run_ids, seed_seqs, player_class, boss_search):
+    return [run_bot_tournament(run_id, seq, player_class, boss_search) for run_id, seq in zip(run_ids, seed_seqs)]
+
+def run_tournaments(n, seed=None, workers=None, player_class=None, chunk_size=16, boss_search=0):
+    """Run n independent bot tournaments in parallel, yielding results as they finish.
+
+    Every run gets its own child of a single SeedSequence, so a given
+    (seed, n) always reproduces the same set of results regardless of how
+    many workers are used or in which order they complete.
+    """
+    seed_seqs = np.random.SeedSequence(seed).spawn(n)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_chunk, list(range(start, min(start + chunk_size, n))),
+                        seed_seqs[start:start + chunk_size], player_class, boss_search)
+            for start in range(0, n, chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run bot tournaments in parallel")
+    parser.add_argument("-n", type=int, default=1000, help="number of tournaments")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--player-class", choices=sorted(ROSTER), default=None)
+    parser.add_argument("--boss-search", type=int, default=0, metavar="PASSES",
+                        help="final boss searches this many passes per move (0: scripted boss)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    champions = {}
+    entries = {}
+    for result in run_tournaments(args.n, args.seed, args.workers, args.player_class,
+                                  boss_search=args.boss_search):
+        entries[result.player_class] = entries.get(result.player_class, 0) + 1
+        champions[result.player_class] = champions.get(result.player_class, 0) + result.champion
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.n} tournaments in {elapsed:.2f}s ({args.n / elapsed:.0f}/s)")
+    for name in sorted(entries):
+        print(f"  {name:<7} champion rate {champions[name] / entries[name]:.3f} ({entries[name]} runs)")